@@ -0,0 +1,44 @@
+from typing import Any, List, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+
+def fetch_in_order(
+    db: Session, model, column, keys: Sequence[Any]
+) -> Tuple[List[Any], List[Any]]:
+    """
+    Busca várias entidades com um único SELECT ... WHERE coluna IN (...)
+
+    Args:
+        db: Sessão do banco
+        model: Modelo ORM consultado
+        column: Coluna usada como chave (ex.: Meta.id, Colaborador.matricula)
+        keys: Chaves pedidas, na ordem da requisição
+
+    Returns:
+        Tupla (entidades na ordem pedida, chaves não encontradas). Chaves
+        repetidas são consideradas uma única vez.
+    """
+    chaves = list(dict.fromkeys(keys))
+
+    if len(chaves) > settings.BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Máximo de {settings.BATCH_MAX_IDS} identificadores por requisição",
+        )
+
+    if not chaves:
+        return [], []
+
+    encontrados = {
+        getattr(row, column.key): row
+        for row in db.query(model).filter(column.in_(chaves)).all()
+    }
+
+    itens = [encontrados[chave] for chave in chaves if chave in encontrados]
+    nao_encontrados = [chave for chave in chaves if chave not in encontrados]
+
+    return itens, nao_encontrados
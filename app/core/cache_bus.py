@@ -0,0 +1,340 @@
+import glob
+import json
+import os
+import select
+import socket
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging import log_error, log_info, log_warning
+from app.core.metrics import CACHE_BUS_DELAY, CACHE_INVALIDATIONS, CACHE_LOOKUPS
+
+SESSION_INFO_KEY = "cache_invalidacoes"
+
+
+class TTLCache:
+    """
+    Cache em memória do processo com expiração por tempo
+
+    O TTL é só uma rede de segurança: a invalidação normal chega pelo
+    barramento logo após o commit. Cada invalidação incrementa a geração do
+    cache, e um valor carregado antes dela não é gravado depois (evita
+    guardar um dado lido antes do commit de outro worker).
+    """
+
+    def __init__(self, nome: str, ttl: float):
+        self.nome = nome
+        self.ttl = ttl
+        self._itens: Dict[str, Tuple[float, Any]] = {}
+        self._geracao = 0
+        self._lock = threading.Lock()
+
+    def get(self, chave: str) -> Tuple[bool, Any]:
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is not None and item[0] <= time.monotonic():
+                del self._itens[chave]
+                item = None
+        CACHE_LOOKUPS.labels(cache=self.nome, resultado="hit" if item else "miss").inc()
+        return (True, item[1]) if item else (False, None)
+
+    def set(self, chave: str, valor: Any, geracao: Optional[int] = None):
+        with self._lock:
+            if geracao is not None and geracao != self._geracao:
+                return
+            self._itens[chave] = (time.monotonic() + self.ttl, valor)
+
+    def get_or_load(self, chave: str, carregar: Callable[[], Any]) -> Any:
+        """
+        Retorna o valor em cache ou o carrega; None não é guardado
+        """
+        encontrado, valor = self.get(chave)
+        if encontrado:
+            return valor
+        geracao = self._geracao
+        valor = carregar()
+        if valor is not None:
+            self.set(chave, valor, geracao)
+        return valor
+
+    def invalidate(self, chave: Optional[str] = None):
+        """Remove uma chave (ou todas, sem chave)"""
+        with self._lock:
+            self._geracao += 1
+            if chave is None:
+                self._itens.clear()
+            else:
+                self._itens.pop(chave, None)
+
+
+_caches: Dict[str, TTLCache] = {}
+
+
+def register_cache(nome: str, ttl: Optional[float] = None) -> TTLCache:
+    """Cria (uma vez) o cache `nome`, invalidável pelo barramento"""
+    if nome not in _caches:
+        _caches[nome] = TTLCache(nome, ttl or settings.CACHE_TTL_SECONDS)
+    return _caches[nome]
+
+
+def clear_caches():
+    """Esvazia todos os caches do processo (ex.: banco recriado nos testes)"""
+    for cache in _caches.values():
+        cache.invalidate()
+
+
+def evict(chaves: Iterable[str], origem: str = "local"):
+    """
+    Aplica invalidações no formato "cache" (tudo) ou "cache:chave"
+    """
+    for entrada in chaves:
+        nome, _, chave = entrada.partition(":")
+        cache = _caches.get(nome)
+        if cache is not None:
+            cache.invalidate(chave or None)
+        CACHE_INVALIDATIONS.labels(origem=origem).inc()
+
+
+def _origem() -> str:
+    """Identifica o processo entre hosts (o pid sozinho pode se repetir)"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def encode_message(chaves: List[str]) -> str:
+    return json.dumps(
+        {"origem": _origem(), "enviado_em": time.time(), "chaves": chaves}
+    )
+
+
+def handle_message(payload: str):
+    """Aplica uma mensagem recebida de outro worker"""
+    try:
+        mensagem = json.loads(payload)
+    except ValueError:
+        log_warning("Mensagem de invalidação inválida", payload=payload[:200])
+        return
+    if mensagem.get("origem") == _origem():
+        return
+    CACHE_BUS_DELAY.labels().observe(
+        max(0.0, time.time() - mensagem.get("enviado_em", 0))
+    )
+    evict(mensagem.get("chaves", []), origem="remota")
+
+
+class MemoryBackend:
+    """Um único processo: a invalidação local já basta"""
+
+    nome = "memory"
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def publish(self, payload: str):
+        pass
+
+
+class UnixSocketBackend:
+    """
+    Workers do mesmo host: cada processo escuta um socket Unix de datagramas
+    em `diretorio` (<pid>.sock) e a publicação envia a mensagem a todos
+
+    Sockets de processos que já terminaram são removidos ao publicar.
+    """
+
+    nome = "unix"
+
+    def __init__(self, diretorio: str):
+        self.diretorio = diretorio
+        self.caminho = os.path.join(diretorio, f"{os.getpid()}.sock")
+        self._socket: Optional[socket.socket] = None
+        self._envio = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._envio.setblocking(False)
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self):
+        os.makedirs(self.diretorio, exist_ok=True)
+        if os.path.exists(self.caminho):
+            os.unlink(self.caminho)
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._socket.bind(self.caminho)
+        self._socket.settimeout(0.5)
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="cache-bus-unix", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                payload = self._socket.recv(65536)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            handle_message(payload.decode("utf-8"))
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._socket.close()
+        try:
+            os.unlink(self.caminho)
+        except FileNotFoundError:
+            pass
+
+    def publish(self, payload: str):
+        dados = payload.encode("utf-8")
+        for destino in glob.glob(os.path.join(self.diretorio, "*.sock")):
+            if destino == self.caminho:
+                continue
+            try:
+                self._envio.sendto(dados, destino)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # Ninguém escutando: processo encerrado sem remover o socket
+                try:
+                    os.unlink(destino)
+                except FileNotFoundError:
+                    pass
+            except OSError as e:
+                log_warning("Falha ao enviar invalidação", destino=destino, erro=str(e))
+
+
+class PostgresBackend:
+    """
+    Workers em hosts diferentes: NOTIFY no canal e uma conexão dedicada por
+    processo em LISTEN, reconectando em caso de queda
+    """
+
+    nome = "postgres"
+
+    def __init__(self, engine: Engine, canal: str):
+        self.engine = engine
+        self.canal = canal
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def _connect(self):
+        dialect = self.engine.dialect
+        cargs, cparams = dialect.create_connect_args(self.engine.url)
+        conexao = dialect.loaded_dbapi.connect(*cargs, **cparams)
+        conexao.autocommit = True
+        with conexao.cursor() as cursor:
+            cursor.execute(f'LISTEN "{self.canal}"')
+        return conexao
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="cache-bus-postgres", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self):
+        espera = 0.5
+        while not self._stop.is_set():
+            try:
+                conexao = self._connect()
+            except Exception as e:
+                log_error("Falha ao conectar o barramento de cache", error=e)
+                self._stop.wait(espera)
+                espera = min(espera * 2, 30)
+                continue
+
+            espera = 0.5
+            # Mensagens perdidas durante a reconexão: descarta tudo
+            evict(list(_caches), origem="reconexao")
+            try:
+                while not self._stop.is_set():
+                    if select.select([conexao], [], [], 0.5)[0]:
+                        conexao.poll()
+                        while conexao.notifies:
+                            handle_message(conexao.notifies.pop(0).payload)
+            except Exception as e:
+                log_warning("Conexão do barramento de cache perdida", erro=str(e))
+            finally:
+                conexao.close()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def publish(self, payload: str):
+        with self.engine.connect() as conexao:
+            conexao.execute(
+                text("SELECT pg_notify(:canal, :payload)"),
+                {"canal": self.canal, "payload": payload},
+            )
+            conexao.commit()
+
+
+class InvalidationBus:
+    """Barramento de invalidação entre workers (backend em CACHE_BUS_BACKEND)"""
+
+    def __init__(self):
+        self.backend = MemoryBackend()
+
+    def start(self, engine: Engine):
+        self.stop()
+        if settings.CACHE_BUS_BACKEND == "unix":
+            self.backend = UnixSocketBackend(settings.CACHE_BUS_DIR)
+        elif settings.CACHE_BUS_BACKEND == "postgres":
+            self.backend = PostgresBackend(engine, settings.CACHE_BUS_CHANNEL)
+        else:
+            self.backend = MemoryBackend()
+        self.backend.start()
+        # Invalidações anteriores à inscrição não chegam: começa do zero
+        evict(list(_caches), origem="reconexao")
+        log_info("Barramento de cache iniciado", backend=self.backend.nome)
+
+    def stop(self):
+        self.backend.stop()
+        self.backend = MemoryBackend()
+
+    def publish(self, chaves: List[str]):
+        """Invalida localmente e avisa os demais workers"""
+        evict(chaves)
+        try:
+            self.backend.publish(encode_message(chaves))
+        except Exception as e:
+            log_error("Falha ao publicar invalidação de cache", error=e)
+
+
+cache_bus = InvalidationBus()
+
+
+def invalidate_on_commit(db: Session, *chaves: str):
+    """
+    Agenda a invalidação das chaves para depois do commit da sessão
+
+    Se a transação for desfeita, nada é publicado.
+    """
+    db.info.setdefault(SESSION_INFO_KEY, set()).update(chaves)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(session: Session):
+    chaves = session.info.pop(SESSION_INFO_KEY, None)
+    if chaves:
+        cache_bus.publish(sorted(chaves))
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(session: Session, previous_transaction):
+    session.info.pop(SESSION_INFO_KEY, None)
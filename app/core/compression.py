@@ -0,0 +1,99 @@
+from typing import Dict
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipResponder, IdentityResponder
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli é opcional
+    brotli = None
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """
+    Converte o cabeçalho Accept-Encoding em {codificação: q}
+
+    Exemplo: "gzip;q=0.8, br" -> {"gzip": 0.8, "br": 1.0}
+    """
+    encodings = {}
+    for item in header.split(","):
+        partes = [p.strip() for p in item.split(";")]
+        nome = partes[0].lower()
+        if not nome:
+            continue
+        q = 1.0
+        for parametro in partes[1:]:
+            if parametro.startswith("q="):
+                try:
+                    q = float(parametro[2:])
+                except ValueError:
+                    q = 0.0
+        encodings[nome] = q
+    return encodings
+
+
+class BrotliResponder(IdentityResponder):
+    """Responder que comprime o corpo com brotli, inclusive em streaming"""
+
+    content_encoding = "br"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int = 4) -> None:
+        super().__init__(app, minimum_size)
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        data = self.compressor.process(body)
+        if more_body:
+            # Envia o que já foi comprimido para não segurar o streaming
+            return data + self.compressor.flush()
+        return data + self.compressor.finish()
+
+
+class CompressionMiddleware:
+    """
+    Middleware de compressão das respostas
+
+    Negocia brotli (quando o pacote está instalado) ou gzip a partir do
+    Accept-Encoding. Respostas menores que minimum_size, como /health, saem
+    sem compressão; respostas em streaming são comprimidas pedaço a pedaço.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encodings = parse_accept_encoding(
+            Headers(scope=scope).get("Accept-Encoding", "")
+        )
+
+        # Entre as codificações suportadas, vence a de maior q (empate: brotli)
+        suportadas = ["br", "gzip"] if brotli is not None else ["gzip"]
+        escolhida = max(suportadas, key=lambda nome: encodings.get(nome, 0))
+
+        responder: ASGIApp
+        if encodings.get(escolhida, 0) <= 0:
+            responder = IdentityResponder(self.app, self.minimum_size)
+        elif escolhida == "br":
+            responder = BrotliResponder(
+                self.app, self.minimum_size, quality=self.brotli_quality
+            )
+        else:
+            responder = GZipResponder(
+                self.app, self.minimum_size, compresslevel=self.gzip_level
+            )
+
+        await responder(scope, receive, send)
@@ -0,0 +1,70 @@
+import re
+from typing import Optional
+
+from fastapi import Header, HTTPException, Response, status
+
+from app.core.logging import log_warning
+
+CONFLITO_DETAIL = "Registro alterado por outra requisição; recarregue e tente novamente"
+
+_ETAG = re.compile(r'\*|(?:W/)?"[^"]*"')
+
+
+def parse_etag(valor: str) -> Optional[int]:
+    """
+    Converte um ETag ("3" ou W/"3") na versão do registro; "*" vira None
+    """
+    valor = valor.strip()
+    if valor == "*":
+        return None
+    if valor.startswith("W/"):
+        valor = valor[2:]
+    try:
+        return int(valor.strip('"'))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="If-Match inválido: use o ETag retornado pela API",
+        )
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Indica se o If-None-Match (lista separada por vírgulas, com "*" ou tags
+    fracas W/) casa com o ETag atual, pela comparação fraca
+    """
+    if not if_none_match:
+        return False
+    atual = etag.removeprefix("W/")
+    for tag in _ETAG.findall(if_none_match):
+        if tag == "*" or tag.removeprefix("W/") == atual:
+            return True
+    return False
+
+
+def get_if_match(if_match: Optional[str] = Header(None)) -> Optional[int]:
+    """Versão esperada informada no header If-Match (opcional)"""
+    if if_match is None:
+        return None
+    return parse_etag(if_match)
+
+
+def set_etag(response: Response, obj) -> None:
+    """Expõe a versão do registro no header ETag"""
+    response.headers["ETag"] = f'"{obj.versao}"'
+
+
+def version_conflict(**contexto) -> HTTPException:
+    """Erro 409 para uma gravação sobre uma versão desatualizada"""
+    log_warning("Conflito de versão na atualização", **contexto)
+    return HTTPException(status_code=status.HTTP_409_CONFLICT, detail=CONFLITO_DETAIL)
+
+
+def check_version(obj, versao_esperada: Optional[int], **contexto) -> None:
+    """
+    Recusa a alteração (409) se o cliente editou uma versão desatualizada
+    """
+    if versao_esperada is not None and obj.versao != versao_esperada:
+        raise version_conflict(
+            versao_atual=obj.versao, versao_esperada=versao_esperada, **contexto
+        )
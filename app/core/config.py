@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional
 
 
 class Settings(BaseSettings):
@@ -10,11 +10,18 @@ class Settings(BaseSettings):
 
     # Database - PostgreSQL RDS
     DATABASE_URL: str
+    # UPDATE/DELETE ... RETURNING nas escritas (quando o banco suporta)
+    DB_WRITE_RETURNING: bool = True
+    # Particiona avaliações e metas por ciclo_id (só PostgreSQL; vale para
+    # tabelas criadas depois de ligar)
+    DB_PARTITION_BY_CICLO: bool = False
 
     # JWT
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Matrículas com acesso administrativo, separadas por vírgula
+    ADMIN_MATRICULAS: str = ""
 
     # CORS
     ALLOWED_ORIGINS: str = "http://localhost:3000,http://localhost:8000"
@@ -33,6 +40,86 @@ class Settings(BaseSettings):
 
     # Log
     LOG_LEVEL: str = "INFO"
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_JSON: bool = False
+    # Taxa (0-1) de amostragem por evento de info/debug, ex.:
+    # {"Listando avaliações": 0.05, "Avaliações listadas": 0.05}
+    LOG_SAMPLE_RATES: Dict[str, float] = {}
+    LOG_DIR: str = "logs"
+    LOG_ROTATION: str = "time"  # "time" (diária, à meia-noite) ou "size"
+    LOG_MAX_BYTES: int = 50 * 1024 * 1024
+    LOG_BACKUP_COUNT: int = 14
+    LOG_COMPRESS: bool = True
+
+    # Performance
+    FAST_JSON_RESPONSE: bool = False
+    BATCH_MAX_IDS: int = 200
+    SERVER_TIMING_ENABLED: bool = False
+
+    # Métricas (/metrics no formato do Prometheus)
+    METRICS_ENABLED: bool = True
+    # Diretório compartilhado pelos workers; vazio = processo único
+    METRICS_MULTIPROC_DIR: Optional[str] = None
+    METRICS_FLUSH_INTERVAL: float = 1.0
+
+    # Profiling sob demanda (header X-Profile de administradores)
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 1.0
+    PROFILING_DIR: str = "profiles"
+    PROFILING_MAX_FILES: int = 50
+
+    # Aquecimento no startup (pool, bcrypt, serializadores e queries)
+    WARMUP_ENABLED: bool = True
+    WARMUP_POOL_CONNECTIONS: int = 5
+    WARMUP_MAX_ATTEMPTS: int = 3
+    WARMUP_RETRY_DELAY_SECONDS: float = 2.0
+
+    # Caches em memória e barramento de invalidação entre workers
+    # (memory: processo único; unix: workers no mesmo host; postgres: LISTEN/NOTIFY)
+    CACHE_TTL_SECONDS: float = 30.0
+    CACHE_BUS_BACKEND: str = "memory"
+    CACHE_BUS_DIR: str = "/tmp/avalia-cache-bus"
+    CACHE_BUS_CHANNEL: str = "cache_invalidation"
+
+    # Idempotency-Key nos POSTs: validade das chaves e tempo máximo de uma
+    # reserva sem resposta (depois disso outro retry pode assumir a chave)
+    IDEMPOTENCY_TTL_HOURS: int = 24
+    IDEMPOTENCY_LOCK_SECONDS: int = 60
+
+    # Desligamento: tempo máximo (s) esperando as requisições em andamento
+    # depois do SIGTERM
+    SHUTDOWN_DRAIN_TIMEOUT: float = 25.0
+
+    # Busca de colaboradores: máximo de resultados ranqueados por consulta
+    # (em termos muito amplos, os mais relevantes; o restante não é paginado)
+    SEARCH_MAX_CANDIDATES: int = 1000
+
+    # Jobs em segundo plano (tabela jobs): threads por processo (0 = só
+    # enfileira; outro processo executa), intervalo de busca de pendentes,
+    # tentativas e espera antes da 2ª (dobra a cada falha). Job em execução
+    # sem sinal de vida (renovado a cada 1/3 do prazo) por JOBS_STALE_SECONDS
+    # volta para a fila.
+    # JOBS_INLINE executa o job na própria requisição (testes)
+    JOBS_WORKERS: int = 2
+    JOBS_POLL_SECONDS: float = 2.0
+    JOBS_MAX_ATTEMPTS: int = 3
+    JOBS_RETRY_DELAY_SECONDS: float = 10.0
+    JOBS_STALE_SECONDS: float = 300.0
+    JOBS_INLINE: bool = False
+
+    # Fechamento de ciclo: avaliações concluídas por transação
+    CICLO_CLOSE_BATCH_SIZE: int = 1000
+
+    # Resultados de ciclo finalizado (snapshot): tempo (s) que o cliente usa
+    # a cópia sem revalidar. O snapshot pode ser regerado, então não é
+    # immutable; depois disso o ETag revalida com 304
+    SNAPSHOT_CACHE_MAX_AGE: int = 3600
+
+    # Compressão das respostas
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
 
     class Config:
         env_file = ".env"
@@ -4,7 +4,8 @@ from sqlalchemy.orm import Session
 from jose import JWTError
 from typing import Optional
 
-from app.core.security import decode_access_token
+from app.core.security import decode_access_token, is_admin
+from app.core.timing import timed
 from app.db.database import get_db
 from app.models.colaborador import Colaborador
 
@@ -24,7 +25,8 @@ def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    payload = decode_access_token(token)
+    with timed("jwt"):
+        payload = decode_access_token(token)
     
     if payload is None:
         raise credentials_exception
@@ -33,10 +35,11 @@ def get_current_user(
     if matricula is None:
         raise credentials_exception
     
-    user = db.query(Colaborador).filter(
-        Colaborador.matricula == matricula,
-        Colaborador.ativo == True
-    ).first()
+    with timed("auth"):
+        user = db.query(Colaborador).filter(
+            Colaborador.matricula == matricula,
+            Colaborador.ativo == True
+        ).first()
     
     if user is None:
         raise credentials_exception
@@ -55,4 +58,18 @@ def get_current_active_user(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Usuário inativo"
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+
+def get_current_admin_user(
+    current_user: Colaborador = Depends(get_current_active_user)
+) -> Colaborador:
+    """
+    Verifica se o usuário é administrador (ADMIN_MATRICULAS)
+    """
+    if not is_admin(current_user.matricula):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Acesso restrito a administradores"
+        )
+    return current_user
@@ -0,0 +1,59 @@
+from functools import lru_cache
+from typing import List, Optional, Type
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy.orm import Query, load_only
+
+
+@lru_cache(maxsize=None)
+def get_field_names(schema: Type[BaseModel]) -> tuple:
+    """
+    Retorna os nomes dos campos do schema
+    """
+    return tuple(schema.model_fields)
+
+
+def parse_fields(fields: Optional[str], schema: Type[BaseModel]) -> Optional[List[str]]:
+    """
+    Converte o parâmetro fields ("id,nome,...") em uma lista de campos
+
+    Args:
+        fields: Valor do query parameter, separado por vírgulas
+        schema: Schema de resposta que define os campos permitidos
+
+    Returns:
+        Lista de campos sem repetições ou None quando não informado
+    """
+    if not fields:
+        return None
+
+    campos = list(dict.fromkeys(c.strip() for c in fields.split(",") if c.strip()))
+    invalidos = [c for c in campos if c not in schema.model_fields]
+
+    if invalidos or not campos:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Campos inválidos: {', '.join(invalidos) or fields}",
+        )
+
+    return campos
+
+
+def project_query(
+    query: Query, model, schema: Type[BaseModel], campos: Optional[List[str]]
+) -> Query:
+    """
+    Restringe o SELECT às colunas que a resposta vai usar
+
+    Com campos informados, a consulta passa a selecionar só essas colunas e
+    devolve Rows em vez de entidades; colunas Text que não foram pedidas nem
+    são lidas do banco. Sem campos, carrega as colunas do schema de resposta,
+    deixando de fora colunas que nunca são retornadas (como senha_hash).
+    """
+    if campos:
+        return query.with_entities(*[getattr(model, campo) for campo in campos])
+
+    return query.options(
+        load_only(*[getattr(model, campo) for campo in get_field_names(schema)])
+    )
@@ -0,0 +1,176 @@
+import hashlib
+import hmac
+import json
+import random
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Optional, Type
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.dependencies import get_current_active_user
+from app.core.logging import log_info, log_warning
+from app.db.database import get_db
+from app.models.colaborador import Colaborador
+from app.models.idempotencia import ChaveIdempotencia
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAY_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+# Fração das novas chaves que também apagam as expiradas
+PURGE_PROBABILITY = 0.01
+
+
+class IdempotentReplay(Exception):
+    """Interrompe a requisição para devolver a resposta já registrada"""
+
+    def __init__(self, registro: ChaveIdempotencia):
+        self.status_code = registro.status_code
+        self.corpo = registro.corpo
+
+
+async def idempotent_replay_handler(request: Request, exc: IdempotentReplay):
+    return Response(
+        content=exc.corpo,
+        status_code=exc.status_code,
+        media_type="application/json",
+        headers={REPLAY_HEADER: "true"},
+    )
+
+
+class Idempotencia:
+    """Chave de idempotência da requisição atual (vazia sem o header)"""
+
+    def __init__(self, registro: Optional[ChaveIdempotencia] = None):
+        self.registro = registro
+
+    def concluir(self, status_code: int, schema: Type[BaseModel], obj: Any):
+        """
+        Guarda a resposta junto com a escrita: chame após o flush e antes do
+        commit, para que o registro e a linha criada entrem na mesma transação
+        """
+        if self.registro is None:
+            return
+        self.registro.status_code = status_code
+        self.registro.corpo = schema.model_validate(obj).model_dump_json()
+
+
+def _chave(matricula: str, request: Request, idempotency_key: str) -> str:
+    rota = request.scope.get("route")
+    caminho = rota.path if rota is not None else request.url.path
+    escopo = "\n".join((matricula, request.method, caminho, idempotency_key))
+    return hashlib.sha256(escopo.encode("utf-8")).hexdigest()
+
+
+def _hash_requisicao(corpo: bytes) -> str:
+    """HMAC do payload normalizado (o corpo pode conter senhas)"""
+    try:
+        corpo = json.dumps(
+            json.loads(corpo), sort_keys=True, separators=(",", ":")
+        ).encode("utf-8")
+    except ValueError:
+        pass
+    return hmac.new(
+        settings.SECRET_KEY.encode("utf-8"), corpo, hashlib.sha256
+    ).hexdigest()
+
+
+def _reservar(db: Session, chave: str, hash_requisicao: str) -> ChaveIdempotencia:
+    """
+    Reserva a chave para esta requisição ou interrompe com a resposta já
+    registrada (IdempotentReplay), 409 (em processamento) ou 422 (outro payload)
+    """
+    agora = datetime.utcnow()
+    registro = db.get(ChaveIdempotencia, chave)
+
+    if registro is None:
+        if random.random() < PURGE_PROBABILITY:
+            db.query(ChaveIdempotencia).filter(
+                ChaveIdempotencia.expira_em <= agora
+            ).delete(synchronize_session=False)
+        registro = ChaveIdempotencia(chave=chave)
+        db.add(registro)
+    elif registro.expira_em > agora:
+        if not hmac.compare_digest(registro.hash_requisicao, hash_requisicao):
+            log_warning("Idempotency-Key reutilizada com outro payload", chave=chave)
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key já utilizada com outro payload",
+            )
+        if registro.status_code is not None:
+            log_info("Resposta idempotente reenviada", chave=chave)
+            raise IdempotentReplay(registro)
+        limite = registro.criado_em + timedelta(
+            seconds=settings.IDEMPOTENCY_LOCK_SECONDS
+        )
+        if limite > agora:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Requisição com esta Idempotency-Key ainda em processamento",
+            )
+        # Reserva abandonada (worker caiu no meio): assume a chave
+
+    registro.hash_requisicao = hash_requisicao
+    registro.status_code = None
+    registro.corpo = None
+    registro.criado_em = agora
+    registro.expira_em = agora + timedelta(hours=settings.IDEMPOTENCY_TTL_HOURS)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Outra requisição com a mesma chave reservou primeiro
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Requisição com esta Idempotency-Key ainda em processamento",
+        )
+    return registro
+
+
+def _liberar(db: Session, chave: str):
+    """Desfaz a reserva de uma requisição que falhou, para permitir retry"""
+    db.rollback()
+    db.query(ChaveIdempotencia).filter(
+        ChaveIdempotencia.chave == chave, ChaveIdempotencia.status_code.is_(None)
+    ).delete(synchronize_session=False)
+    db.commit()
+
+
+async def get_idempotencia(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: Colaborador = Depends(get_current_active_user),
+) -> AsyncIterator[Idempotencia]:
+    """
+    Suporte ao header Idempotency-Key nos POSTs de criação
+
+    A primeira requisição reserva a chave e o endpoint grava a resposta com
+    `Idempotencia.concluir` na mesma transação da escrita. Retries com a
+    mesma chave e o mesmo payload recebem a resposta gravada (header
+    Idempotent-Replayed) sem passar pelas tabelas de negócio. Se o endpoint
+    falhar, a reserva é desfeita e o cliente pode tentar de novo.
+    """
+    idempotency_key = request.headers.get(IDEMPOTENCY_HEADER)
+    if not idempotency_key:
+        yield Idempotencia()
+        return
+
+    if len(idempotency_key) > MAX_KEY_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Idempotency-Key deve ter no máximo {MAX_KEY_LENGTH} caracteres",
+        )
+
+    chave = _chave(current_user.matricula, request, idempotency_key)
+    hash_requisicao = _hash_requisicao(await request.body())
+    registro = await run_in_threadpool(_reservar, db, chave, hash_requisicao)
+
+    try:
+        yield Idempotencia(registro)
+    except Exception:
+        await run_in_threadpool(_liberar, db, chave)
+        raise
@@ -0,0 +1,516 @@
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Response
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging import log_error, log_info, log_warning
+from app.core.metrics import JOB_DURATION, JOBS_RUNNING
+from app.models.job import Job, StatusJob
+
+SESSION_INFO_KEY = "jobs_enfileirados"
+
+# tipo -> função(ctx, **parametros) que executa o job
+_handlers: Dict[str, Callable[..., Optional[Dict[str, Any]]]] = {}
+
+
+class JobCancelado(Exception):
+    """Cancelamento pedido enquanto o job executava"""
+
+
+class JobInterrompido(Exception):
+    """
+    Processo em desligamento (o job volta para a fila) ou job assumido por
+    outra execução depois de dado como interrompido
+    """
+
+
+def job_handler(tipo: str):
+    """
+    Registra a função que executa os jobs do tipo
+
+    A função recebe o JobContext e os parâmetros do enqueue_job() e pode
+    devolver um dict JSON com o resultado. Ela pode rodar de novo após uma
+    falha ou interrupção, então precisa retomar de onde parou (ex.: processar
+    só o que ainda não foi processado).
+    """
+
+    def registrar(func):
+        _handlers[tipo] = func
+        return func
+
+    return registrar
+
+
+def enqueue_job(
+    db: Session,
+    tipo: str,
+    criado_por: Optional[str] = None,
+    max_tentativas: Optional[int] = None,
+    chave: Optional[str] = None,
+    **parametros,
+) -> Job:
+    """
+    Grava o job na sessão e o envia para execução depois do commit
+
+    Se a transação for desfeita, o job não existe e nada é executado.
+
+    Raises:
+        IntegrityError: já existe job pendente ou em execução com a chave
+    """
+    if tipo not in _handlers:
+        raise ValueError(f"Tipo de job desconhecido: {tipo}")
+    job = Job(
+        tipo=tipo,
+        parametros=json.dumps(parametros),
+        chave=chave,
+        criado_por=criado_por,
+        max_tentativas=max_tentativas or settings.JOBS_MAX_ATTEMPTS,
+    )
+    db.add(job)
+    db.flush()
+    db.info.setdefault(SESSION_INFO_KEY, []).append(job.id)
+    log_info("Job enfileirado", job_id=job.id, tipo=tipo, criado_por=criado_por)
+    return job
+
+
+def set_job_location(response: Response, job: Job):
+    """Aponta (Location) o endpoint de acompanhamento de um job aceito (202)"""
+    response.headers["Location"] = f"/api/jobs/{job.id}"
+
+
+def cancel_job(db: Session, job_id: int) -> bool:
+    """
+    Cancela um job pendente ou pede o cancelamento de um em execução
+
+    Returns:
+        False se o job já terminou
+    """
+    agora = datetime.utcnow()
+    pendente = db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == StatusJob.PENDENTE)
+        .values(status=StatusJob.CANCELADO, concluido_em=agora, atualizado_em=agora)
+    )
+    if pendente.rowcount:
+        return True
+    executando = db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == StatusJob.EXECUTANDO)
+        .values(cancelamento_solicitado=True)
+    )
+    return bool(executando.rowcount)
+
+
+def retry_job(db: Session, job_id: int) -> bool:
+    """
+    Devolve para a fila um job que falhou ou foi cancelado, com novas
+    tentativas; o progresso é mantido e o job retoma de onde parou
+
+    Returns:
+        False se o job não está em um desses estados
+
+    Raises:
+        IntegrityError: outro job com a mesma chave já está ativo
+    """
+    agora = datetime.utcnow()
+    reenfileirado = db.execute(
+        update(Job)
+        .where(
+            Job.id == job_id,
+            Job.status.in_([StatusJob.FALHOU, StatusJob.CANCELADO]),
+        )
+        .values(
+            status=StatusJob.PENDENTE,
+            tentativas=0,
+            erro=None,
+            cancelamento_solicitado=False,
+            executar_apos=agora,
+            concluido_em=None,
+            atualizado_em=agora,
+        )
+    )
+    if not reenfileirado.rowcount:
+        return False
+    db.info.setdefault(SESSION_INFO_KEY, []).append(job_id)
+    return True
+
+
+def _da_execucao(job_id: int, execucao: str):
+    """Condições de um UPDATE que só vale enquanto a execução é dona do job"""
+    return (
+        Job.id == job_id,
+        Job.status == StatusJob.EXECUTANDO,
+        Job.execucao == execucao,
+    )
+
+
+class JobContext:
+    """Acesso do job ao banco e ao próprio registro (progresso)"""
+
+    def __init__(self, runner: "JobRunner", job_id: int, execucao: str):
+        self.runner = runner
+        self.job_id = job_id
+        self.execucao = execucao
+
+    def session(self) -> Session:
+        """Nova sessão; o job controla as próprias transações"""
+        return self.runner.session_factory()
+
+    def progress(
+        self,
+        processados: int,
+        total: Optional[int] = None,
+        mensagem: Optional[str] = None,
+    ):
+        """
+        Grava o progresso (também é o sinal de vida do job)
+
+        Raises:
+            JobCancelado: cancelamento pedido pela API
+            JobInterrompido: processo em desligamento ou job assumido por
+                outra execução
+        """
+        valores: Dict[str, Any] = {
+            "processados": processados,
+            "atualizado_em": datetime.utcnow(),
+        }
+        if total is not None:
+            valores["total"] = total
+        if mensagem is not None:
+            valores["mensagem"] = mensagem[:500]
+
+        with self.session() as db:
+            dono = db.execute(
+                update(Job)
+                .where(*_da_execucao(self.job_id, self.execucao))
+                .values(**valores)
+            ).rowcount
+            cancelar = db.scalar(
+                select(Job.cancelamento_solicitado).where(Job.id == self.job_id)
+            )
+            db.commit()
+
+        if not dono:
+            log_warning("Job assumido por outra execução", job_id=self.job_id)
+            raise JobInterrompido()
+        if cancelar:
+            raise JobCancelado()
+        if self.runner.parando:
+            raise JobInterrompido()
+
+
+class JobRunner:
+    """
+    Executa os jobs da tabela jobs em um pool de threads do processo
+
+    A fila é a própria tabela: cada processo busca os pendentes a cada
+    JOBS_POLL_SECONDS e assume um job com um UPDATE condicional (status
+    pendente -> executando), então vários workers dividem a fila sem executar
+    o mesmo job duas vezes. Cada execução grava um token ao assumir; enquanto
+    roda, renova o sinal de vida em segundo plano, e um job recuperado por
+    outro processo deixa de aceitar o progresso e o resultado da anterior.
+    """
+
+    def __init__(self):
+        self.session_factory: Optional[Callable[[], Session]] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._poller: Optional[threading.Thread] = None
+        self._parar = threading.Event()
+        self._ativos = 0
+        self._lock = threading.Lock()
+        self._falhando = False
+
+    @property
+    def parando(self) -> bool:
+        return self._parar.is_set()
+
+    def start(self, session_factory: Callable[[], Session]):
+        self.stop()
+        self.session_factory = session_factory
+        self._parar.clear()
+        if settings.JOBS_INLINE or settings.JOBS_WORKERS <= 0:
+            log_info("Jobs em segundo plano desligados neste processo")
+            return
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.JOBS_WORKERS, thread_name_prefix="job"
+        )
+        self._poller = threading.Thread(
+            target=self._run_poller, name="jobs-poller", daemon=True
+        )
+        self._poller.start()
+        log_info("Jobs em segundo plano iniciados", workers=settings.JOBS_WORKERS)
+
+    def stop(self):
+        """
+        Para de buscar jobs; os em execução são interrompidos no próximo
+        progresso e voltam para a fila
+        """
+        self._parar.set()
+        if self._poller is not None:
+            self._poller.join(timeout=settings.JOBS_POLL_SECONDS + 1)
+            self._poller = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def submit(self, job_id: int):
+        """Executa o job agora (inline) ou em uma thread livre, se houver"""
+        if settings.JOBS_INLINE:
+            while self._execute(job_id, respeitar_espera=False):
+                pass
+            return
+        # Sem thread livre, o job fica para a próxima busca (deste ou de
+        # outro processo)
+        self._dispatch(job_id)
+
+    def _dispatch(self, job_id: int) -> bool:
+        with self._lock:
+            if self._executor is None or self._ativos >= settings.JOBS_WORKERS:
+                return False
+            self._ativos += 1
+            JOBS_RUNNING.labels().set(self._ativos)
+        self._executor.submit(self._run, job_id)
+        return True
+
+    def _run(self, job_id: int):
+        try:
+            self._execute(job_id)
+        except Exception as e:
+            log_error("Falha inesperada no executor de jobs", error=e, job_id=job_id)
+        finally:
+            with self._lock:
+                self._ativos -= 1
+                JOBS_RUNNING.labels().set(self._ativos)
+
+    def _run_poller(self):
+        while not self._parar.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                # Banco fora: registra uma vez por sequência de falhas
+                if not self._falhando:
+                    log_error("Falha ao buscar jobs pendentes", error=e)
+                self._falhando = True
+            else:
+                self._falhando = False
+            self._parar.wait(settings.JOBS_POLL_SECONDS)
+
+    def poll(self):
+        """Devolve à fila os jobs interrompidos e dispara os pendentes"""
+        agora = datetime.utcnow()
+        limite = agora - timedelta(seconds=settings.JOBS_STALE_SECONDS)
+
+        with self.session_factory() as db:
+            interrompidos = (
+                Job.status == StatusJob.EXECUTANDO,
+                Job.atualizado_em < limite,
+            )
+            db.execute(
+                update(Job)
+                .where(*interrompidos, Job.cancelamento_solicitado == True)
+                .values(status=StatusJob.CANCELADO, concluido_em=agora)
+            )
+            recuperados = db.execute(
+                update(Job)
+                .where(*interrompidos)
+                .values(status=StatusJob.PENDENTE, executar_apos=agora)
+            ).rowcount
+            db.commit()
+            if recuperados:
+                log_warning("Jobs interrompidos de volta à fila", total=recuperados)
+
+            livres = settings.JOBS_WORKERS - self._ativos
+            if livres <= 0:
+                return
+            pendentes = db.scalars(
+                select(Job.id)
+                .where(Job.status == StatusJob.PENDENTE, Job.executar_apos <= agora)
+                .order_by(Job.executar_apos, Job.id)
+                .limit(livres)
+            ).all()
+
+        for job_id in pendentes:
+            if not self._dispatch(job_id):
+                break
+
+    def _claim(self, db: Session, job_id: int, respeitar_espera: bool) -> Optional[str]:
+        """
+        Assume o job pendente (UPDATE condicional: só um processo vence)
+
+        Returns:
+            Token da execução, ou None se o job não estava disponível
+        """
+        agora = datetime.utcnow()
+        execucao = uuid.uuid4().hex
+        condicoes = [Job.id == job_id, Job.status == StatusJob.PENDENTE]
+        if respeitar_espera:
+            condicoes.append(Job.executar_apos <= agora)
+        assumido = db.execute(
+            update(Job)
+            .where(*condicoes)
+            .values(
+                status=StatusJob.EXECUTANDO,
+                execucao=execucao,
+                tentativas=Job.tentativas + 1,
+                iniciado_em=agora,
+                atualizado_em=agora,
+            )
+        ).rowcount
+        db.commit()
+        return execucao if assumido else None
+
+    def _keep_alive(self, job_id: int, execucao: str, fim: threading.Event):
+        """
+        Renova o sinal de vida enquanto o handler roda, inclusive em etapas
+        longas sem progresso; para quando a execução perde o job
+        """
+        while not fim.wait(settings.JOBS_STALE_SECONDS / 3):
+            try:
+                with self.session_factory() as db:
+                    dono = db.execute(
+                        update(Job)
+                        .where(*_da_execucao(job_id, execucao))
+                        .values(atualizado_em=datetime.utcnow())
+                    ).rowcount
+                    db.commit()
+            except Exception as e:
+                log_warning(
+                    "Falha ao renovar o sinal de vida do job",
+                    job_id=job_id,
+                    erro=str(e),
+                )
+                continue
+            if not dono:
+                return
+
+    def _execute(self, job_id: int, respeitar_espera: bool = True) -> bool:
+        """
+        Executa uma tentativa do job
+
+        Returns:
+            True se o job voltou para a fila para uma nova tentativa
+        """
+        with self.session_factory() as db:
+            execucao = self._claim(db, job_id, respeitar_espera)
+            if execucao is None:
+                return False
+            job = db.get(Job, job_id)
+            tipo, tentativas = job.tipo, job.tentativas
+            max_tentativas = job.max_tentativas
+            parametros = json.loads(job.parametros)
+
+        log_info("Executando job", job_id=job_id, tipo=tipo, tentativa=tentativas)
+        handler = _handlers.get(tipo)
+        ctx = JobContext(self, job_id, execucao)
+        inicio = time.perf_counter()
+        valores: Dict[str, Any] = {}
+        nova_tentativa = False
+        fim = threading.Event()
+        threading.Thread(
+            target=self._keep_alive,
+            args=(job_id, execucao, fim),
+            name=f"job-{job_id}-vivo",
+            daemon=True,
+        ).start()
+
+        try:
+            if handler is None:
+                raise LookupError(f"Tipo de job desconhecido: {tipo}")
+            resultado = handler(ctx, **parametros)
+        except JobCancelado:
+            valores["status"] = StatusJob.CANCELADO
+            log_info("Job cancelado", job_id=job_id, tipo=tipo)
+        except JobInterrompido:
+            # Não conta como tentativa: o processo é que está saindo
+            valores.update(status=StatusJob.PENDENTE, tentativas=tentativas - 1)
+            log_warning("Job interrompido", job_id=job_id, tipo=tipo)
+        except Exception as e:
+            valores["erro"] = f"{type(e).__name__}: {e}"[:2000]
+            if handler is not None and tentativas < max_tentativas:
+                espera = settings.JOBS_RETRY_DELAY_SECONDS * 2 ** (tentativas - 1)
+                valores.update(
+                    status=StatusJob.PENDENTE,
+                    executar_apos=datetime.utcnow() + timedelta(seconds=espera),
+                )
+                nova_tentativa = True
+                log_warning(
+                    "Falha no job, nova tentativa agendada",
+                    job_id=job_id,
+                    tipo=tipo,
+                    tentativa=tentativas,
+                    espera_s=espera,
+                    erro=valores["erro"],
+                )
+            else:
+                valores["status"] = StatusJob.FALHOU
+                log_error("Job falhou", error=e, job_id=job_id, tipo=tipo)
+        else:
+            valores.update(
+                status=StatusJob.CONCLUIDO,
+                erro=None,
+                resultado=json.dumps(resultado) if resultado is not None else None,
+            )
+            log_info(
+                "Job concluído",
+                job_id=job_id,
+                tipo=tipo,
+                duracao_ms=round((time.perf_counter() - inicio) * 1000, 1),
+            )
+        finally:
+            fim.set()
+
+        agora = datetime.utcnow()
+        if valores["status"] in (
+            StatusJob.CONCLUIDO,
+            StatusJob.FALHOU,
+            StatusJob.CANCELADO,
+        ):
+            valores["concluido_em"] = agora
+        with self.session_factory() as db:
+            dono = db.execute(
+                update(Job)
+                .where(*_da_execucao(job_id, execucao))
+                .values(**valores, atualizado_em=agora)
+            ).rowcount
+            db.commit()
+        if not dono:
+            # Dado como interrompido e assumido por outra execução, que é
+            # quem grava o desfecho
+            log_warning(
+                "Desfecho do job descartado: assumido por outra execução",
+                job_id=job_id,
+                tipo=tipo,
+            )
+            return False
+
+        JOB_DURATION.labels(tipo=tipo, status=valores["status"].value).observe(
+            time.perf_counter() - inicio
+        )
+        return nova_tentativa
+
+
+job_runner = JobRunner()
+
+
+@event.listens_for(Session, "after_commit")
+def _submit_after_commit(session: Session):
+    job_ids = session.info.pop(SESSION_INFO_KEY, None)
+    for job_id in job_ids or ():
+        try:
+            job_runner.submit(job_id)
+        except Exception as e:
+            # O job continua pendente e a busca periódica o executa
+            log_error("Falha ao disparar job", error=e, job_id=job_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(session: Session, previous_transaction):
+    session.info.pop(SESSION_INFO_KEY, None)
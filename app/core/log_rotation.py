@@ -0,0 +1,204 @@
+import glob
+import gzip
+import logging
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: sem lock entre processos
+    fcntl = None
+
+# Uma única thread comprime os arquivos rotacionados, fora do listener de logs
+_compression_executor = None
+
+
+def _get_compression_executor() -> ThreadPoolExecutor:
+    global _compression_executor
+    if _compression_executor is None:
+        _compression_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="log-gzip"
+        )
+    return _compression_executor
+
+
+def wait_compressions():
+    """
+    Aguarda as compressões de arquivos rotacionados em andamento
+    """
+    global _compression_executor
+    if _compression_executor is not None:
+        _compression_executor.shutdown(wait=True)
+        _compression_executor = None
+
+
+def _gzip_file(source: str, dest: str):
+    temporario = f"{dest}.tmp"
+    with open(source, "rb") as origem, gzip.open(temporario, "wb") as destino:
+        shutil.copyfileobj(origem, destino)
+    os.replace(temporario, dest)
+    os.remove(source)
+
+
+def gzip_namer(name: str) -> str:
+    """Nome final do arquivo rotacionado quando há compressão"""
+    return f"{name}.gz"
+
+
+def background_gzip_rotator(source: str, dest: str):
+    """
+    Renomeia o arquivo rotacionado e agenda a compressão em segundo plano
+
+    O rename é instantâneo e libera o arquivo principal para novos registros;
+    a compressão para dest (.gz) roda na thread de compressão.
+    """
+    pendente = dest[: -len(".gz")] if dest.endswith(".gz") else f"{dest}.pendente"
+    os.rename(source, pendente)
+    _get_compression_executor().submit(_gzip_file, pendente, dest)
+
+
+class ProcessSafeRotationMixin:
+    """
+    Permite que vários processos (workers do uvicorn) escrevam no mesmo arquivo
+
+    Cada registro é gravado segurando um flock em <arquivo>.lock. Antes de
+    escrever, o handler reabre o arquivo se outro processo já o rotacionou e
+    só então decide se precisa rotacionar, de modo que linhas não se
+    intercalam nem se perdem.
+    """
+
+    def _setup_rotation(self, backup_count: int, compress: bool):
+        self.backupCount = backup_count
+        self._lock_path = f"{self.baseFilename}.lock"
+        if compress:
+            self.namer = gzip_namer
+            self.rotator = background_gzip_rotator
+
+    @contextmanager
+    def _process_lock(self):
+        if fcntl is None:
+            yield
+            return
+        with open(self._lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _reopen_if_rotated(self):
+        if self.stream is None:
+            self.stream = self._open()
+            return
+        try:
+            atual = os.stat(self.baseFilename).st_ino
+        except FileNotFoundError:
+            atual = None
+        if atual != os.fstat(self.stream.fileno()).st_ino:
+            self.stream.close()
+            self.stream = self._open()
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            with self._process_lock():
+                self._reopen_if_rotated()
+                if self.shouldRollover(record):
+                    self.doRollover()
+                logging.FileHandler.emit(self, record)
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def getFilesToDelete(self):
+        """
+        Arquivos rotacionados além de backupCount, do mais antigo ao mais novo
+        """
+        rotacionados = []
+        for nome in glob.glob(f"{glob.escape(self.baseFilename)}.*"):
+            if nome.endswith((".lock", ".tmp")):
+                continue
+            try:
+                rotacionados.append((os.path.getmtime(nome), nome))
+            except FileNotFoundError:
+                # Pendente que a thread de compressão acabou de trocar pelo .gz
+                continue
+        rotacionados.sort()
+        if len(rotacionados) <= self.backupCount:
+            return []
+        return [
+            nome for _, nome in rotacionados[: len(rotacionados) - self.backupCount]
+        ]
+
+    def _purge_old_files(self):
+        if self.backupCount > 0:
+            for nome in self.getFilesToDelete():
+                try:
+                    os.remove(nome)
+                except FileNotFoundError:
+                    pass
+
+
+class SafeRotatingFileHandler(ProcessSafeRotationMixin, RotatingFileHandler):
+    """
+    Rotação por tamanho, com arquivos nomeados pelo horário da rotação
+
+    Nomes com horário (app.log.20250101-120000) em vez de .1/.2 evitam
+    renomear backups em cadeia, o que não é seguro enquanto um arquivo
+    anterior ainda está sendo comprimido.
+    """
+
+    def __init__(self, filename, max_bytes, backup_count, compress=True):
+        super().__init__(filename, maxBytes=max_bytes, encoding="utf-8")
+        self._setup_rotation(backup_count, compress)
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        base = f"{self.baseFilename}.{time.strftime('%Y%m%d-%H%M%S')}"
+        destino = self.rotation_filename(base)
+        sequencia = 1
+        while os.path.exists(destino) or os.path.exists(base):
+            base = f"{self.baseFilename}.{time.strftime('%Y%m%d-%H%M%S')}-{sequencia}"
+            destino = self.rotation_filename(base)
+            sequencia += 1
+
+        self.rotate(self.baseFilename, destino)
+        self._purge_old_files()
+        self.stream = self._open()
+
+
+class SafeTimedRotatingFileHandler(ProcessSafeRotationMixin, TimedRotatingFileHandler):
+    """Rotação por tempo (padrão: à meia-noite), segura entre processos"""
+
+    def __init__(self, filename, when, backup_count, compress=True):
+        super().__init__(filename, when=when, encoding="utf-8")
+        self._setup_rotation(backup_count, compress)
+
+    def doRollover(self):
+        agora = int(time.time())
+        inicio = self.rolloverAt - self.interval
+        periodo = time.gmtime(inicio) if self.utc else time.localtime(inicio)
+        destino = self.rotation_filename(
+            f"{self.baseFilename}.{time.strftime(self.suffix, periodo)}"
+        )
+
+        # Se outro worker já rotacionou este período, só agenda a próxima
+        pendente = destino[: -len(".gz")] if destino.endswith(".gz") else destino
+        if not (os.path.exists(destino) or os.path.exists(pendente)):
+            if self.stream:
+                self.stream.close()
+                self.stream = None
+            self.rotate(self.baseFilename, destino)
+            self._purge_old_files()
+            self.stream = self._open()
+
+        proxima = self.computeRollover(agora)
+        while proxima <= agora:
+            proxima += self.interval
+        self.rolloverAt = proxima
@@ -1,37 +1,220 @@
+import atexit
+import json
 import logging
+import queue
+import random
 import sys
-from datetime import datetime
+import threading
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
+from app.core.config import settings
+from app.core.log_rotation import (
+    SafeRotatingFileHandler,
+    SafeTimedRotatingFileHandler,
+    wait_compressions,
+)
+
 # Criar diretório de logs se não existir
-log_dir = Path("logs")
+log_dir = Path(settings.LOG_DIR)
 log_dir.mkdir(exist_ok=True)
 
 # Configurar formato do log
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
-# Configurar logger principal
-logger = logging.getLogger("itau_performance")
-logger.setLevel(logging.INFO)
+
+class KeyValueFormatter(logging.Formatter):
+    """
+    Formatter que acrescenta à mensagem o erro e os campos extras
+
+    Os campos chegam em record.campos (dict) e são montados como
+    "mensagem | Error: ... | chave=valor | ..." apenas na formatação, que
+    acontece na thread do QueueListener e não na da requisição.
+    """
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        partes = [record.message]
+
+        erro = getattr(record, "erro", None)
+        if erro is not None:
+            partes.append(f"Error: {erro}")
+
+        campos = getattr(record, "campos", None)
+        if campos:
+            partes.append(" | ".join(f"{k}={v}" for k, v in campos.items()))
+
+        record.message = " | ".join(partes)
+        return super().formatMessage(record)
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formatter que gera uma linha JSON por registro
+
+    A mensagem vai em "event" e os campos extras viram chaves de primeiro
+    nível, para que os logs possam ser filtrados e agregados sem parsing.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        documento = {
+            "timestamp": self.formatTime(record, DATE_FORMAT),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": record.getMessage(),
+        }
+
+        campos = getattr(record, "campos", None)
+        if campos:
+            documento.update(campos)
+
+        erro = getattr(record, "erro", None)
+        if erro is not None:
+            documento["error"] = str(erro)
+
+        taxa = getattr(record, "taxa_amostragem", None)
+        if taxa is not None:
+            documento["sample_rate"] = taxa
+
+        if record.exc_info:
+            documento["exc_info"] = self.formatException(record.exc_info)
+
+        return json.dumps(documento, ensure_ascii=False, default=str)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    QueueHandler que nunca bloqueia a thread que está logando
+
+    Com a fila cheia o registro é descartado e contado; assim que houver
+    espaço, um aviso com a quantidade descartada é enfileirado.
+    """
+
+    def __init__(self, fila: queue.Queue):
+        super().__init__(fila)
+        self.descartados = 0
+        self._descartados_pendentes = 0
+        self._lock_descartes = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # A formatação fica para o listener (mesmo processo), não é feita aqui
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock_descartes:
+                self.descartados += 1
+                self._descartados_pendentes += 1
+            return
+
+        if self._descartados_pendentes:
+            self._report_dropped(record.name)
+
+    def _report_dropped(self, name: str) -> None:
+        with self._lock_descartes:
+            pendentes, self._descartados_pendentes = self._descartados_pendentes, 0
+
+        aviso = logging.LogRecord(
+            name,
+            logging.WARNING,
+            __file__,
+            0,
+            "Registros de log descartados por fila cheia",
+            None,
+            None,
+        )
+        aviso.campos = {"descartados": pendentes}
+
+        try:
+            self.queue.put_nowait(aviso)
+        except queue.Full:
+            with self._lock_descartes:
+                self._descartados_pendentes += pendentes
+
+
+class BlockingSentinelQueueListener(QueueListener):
+    """QueueListener cujo sinal de parada espera vaga na fila limitada"""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+def build_formatter() -> logging.Formatter:
+    """
+    Retorna o formatter configurado (JSON com LOG_JSON, texto caso contrário)
+    """
+    if settings.LOG_JSON:
+        return JsonFormatter()
+    return KeyValueFormatter(LOG_FORMAT, DATE_FORMAT)
+
 
 # Handler para console (stdout)
 console_handler = logging.StreamHandler(sys.stdout)
 console_handler.setLevel(logging.INFO)
-console_formatter = logging.Formatter(LOG_FORMAT, DATE_FORMAT)
+console_formatter = build_formatter()
 console_handler.setFormatter(console_formatter)
 
+
+def build_file_handler() -> logging.Handler:
+    """
+    Cria o handler de arquivo com rotação por tamanho ou por dia (LOG_ROTATION)
+    """
+    filename = str(log_dir / "app.log")
+    if settings.LOG_ROTATION == "size":
+        return SafeRotatingFileHandler(
+            filename,
+            max_bytes=settings.LOG_MAX_BYTES,
+            backup_count=settings.LOG_BACKUP_COUNT,
+            compress=settings.LOG_COMPRESS,
+        )
+    return SafeTimedRotatingFileHandler(
+        filename,
+        when="midnight",
+        backup_count=settings.LOG_BACKUP_COUNT,
+        compress=settings.LOG_COMPRESS,
+    )
+
+
 # Handler para arquivo
-file_handler = logging.FileHandler(
-    f"logs/app_{datetime.now().strftime('%Y%m%d')}.log", encoding="utf-8"
-)
+file_handler = build_file_handler()
 file_handler.setLevel(logging.INFO)
-file_formatter = logging.Formatter(LOG_FORMAT, DATE_FORMAT)
+file_formatter = build_formatter()
 file_handler.setFormatter(file_formatter)
 
-# Adicionar handlers
-logger.addHandler(console_handler)
-logger.addHandler(file_handler)
+# Fila limitada: as requisições só enfileiram, o I/O acontece no listener
+log_queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+queue_handler = BoundedQueueHandler(log_queue)
+queue_listener = BlockingSentinelQueueListener(
+    log_queue, console_handler, file_handler, respect_handler_level=True
+)
+
+# Configurar logger principal
+logger = logging.getLogger("itau_performance")
+logger.setLevel(settings.LOG_LEVEL)
+logger.addHandler(queue_handler)
+
+queue_listener.start()
+
+
+def start_logging():
+    """Reinicia o listener da fila de logs, se tiver sido encerrado"""
+    if queue_listener._thread is None:
+        queue_listener.start()
+
+
+def stop_logging():
+    """
+    Processa os registros pendentes na fila, encerra o listener e aguarda a
+    compressão dos arquivos rotacionados
+    """
+    if queue_listener._thread is not None:
+        queue_listener.stop()
+    wait_compressions()
+
+
+atexit.register(stop_logging)
 
 
 def get_logger(name: str = "itau_performance"):
@@ -47,38 +230,38 @@ def get_logger(name: str = "itau_performance"):
     return logging.getLogger(name)
 
 
+def get_sample_rate(message: str):
+    """
+    Retorna a taxa de amostragem configurada para o evento (ou None)
+    """
+    return settings.LOG_SAMPLE_RATES.get(message)
+
+
 # Funções auxiliares para logs específicos
+# Os campos extras vão em record.campos e só viram texto no listener.
+# Eventos de info/debug listados em LOG_SAMPLE_RATES são amostrados; avisos e
+# erros são sempre registrados.
 def log_info(message: str, **kwargs):
     """Log de informação"""
-    extra_info = " | ".join([f"{k}={v}" for k, v in kwargs.items()])
-    if extra_info:
-        logger.info(f"{message} | {extra_info}")
-    else:
-        logger.info(message)
+    taxa = get_sample_rate(message)
+    if taxa is not None and random.random() >= taxa:
+        return
+    logger.info(message, extra={"campos": kwargs, "taxa_amostragem": taxa})
 
 
 def log_error(message: str, error: Exception = None, **kwargs):
     """Log de erro"""
-    extra_info = " | ".join([f"{k}={v}" for k, v in kwargs.items()])
-    if error:
-        logger.error(f"{message} | Error: {str(error)} | {extra_info}")
-    else:
-        logger.error(f"{message} | {extra_info}")
+    logger.error(message, extra={"campos": kwargs, "erro": error})
 
 
 def log_warning(message: str, **kwargs):
     """Log de aviso"""
-    extra_info = " | ".join([f"{k}={v}" for k, v in kwargs.items()])
-    if extra_info:
-        logger.warning(f"{message} | {extra_info}")
-    else:
-        logger.warning(message)
+    logger.warning(message, extra={"campos": kwargs})
 
 
 def log_debug(message: str, **kwargs):
     """Log de debug"""
-    extra_info = " | ".join([f"{k}={v}" for k, v in kwargs.items()])
-    if extra_info:
-        logger.debug(f"{message} | {extra_info}")
-    else:
-        logger.debug(message)
+    taxa = get_sample_rate(message)
+    if taxa is not None and random.random() >= taxa:
+        return
+    logger.debug(message, extra={"campos": kwargs, "taxa_amostragem": taxa})
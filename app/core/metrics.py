@@ -0,0 +1,498 @@
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self, lock: threading.Lock):
+        self.value = 0.0
+        self._lock = lock
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def snapshot(self):
+        return self.value
+
+
+class _GaugeChild(_CounterChild):
+    __slots__ = ()
+
+    def set(self, value: float):
+        self.value = float(value)
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "_lock")
+
+    def __init__(self, lock: threading.Lock, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # último: +Inf
+        self.sum = 0.0
+        self._lock = lock
+
+    def observe(self, value: float):
+        indice = len(self.buckets)
+        for i, limite in enumerate(self.buckets):
+            if value <= limite:
+                indice = i
+                break
+        with self._lock:
+            self.counts[indice] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - inicio)
+
+    def snapshot(self):
+        return {"counts": list(self.counts), "sum": self.sum}
+
+
+class Metric(ABC):
+    """Métrica com labels; cada combinação de valores vira uma série"""
+
+    type = ""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        registry: Optional["MetricsRegistry"] = None,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        (registry or REGISTRY).register(self)
+
+    @abstractmethod
+    def _new_child(self):
+        """Cria a série de uma nova combinação de labels"""
+
+    def labels(self, **labels):
+        chave = tuple(str(labels[nome]) for nome in self.labelnames)
+        child = self._children.get(chave)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(chave, self._new_child())
+        return child
+
+    def describe(self) -> dict:
+        return {
+            "type": self.type,
+            "help": self.documentation,
+            "labelnames": list(self.labelnames),
+        }
+
+    def samples(self) -> List[list]:
+        return [
+            [list(chave), child.snapshot()]
+            for chave, child in list(self._children.items())
+        ]
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def _new_child(self):
+        return _CounterChild(threading.Lock())
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild(threading.Lock())
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        registry: Optional["MetricsRegistry"] = None,
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramChild(threading.Lock(), self.buckets)
+
+    def describe(self) -> dict:
+        descricao = super().describe()
+        descricao["buckets"] = list(self.buckets)
+        return descricao
+
+
+class MetricsRegistry:
+    """Conjunto de métricas do processo e coletores executados antes da leitura"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: Metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Métrica já registrada: {metric.name}")
+        self._metrics[metric.name] = metric
+
+    def register_collector(self, collector: Callable[[], None]):
+        """Registra uma função que atualiza gauges antes de cada leitura"""
+        self._collectors.append(collector)
+
+    def snapshot(self) -> dict:
+        for collector in self._collectors:
+            collector()
+        return {
+            nome: {**metric.describe(), "samples": metric.samples()}
+            for nome, metric in self._metrics.items()
+        }
+
+
+REGISTRY = MetricsRegistry()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pares = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return "{" + pares + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def render(snapshot: dict) -> str:
+    """Gera o texto no formato de exposição do Prometheus"""
+    linhas = []
+    for nome, metrica in snapshot.items():
+        linhas.append(f"# HELP {nome} {metrica['help']}")
+        linhas.append(f"# TYPE {nome} {metrica['type']}")
+        labelnames = metrica["labelnames"]
+        for valores, amostra in metrica["samples"]:
+            if metrica["type"] != "histogram":
+                rotulos = _format_labels(labelnames, valores)
+                linhas.append(f"{nome}{rotulos} {_format_value(amostra)}")
+                continue
+
+            acumulado = 0
+            limites = metrica["buckets"] + [float("inf")]
+            for limite, quantidade in zip(limites, amostra["counts"]):
+                acumulado += quantidade
+                rotulos = _format_labels(
+                    [*labelnames, "le"], [*valores, _format_value(limite)]
+                )
+                linhas.append(f"{nome}_bucket{rotulos} {acumulado}")
+            rotulos = _format_labels(labelnames, valores)
+            linhas.append(f"{nome}_sum{rotulos} {_format_value(amostra['sum'])}")
+            linhas.append(f"{nome}_count{rotulos} {acumulado}")
+    return "\n".join(linhas) + "\n"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def merge_snapshots(snapshots: Dict[int, dict]) -> dict:
+    """
+    Soma contadores e histogramas de vários processos; gauges ganham o
+    label "pid" e só são mantidos para processos vivos
+    """
+    resultado: Dict[str, dict] = {}
+    for pid, snapshot in sorted(snapshots.items()):
+        for nome, metrica in snapshot.items():
+            destino = resultado.setdefault(nome, {**metrica, "samples": {}})
+            if metrica["type"] == "gauge":
+                if pid != os.getpid() and not _pid_alive(pid):
+                    continue
+                destino["labelnames"] = [*metrica["labelnames"], "pid"]
+                for valores, valor in metrica["samples"]:
+                    destino["samples"][(*valores, str(pid))] = valor
+                continue
+
+            for valores, valor in metrica["samples"]:
+                chave = tuple(valores)
+                atual = destino["samples"].get(chave)
+                if metrica["type"] == "histogram":
+                    if atual is None:
+                        atual = {"counts": [0] * len(valor["counts"]), "sum": 0.0}
+                    atual = {
+                        "counts": [
+                            a + b for a, b in zip(atual["counts"], valor["counts"])
+                        ],
+                        "sum": atual["sum"] + valor["sum"],
+                    }
+                else:
+                    atual = (atual or 0.0) + valor
+                destino["samples"][chave] = atual
+
+    for metrica in resultado.values():
+        metrica["samples"] = [
+            [list(chave), valor] for chave, valor in metrica["samples"].items()
+        ]
+    return resultado
+
+
+# Modo multiprocesso: com vários workers (uvicorn --workers N) cada processo
+# tem seus próprios contadores. Com METRICS_MULTIPROC_DIR definido, cada worker
+# grava periodicamente um snapshot (metrics_<pid>.json) nesse diretório e o
+# worker que atende o /metrics soma os snapshots de todos. O diretório deve ser
+# limpo antes de subir a aplicação, como no modo multiprocesso do
+# prometheus_client.
+def _snapshot_path(directory: str, pid: int) -> str:
+    return os.path.join(directory, f"metrics_{pid}.json")
+
+
+def write_snapshot(directory: str, registry: MetricsRegistry = REGISTRY):
+    """Grava o snapshot deste processo no diretório compartilhado"""
+    destino = _snapshot_path(directory, os.getpid())
+    temporario = f"{destino}.tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        json.dump(registry.snapshot(), arquivo)
+    os.replace(temporario, destino)
+
+
+def read_snapshots(directory: str) -> Dict[int, dict]:
+    """Lê os snapshots de todos os processos do diretório"""
+    snapshots = {}
+    for caminho in glob.glob(os.path.join(directory, "metrics_*.json")):
+        pid = int(os.path.basename(caminho)[len("metrics_") : -len(".json")])
+        try:
+            with open(caminho, encoding="utf-8") as arquivo:
+                snapshots[pid] = json.load(arquivo)
+        except (OSError, ValueError):
+            continue
+    return snapshots
+
+
+def generate_latest(registry: MetricsRegistry = REGISTRY) -> str:
+    """
+    Retorna as métricas no formato do Prometheus (agregadas entre processos
+    quando METRICS_MULTIPROC_DIR está definido)
+    """
+    if not settings.METRICS_MULTIPROC_DIR:
+        return render(registry.snapshot())
+
+    snapshots = read_snapshots(settings.METRICS_MULTIPROC_DIR)
+    # O processo atual usa os valores em memória, mais recentes que o arquivo
+    snapshots[os.getpid()] = registry.snapshot()
+    return render(merge_snapshots(snapshots))
+
+
+class _SnapshotWriter:
+    """Thread que grava o snapshot do processo a cada intervalo"""
+
+    def __init__(self):
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self, directory: str, interval: float):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        os.makedirs(directory, exist_ok=True)
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(interval):
+                write_snapshot(directory)
+
+        self._thread = threading.Thread(target=run, name="metrics-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop, directory)
+
+    def stop(self, directory: str):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        write_snapshot(directory)
+
+
+snapshot_writer = _SnapshotWriter()
+
+
+def start_multiprocess_writer():
+    """
+    Inicia a gravação periódica do snapshot (chamado no startup de cada worker)
+    """
+    if settings.METRICS_MULTIPROC_DIR:
+        snapshot_writer.start(
+            settings.METRICS_MULTIPROC_DIR, settings.METRICS_FLUSH_INTERVAL
+        )
+
+
+def stop_multiprocess_writer():
+    """
+    Encerra a gravação periódica gravando o snapshot final (no shutdown)
+    """
+    if settings.METRICS_MULTIPROC_DIR:
+        snapshot_writer.stop(settings.METRICS_MULTIPROC_DIR)
+
+
+# Métricas da aplicação
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "Total de requisições HTTP por rota e status",
+    ["method", "route", "status"],
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Latência das requisições HTTP por rota e status",
+    ["method", "route", "status"],
+)
+LOGINS = Counter(
+    "auth_logins_total",
+    "Tentativas de login por resultado",
+    ["resultado"],
+)
+PASSWORD_HASH_SECONDS = Histogram(
+    "password_hash_duration_seconds",
+    "Tempo de geração e verificação de hashes bcrypt",
+    ["operacao"],
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0),
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requisições HTTP em andamento",
+)
+HTTP_REJECTED_DRAINING = Counter(
+    "http_requests_rejected_draining_total",
+    "Requisições recusadas (503) durante o desligamento",
+)
+SHUTDOWN_DRAIN_SECONDS = Histogram(
+    "shutdown_drain_duration_seconds",
+    "Tempo esperando as requisições em andamento no desligamento",
+    ["resultado"],
+    buckets=(0.01, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0, 20.0, 30.0, 60.0),
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "Consultas aos caches em memória por resultado (hit/miss)",
+    ["cache", "resultado"],
+)
+CACHE_INVALIDATIONS = Counter(
+    "cache_invalidations_total",
+    "Invalidações de cache aplicadas por origem (local/remota/reconexao)",
+    ["origem"],
+)
+CACHE_BUS_DELAY = Histogram(
+    "cache_bus_delivery_seconds",
+    "Tempo entre a publicação de uma invalidação e a chegada em outro worker",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0),
+)
+DB_POOL = Gauge(
+    "db_pool_connections",
+    "Conexões do pool do SQLAlchemy por estado",
+    ["estado"],
+)
+JOB_DURATION = Histogram(
+    "job_duration_seconds",
+    "Duração das execuções de jobs em segundo plano por tipo e desfecho",
+    ["tipo", "status"],
+    buckets=(0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 300.0, 900.0, 3600.0),
+)
+JOBS_RUNNING = Gauge(
+    "jobs_running",
+    "Jobs em execução neste processo",
+)
+
+
+def collect_pool_metrics():
+    """Atualiza os gauges do pool de conexões da engine da aplicação"""
+    from app.db.database import engine
+
+    pool = engine.pool
+    for estado, metodo in (
+        ("tamanho", "size"),
+        ("em_uso", "checkedout"),
+        ("livres", "checkedin"),
+        ("overflow", "overflow"),
+    ):
+        leitura = getattr(pool, metodo, None)
+        if leitura is not None:
+            DB_POOL.labels(estado=estado).set(leitura())
+
+
+REGISTRY.register_collector(collect_pool_metrics)
+
+
+class MetricsMiddleware:
+    """
+    Conta requisições e mede a latência por template de rota e status
+
+    O label "route" usa o template da rota (/api/avaliacoes/{avaliacao_id}),
+    nunca o caminho real, para não criar uma série por ID. Requisições que não
+    casam com nenhuma rota vão para "<sem_rota>".
+    """
+
+    def __init__(self, app, excluded_paths: Sequence[str] = ("/metrics",)):
+        self.app = app
+        self.excluded_paths = set(excluded_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        inicio = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            labels = {
+                "method": scope["method"],
+                "route": getattr(route, "path", "<sem_rota>"),
+                "status": status_code,
+            }
+            HTTP_REQUESTS.labels(**labels).inc()
+            HTTP_LATENCY.labels(**labels).observe(time.perf_counter() - inicio)
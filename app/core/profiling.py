@@ -0,0 +1,196 @@
+import cProfile
+import functools
+import io
+import pstats
+import random
+import re
+import threading
+import uuid
+from contextvars import ContextVar
+from pathlib import Path
+from typing import List, Optional
+from urllib.parse import parse_qs
+
+from app.core.config import settings
+from app.core.logging import log_error, log_info
+from app.core.security import decode_access_token, is_admin
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+PROFILE_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+class RequestProfile:
+    """
+    Perfis cProfile de uma requisição
+
+    O cProfile só mede a thread em que foi ativado: um perfil cobre a thread
+    do event loop (roteamento, dependências async, renderização) e cada
+    endpoint síncrono executado no threadpool ganha o seu, somados no final.
+    """
+
+    def __init__(self):
+        self.id = uuid.uuid4().hex
+        self._profilers: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    def new_profiler(self) -> cProfile.Profile:
+        profiler = cProfile.Profile()
+        with self._lock:
+            self._profilers.append(profiler)
+        return profiler
+
+    def dump(self, path: Path):
+        with self._lock:
+            profilers = list(self._profilers)
+        pstats.Stats(*profilers).dump_stats(str(path))
+
+
+# Um perfil por vez na thread do event loop: dois cProfile ativos na mesma
+# thread se sobrepõem (e no Python 3.12+ o segundo falha)
+_event_loop_profiling = threading.Lock()
+
+# None para requisições não perfiladas: é só o que o endpoint consulta
+_active_profile: ContextVar[Optional[RequestProfile]] = ContextVar(
+    "active_profile", default=None
+)
+
+
+def profile_endpoint(endpoint):
+    """
+    Envolve um endpoint síncrono para ser perfilado na thread do threadpool
+    quando a requisição atual estiver sendo perfilada
+    """
+
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        profile = _active_profile.get()
+        if profile is None:
+            return endpoint(*args, **kwargs)
+        profiler = profile.new_profiler()
+        profiler.enable()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            profiler.disable()
+
+    return wrapper
+
+
+def get_profile_path(profile_id: str) -> Optional[Path]:
+    """Caminho do .prof de um ID válido (ou None para IDs malformados)"""
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    return Path(settings.PROFILING_DIR) / f"{profile_id}.prof"
+
+
+def list_profiles() -> List[Path]:
+    """Perfis armazenados, do mais recente ao mais antigo"""
+    diretorio = Path(settings.PROFILING_DIR)
+    if not diretorio.is_dir():
+        return []
+    return sorted(
+        diretorio.glob("*.prof"), key=lambda p: p.stat().st_mtime, reverse=True
+    )
+
+
+def format_profile(path: Path, limit: int = 50) -> str:
+    """Resumo em texto de um perfil, ordenado por tempo acumulado"""
+    saida = io.StringIO()
+    stats = pstats.Stats(str(path), stream=saida)
+    stats.sort_stats("cumulative").print_stats(limit)
+    return saida.getvalue()
+
+
+def _purge_old_profiles():
+    for antigo in list_profiles()[settings.PROFILING_MAX_FILES :]:
+        try:
+            antigo.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _requested_by_admin(scope) -> bool:
+    """
+    Verifica se a requisição pede perfil (header X-Profile ou ?profile=1) e
+    se o token é de um administrador
+    """
+    pedido = False
+    autorizacao = None
+    for nome, valor in scope["headers"]:
+        if nome == PROFILE_HEADER:
+            pedido = valor not in (b"", b"0", b"false")
+        elif nome == b"authorization":
+            autorizacao = valor.decode("latin-1")
+
+    if not pedido and b"profile=" in scope.get("query_string", b""):
+        query = parse_qs(scope["query_string"].decode("latin-1"))
+        pedido = query.get("profile", ["0"])[0] not in ("", "0", "false")
+
+    if not pedido or not autorizacao or not autorizacao.startswith("Bearer "):
+        return False
+
+    payload = decode_access_token(autorizacao[len("Bearer ") :])
+    return payload is not None and is_admin(payload.get("sub"))
+
+
+class ProfilingMiddleware:
+    """
+    Perfila com cProfile requisições de administradores que pedem perfil
+
+    O perfil é gravado em PROFILING_DIR/<id>.prof (formato pstats, abre em
+    snakeviz/pstats) e o ID volta no header X-Profile-Id. Requisições sem o
+    header/flag não passam por nenhum profiler.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _requested_by_admin(scope):
+            await self.app(scope, receive, send)
+            return
+
+        if random.random() >= settings.PROFILING_SAMPLE_RATE or (
+            not _event_loop_profiling.acquire(blocking=False)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                headers = [
+                    *message.get("headers", []),
+                    (PROFILE_ID_HEADER, profile.id.encode("latin-1")),
+                ]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = _active_profile.set(profile)
+        profiler = profile.new_profiler()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profiler.disable()
+            _event_loop_profiling.release()
+            _active_profile.reset(token)
+            self._store(profile, scope)
+
+    def _store(self, profile: RequestProfile, scope):
+        diretorio = Path(settings.PROFILING_DIR)
+        try:
+            diretorio.mkdir(parents=True, exist_ok=True)
+            profile.dump(diretorio / f"{profile.id}.prof")
+            _purge_old_profiles()
+        except OSError as e:
+            log_error("Falha ao gravar perfil da requisição", error=e)
+            return
+        log_info(
+            "Perfil da requisição gravado",
+            profile_id=profile.id,
+            metodo=scope["method"],
+            caminho=scope["path"],
+        )
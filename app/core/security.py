@@ -3,24 +3,35 @@ from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.core.metrics import PASSWORD_HASH_SECONDS
 
 pwd_context = CryptContext(
     schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=12, bcrypt__ident="2b"
 )
 
 
+def is_admin(matricula: Optional[str]) -> bool:
+    """
+    Verifica se a matrícula está entre os administradores (ADMIN_MATRICULAS)
+    """
+    admins = {m.strip() for m in settings.ADMIN_MATRICULAS.split(",") if m.strip()}
+    return matricula is not None and matricula in admins
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verifica se a senha em texto plano corresponde ao hash
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    with PASSWORD_HASH_SECONDS.labels(operacao="verify").time():
+        return pwd_context.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """
     Gera o hash bcrypt de uma senha
     """
-    return pwd_context.hash(password)
+    with PASSWORD_HASH_SECONDS.labels(operacao="hash").time():
+        return pwd_context.hash(password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -0,0 +1,74 @@
+from functools import lru_cache
+from typing import Any, Iterable, List, Type
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+from app.core.config import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson é opcional
+    orjson = None
+
+
+@lru_cache(maxsize=None)
+def get_list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    """
+    Retorna o TypeAdapter de List[schema], construído uma única vez por schema
+    """
+    return TypeAdapter(List[schema])
+
+
+def serialize_list(schema: Type[BaseModel], rows: Iterable[Any]) -> bytes:
+    """
+    Serializa objetos ORM para bytes JSON pelo próprio schema de resposta
+
+    A lista inteira é validada (from_attributes) e codificada pelo TypeAdapter
+    em cache, no pydantic-core: a saída é a mesma do response_model (enums,
+    datas, floats e opcionais), sem o jsonable_encoder e o json da stdlib do
+    caminho padrão do FastAPI.
+    """
+    adapter = get_list_adapter(schema)
+    return adapter.dump_json(adapter.validate_python(list(rows), from_attributes=True))
+
+
+def list_response(schema: Type[BaseModel], rows: Iterable[Any]) -> Any:
+    """
+    Retorna a lista de um endpoint de listagem
+
+    Com FAST_JSON_RESPONSE desligado devolve os próprios objetos, deixando o
+    FastAPI validar e codificar via response_model. Ligado, serializa com o
+    adapter em cache e devolve uma Response pronta, com o mesmo conteúdo.
+    """
+    if not settings.FAST_JSON_RESPONSE:
+        return rows
+
+    return Response(content=serialize_list(schema, rows), media_type="application/json")
+
+
+def partial_response(campos: List[str], rows: Iterable[Any]) -> Response:
+    """
+    Monta a resposta de uma listagem com apenas os campos pedidos (fields=)
+
+    Args:
+        campos: Campos selecionados, na ordem das colunas de cada Row
+        rows: Rows retornadas pela consulta projetada
+    """
+    content = [dict(zip(campos, row)) for row in rows]
+
+    if orjson is not None:
+        return Response(content=orjson.dumps(content), media_type="application/json")
+
+    return JSONResponse(content=jsonable_encoder(content))
+
+
+def get_default_response_class() -> Type[Response]:
+    """
+    Classe de resposta padrão da aplicação (orjson quando habilitado e instalado)
+    """
+    if settings.FAST_JSON_RESPONSE and orjson is not None:
+        return ORJSONResponse
+    return JSONResponse
@@ -0,0 +1,190 @@
+import asyncio
+import signal
+import threading
+import time
+
+from sqlalchemy.engine import Engine
+
+from app.core.cache_bus import cache_bus
+from app.core.jobs import job_runner
+from app.core.logging import log_info, log_warning, stop_logging
+from app.core.metrics import (
+    HTTP_IN_FLIGHT,
+    HTTP_REJECTED_DRAINING,
+    SHUTDOWN_DRAIN_SECONDS,
+    stop_multiprocess_writer,
+)
+from app.core.warmup import stop_warmup
+
+DRAIN_POLL_INTERVAL = 0.05
+
+REJECTED_BODY = b'{"detail":"Servidor em desligamento, tente novamente"}'
+
+
+class DrainState:
+    """
+    Requisições em andamento e modo de desligamento (drain) do processo
+
+    Só é alterado na thread do event loop (middleware, eventos de
+    startup/shutdown e o handler de SIGTERM), por isso dispensa lock.
+    """
+
+    def __init__(self):
+        self.em_andamento = 0
+        self.drenando = False
+        self.drenado = False
+
+    def iniciar_requisicao(self):
+        self.em_andamento += 1
+        HTTP_IN_FLIGHT.labels().set(self.em_andamento)
+
+    def finalizar_requisicao(self):
+        self.em_andamento -= 1
+        HTTP_IN_FLIGHT.labels().set(self.em_andamento)
+
+    def reiniciar(self):
+        """Volta a aceitar requisições (startup, inclusive após um shutdown)"""
+        self.drenando = False
+        self.drenado = False
+
+    async def drenar(self, timeout: float) -> bool:
+        """
+        Para de aceitar requisições e espera as em andamento terminarem
+
+        Returns:
+            True se todas terminaram dentro de `timeout` segundos
+        """
+        self.drenando = True
+        inicio = time.perf_counter()
+        limite = inicio + timeout
+        while self.em_andamento > 0 and time.perf_counter() < limite:
+            await asyncio.sleep(DRAIN_POLL_INTERVAL)
+
+        concluido = self.em_andamento == 0
+        duracao = time.perf_counter() - inicio
+        SHUTDOWN_DRAIN_SECONDS.labels(
+            resultado="concluido" if concluido else "timeout"
+        ).observe(duracao)
+        if concluido:
+            log_info("Requisições drenadas", duracao_ms=round(duracao * 1000, 1))
+        else:
+            log_warning(
+                "Tempo de drain esgotado com requisições em andamento",
+                em_andamento=self.em_andamento,
+                duracao_ms=round(duracao * 1000, 1),
+            )
+        self.drenado = True
+        return concluido
+
+
+drain_state = DrainState()
+
+
+class DrainMiddleware:
+    """
+    Conta as requisições em andamento e, durante o desligamento, recusa as
+    novas com 503 (Retry-After e Connection: close) para que o balanceador
+    as reenvie a outra instância
+    """
+
+    def __init__(self, app, state: DrainState = drain_state):
+        self.app = app
+        self.state = state
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self.state.drenando:
+            HTTP_REJECTED_DRAINING.labels().inc()
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 503,
+                    "headers": [
+                        (b"content-type", b"application/json"),
+                        (b"content-length", str(len(REJECTED_BODY)).encode()),
+                        (b"retry-after", b"5"),
+                        (b"connection", b"close"),
+                    ],
+                }
+            )
+            await send({"type": "http.response.body", "body": REJECTED_BODY})
+            return
+
+        self.state.iniciar_requisicao()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.state.finalizar_requisicao()
+
+
+def install_drain_signal_handler(
+    loop: asyncio.AbstractEventLoop, timeout: float, state: DrainState = drain_state
+) -> bool:
+    """
+    Entra em drain assim que o SIGTERM chega
+
+    O uvicorn só executa o shutdown da aplicação depois de fechar os sockets
+    e esperar as conexões terminarem, tarde demais para o drain. Por isso o
+    drain começa no próprio sinal: novas requisições (e /health/ready)
+    passam a receber 503, o processo espera até `timeout` segundos pelas
+    requisições em andamento e só então repassa o sinal ao handler anterior
+    (o do uvicorn), que segue com o desligamento. Um segundo SIGTERM é
+    repassado na hora.
+
+    Returns:
+        False fora da thread principal, onde não é possível tratar sinais
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return False
+
+    anterior = signal.getsignal(signal.SIGTERM)
+
+    def repassar(sig, frame):
+        if callable(anterior):
+            anterior(sig, frame)
+        elif anterior == signal.SIG_DFL:
+            signal.signal(sig, signal.SIG_DFL)
+            signal.raise_signal(sig)
+
+    async def drenar_e_repassar(sig, frame):
+        log_info("Sinal de desligamento recebido", em_andamento=state.em_andamento)
+        await state.drenar(timeout)
+        repassar(sig, frame)
+
+    def ao_receber_sinal(sig, frame):
+        # Roda entre dois bytecodes da thread do event loop: só marca o
+        # estado e agenda o resto (nada de logs ou locks aqui)
+        if state.drenando:
+            repassar(sig, frame)
+            return
+        state.drenando = True
+        loop.call_soon_threadsafe(loop.create_task, drenar_e_repassar(sig, frame))
+
+    signal.signal(signal.SIGTERM, ao_receber_sinal)
+    return True
+
+
+async def graceful_shutdown(engine: Engine, timeout: float):
+    """
+    Desligamento ordenado: drena as requisições (se o SIGTERM ainda não o
+    fez), espera o aquecimento em andamento, para os jobs em segundo plano
+    (os em execução voltam para a fila), encerra o barramento de cache, fecha as conexões do pool, grava
+    o snapshot final das métricas e esvazia a fila de logs
+    """
+    inicio = time.perf_counter()
+    if not drain_state.drenado:
+        await drain_state.drenar(timeout)
+
+    stop_warmup(timeout)
+    job_runner.stop()
+    cache_bus.stop()
+    engine.dispose()
+    stop_multiprocess_writer()
+    log_info(
+        "Aplicação encerrada",
+        duracao_ms=round((time.perf_counter() - inicio) * 1000, 1),
+    )
+    stop_logging()
@@ -0,0 +1,214 @@
+import functools
+import inspect
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.logging import log_info
+from app.core.profiling import profile_endpoint
+
+# Ordem das fases no header Server-Timing
+PHASES = ("jwt", "auth", "db", "handler", "serialize", "total")
+
+
+class RequestTimings:
+    """Tempos (em segundos) acumulados pelas fases de uma requisição"""
+
+    __slots__ = ("durations", "queries", "handler_end")
+
+    def __init__(self):
+        self.durations: Dict[str, float] = {}
+        self.queries = 0
+        self.handler_end: Optional[float] = None
+
+    def add(self, phase: str, seconds: float):
+        self.durations[phase] = self.durations.get(phase, 0.0) + seconds
+
+    def header_value(self) -> str:
+        partes = []
+        for phase in PHASES:
+            if phase not in self.durations:
+                continue
+            item = f"{phase};dur={self.durations[phase] * 1000:.2f}"
+            if phase == "db":
+                item += f';desc="{self.queries} queries"'
+            partes.append(item)
+        return ", ".join(partes)
+
+    def log_fields(self) -> Dict[str, float]:
+        campos = {
+            f"{phase}_ms": round(self.durations[phase] * 1000, 2)
+            for phase in PHASES
+            if phase in self.durations
+        }
+        campos["queries"] = self.queries
+        return campos
+
+
+# None fora de uma requisição medida: cada ponto de medição só consulta a
+# ContextVar, então o custo com SERVER_TIMING_ENABLED=False é desprezível
+_current_timings: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def get_current_timings() -> Optional[RequestTimings]:
+    """Retorna os tempos da requisição atual (ou None se não medida)"""
+    return _current_timings.get()
+
+
+@contextmanager
+def timed(phase: str):
+    """
+    Acumula o tempo do bloco na fase informada da requisição atual
+    """
+    timings = _current_timings.get()
+    if timings is None:
+        yield
+        return
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - inicio)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_timings.get() is not None:
+        conn.info.setdefault("timing_inicio", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timings = _current_timings.get()
+    inicios = conn.info.get("timing_inicio")
+    if timings is None or not inicios:
+        return
+    timings.add("db", time.perf_counter() - inicios.pop())
+    timings.queries += 1
+
+
+def install_sql_timing():
+    """
+    Registra os listeners que medem o tempo de SQL de todas as engines
+    """
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _time_endpoint(endpoint):
+    """Envolve o endpoint medindo a fase "handler" (sync ou async)"""
+
+    def finish(timings: RequestTimings, inicio: float):
+        timings.handler_end = time.perf_counter()
+        timings.add("handler", timings.handler_end - inicio)
+
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            timings = _current_timings.get()
+            if timings is None:
+                return await endpoint(*args, **kwargs)
+            inicio = time.perf_counter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                finish(timings, inicio)
+
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def sync_wrapper(*args, **kwargs):
+        timings = _current_timings.get()
+        if timings is None:
+            return endpoint(*args, **kwargs)
+        inicio = time.perf_counter()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            finish(timings, inicio)
+
+    return sync_wrapper
+
+
+class TimedRoute(APIRoute):
+    """
+    APIRoute que separa o tempo do endpoint do tempo de serialização
+
+    "handler" é a execução da função do endpoint; "serialize" é o que o
+    FastAPI faz depois dela (validação pelo response_model, jsonable_encoder
+    e renderização do JSON). Com PROFILING_ENABLED, endpoints síncronos
+    também são perfilados na thread do threadpool quando pedido.
+    """
+
+    def get_route_handler(self):
+        endpoint = self.dependant.call
+        if settings.PROFILING_ENABLED and not inspect.iscoroutinefunction(endpoint):
+            endpoint = profile_endpoint(endpoint)
+        self.dependant.call = _time_endpoint(endpoint)
+        route_handler = super().get_route_handler()
+
+        async def timed_route_handler(request):
+            timings = _current_timings.get()
+            response = await route_handler(request)
+            if timings is not None and timings.handler_end is not None:
+                timings.add("serialize", time.perf_counter() - timings.handler_end)
+            return response
+
+        return timed_route_handler
+
+
+class ServerTimingMiddleware:
+    """
+    Mede as fases de cada requisição e as expõe no header Server-Timing
+
+    Deve ser o middleware mais externo, para que "total" inclua os demais
+    (compressão, CORS). Os mesmos tempos são registrados no log como campos
+    estruturados.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        install_sql_timing()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current_timings.set(timings)
+        inicio = time.perf_counter()
+        status_code = None
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                timings.durations["total"] = time.perf_counter() - inicio
+                headers = list(message.get("headers", []))
+                headers.append(
+                    (b"server-timing", timings.header_value().encode("latin-1"))
+                )
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_timings.reset(token)
+            route = scope.get("route")
+            log_info(
+                "Tempos da requisição",
+                metodo=scope["method"],
+                rota=getattr(route, "path", scope["path"]),
+                status=status_code,
+                **timings.log_fields(),
+            )
@@ -0,0 +1,250 @@
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging import log_info, log_warning
+from app.core.security import create_access_token, decode_access_token, pwd_context
+from app.core.serialization import serialize_list
+from app.db.snapshots import finalized_ciclos
+from app.models.avaliacao import AvaliacaoComportamental, Ciclo, Meta
+from app.models.colaborador import Colaborador
+from app.schemas.avaliacao import (
+    AvaliacaoComportamentalResponse,
+    CicloResponse,
+    MetaResponse,
+)
+from app.schemas.colaborador import ColaboradorResponse
+
+
+class WarmupState:
+    """
+    Progresso do aquecimento (warm-up) executado no startup
+
+    Cada etapa registra status, duração, tentativas e erro. O aquecimento só
+    é concluído quando todas as etapas dão certo; se alguma ainda falhar
+    depois de WARMUP_MAX_ATTEMPTS tentativas, ele termina como falho e
+    /health/ready segue 503.
+    """
+
+    def __init__(self):
+        self.iniciado_em: Optional[datetime] = None
+        self.concluido_em: Optional[datetime] = None
+        self.falhou = False
+        self.etapas: Dict[str, Dict] = {}
+        self.thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._concluido = threading.Event()
+        self._parar = threading.Event()
+
+    @property
+    def iniciado(self) -> bool:
+        return self.iniciado_em is not None
+
+    @property
+    def concluido(self) -> bool:
+        return self._concluido.is_set()
+
+    def concluir(self):
+        self.concluido_em = datetime.utcnow()
+        self._concluido.set()
+
+    def falhar(self):
+        self.falhou = True
+
+    def parar(self):
+        """Não inicia novas rodadas de tentativas (desligamento)"""
+        self._parar.set()
+
+    def aguardar(self, timeout: Optional[float] = None) -> bool:
+        return self._concluido.wait(timeout)
+
+    def registrar(
+        self,
+        etapa: str,
+        inicio: float,
+        tentativa: int = 1,
+        erro: Optional[Exception] = None,
+    ):
+        with self._lock:
+            self.etapas[etapa] = {
+                "status": "erro" if erro else "ok",
+                "duracao_ms": round((time.perf_counter() - inicio) * 1000, 1),
+                "tentativas": tentativa,
+                **({"erro": str(erro)} if erro else {}),
+            }
+
+    def resumo(self) -> Dict:
+        with self._lock:
+            return {
+                "iniciado_em": self.iniciado_em,
+                "concluido_em": self.concluido_em,
+                "falhou": self.falhou,
+                "etapas": dict(self.etapas),
+            }
+
+
+warmup_state = WarmupState()
+
+
+def warm_pool(engine: Engine, conexoes: int):
+    """
+    Abre até `conexoes` conexões simultâneas para que fiquem no pool
+    """
+    pool = engine.pool
+    limite = getattr(pool, "size", None)
+    if limite is not None:
+        conexoes = min(conexoes, limite())
+
+    abertas = []
+    try:
+        for _ in range(conexoes):
+            conexao = engine.connect()
+            abertas.append(conexao)
+            conexao.execute(text("SELECT 1"))
+    finally:
+        for conexao in abertas:
+            conexao.close()
+
+
+def warm_crypto():
+    """
+    Inicializa o backend bcrypt do passlib e as rotinas de JWT
+    """
+    hash_aquecimento = pwd_context.hash("aquecimento")
+    pwd_context.verify("aquecimento", hash_aquecimento)
+    decode_access_token(create_access_token({"sub": "aquecimento"}))
+
+
+def warm_serializers():
+    """
+    Constrói os TypeAdapters das listagens e exercita o serializador JSON
+    """
+    for schema in (
+        ColaboradorResponse,
+        AvaliacaoComportamentalResponse,
+        MetaResponse,
+        CicloResponse,
+    ):
+        serialize_list(schema, [])
+
+
+def warm_queries(session_factory: Callable[[], Session]):
+    """
+    Executa as consultas mais comuns para aquecer o cache de compilação do
+    SQLAlchemy e o do banco
+    """
+    db = session_factory()
+    try:
+        db.query(Ciclo).filter(Ciclo.status == "em_andamento").first()
+        db.query(Colaborador).filter(
+            Colaborador.matricula == "", Colaborador.ativo == True
+        ).first()
+        db.query(AvaliacaoComportamental).filter(
+            AvaliacaoComportamental.avaliado_matricula == ""
+        ).all()
+        db.query(AvaliacaoComportamental).filter(
+            AvaliacaoComportamental.avaliador_matricula == "",
+            AvaliacaoComportamental.status == "pendente",
+        ).all()
+        db.query(Meta).filter(Meta.colaborador_matricula == "").all()
+        # Já carrega o cache consultado na criação de avaliações e metas
+        finalized_ciclos(db)
+    finally:
+        db.close()
+
+
+def run_warmup(
+    engine: Engine,
+    session_factory: Callable[[], Session],
+    state: WarmupState = warmup_state,
+):
+    """
+    Executa as etapas de aquecimento, registrando cada uma em `state`
+
+    Etapas com falha são repetidas (até WARMUP_MAX_ATTEMPTS rodadas, com
+    WARMUP_RETRY_DELAY_SECONDS entre elas) sem interromper as demais; o
+    estado só é concluído se todas terminarem bem.
+    """
+    state.iniciado_em = datetime.utcnow()
+    etapas: List[Tuple[str, Callable[[], None]]] = [
+        ("pool", lambda: warm_pool(engine, settings.WARMUP_POOL_CONNECTIONS)),
+        ("crypto", warm_crypto),
+        ("serializacao", warm_serializers),
+        ("queries", lambda: warm_queries(session_factory)),
+    ]
+
+    pendentes = etapas
+    for tentativa in range(1, settings.WARMUP_MAX_ATTEMPTS + 1):
+        if tentativa > 1 and state._parar.wait(settings.WARMUP_RETRY_DELAY_SECONDS):
+            log_info("Aquecimento interrompido pelo desligamento")
+            return
+
+        falhas = []
+        for nome, etapa in pendentes:
+            inicio = time.perf_counter()
+            try:
+                etapa()
+            except Exception as e:
+                state.registrar(nome, inicio, tentativa, e)
+                log_warning(
+                    "Falha no aquecimento", etapa=nome, tentativa=tentativa, erro=str(e)
+                )
+                falhas.append((nome, etapa))
+            else:
+                state.registrar(nome, inicio, tentativa)
+
+        pendentes = falhas
+        if not pendentes:
+            break
+
+    if pendentes:
+        state.falhar()
+        log_warning(
+            "Aquecimento falhou, processo segue fora do ar para o balanceador",
+            etapas=",".join(nome for nome, _ in pendentes),
+        )
+        return
+
+    state.concluir()
+    log_info(
+        "Aquecimento concluído",
+        **{f"{nome}_ms": dados["duracao_ms"] for nome, dados in state.etapas.items()},
+    )
+
+
+def start_warmup(engine: Engine, session_factory: Callable[[], Session]):
+    """
+    Inicia o aquecimento em segundo plano (uma vez por processo)
+
+    O servidor já responde enquanto aquece; /health/ready fica 503 até o
+    aquecimento terminar.
+    """
+    if warmup_state.iniciado:
+        return
+    warmup_state.iniciado_em = datetime.utcnow()
+    warmup_state.thread = threading.Thread(
+        target=run_warmup,
+        args=(engine, session_factory),
+        name="warmup",
+        daemon=True,
+    )
+    warmup_state.thread.start()
+
+
+def stop_warmup(timeout: float, state: WarmupState = warmup_state):
+    """
+    Espera o aquecimento em andamento terminar, sem novas rodadas de
+    tentativas
+
+    Encerrar o processo com a thread dentro de código nativo (o bcrypt da
+    etapa crypto) aborta o interpretador em vez de sair normalmente.
+    """
+    state.parar()
+    if state.thread is not None:
+        state.thread.join(timeout)
@@ -0,0 +1,135 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.cache_bus import invalidate_on_commit
+from app.core.config import settings
+from app.core.jobs import JobContext, job_handler
+from app.core.logging import log_info
+from app.db.snapshots import build_snapshot
+from app.db.writes import update_returning
+from app.models.avaliacao import (
+    AvaliacaoComportamental,
+    Ciclo,
+    StatusAvaliacao,
+    StatusCiclo,
+    media_competencias,
+)
+from app.models.snapshot import CicloSnapshot
+
+JOB_FECHAR_CICLO = "fechar_ciclo"
+
+_a = AvaliacaoComportamental
+
+# Média das competências, para as avaliações que ainda não a têm
+MEDIA_CALCULADA = func.coalesce(_a.media_competencias, media_competencias())
+
+
+def conclude_pending(db: Session, ciclo_id: int, limite: Optional[int] = None) -> int:
+    """
+    Conclui as avaliações não concluídas do ciclo com um UPDATE por lote
+    (sem carregar as linhas), calculando a média que faltar
+
+    Returns:
+        Quantidade de avaliações concluídas
+    """
+    pendentes = (_a.ciclo_id == ciclo_id, _a.status != StatusAvaliacao.CONCLUIDA)
+    filtro = pendentes
+    if limite is not None:
+        lote = select(_a.id).where(*pendentes).order_by(_a.id).limit(limite)
+        filtro = (_a.id.in_(lote), *pendentes)
+
+    return db.execute(
+        update(_a)
+        .where(*filtro)
+        .values(
+            status=StatusAvaliacao.CONCLUIDA,
+            media_competencias=MEDIA_CALCULADA,
+            versao=_a.versao + 1,
+            atualizado_em=datetime.utcnow(),
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+
+@job_handler(JOB_FECHAR_CICLO)
+def close_ciclo(ctx: JobContext, ciclo_id: int) -> Dict[str, Any]:
+    """
+    Fecha o ciclo: conclui as avaliações pendentes em lotes e finaliza o
+    ciclo gerando o snapshot dos resultados
+
+    Cada lote é uma transação curta (CICLO_CLOSE_BATCH_SIZE avaliações), então
+    uma execução interrompida retoma do que ainda falta. A finalização
+    (sobras criadas durante o fechamento, status e snapshot) é atômica.
+    """
+    lote = settings.CICLO_CLOSE_BATCH_SIZE
+
+    with ctx.session() as db:
+        ciclo = db.get(Ciclo, ciclo_id)
+        if ciclo is None:
+            raise LookupError(f"Ciclo {ciclo_id} não encontrado")
+        if ciclo.status == StatusCiclo.FINALIZADO:
+            # Execução anterior finalizou antes de registrar o resultado
+            snapshot = db.get(CicloSnapshot, ciclo_id)
+            return {
+                "avaliacoes_concluidas": 0,
+                "colaboradores": snapshot.total_colaboradores if snapshot else None,
+            }
+
+        total, concluidas = db.execute(
+            select(
+                func.count(),
+                func.coalesce(
+                    func.sum(
+                        case((_a.status == StatusAvaliacao.CONCLUIDA, 1), else_=0)
+                    ),
+                    0,
+                ),
+            ).where(_a.ciclo_id == ciclo_id)
+        ).one()
+
+    ctx.progress(concluidas, total=total, mensagem="Concluindo avaliações")
+
+    concluidas_agora = 0
+    while True:
+        with ctx.session() as db:
+            afetadas = conclude_pending(db, ciclo_id, lote)
+            db.commit()
+        if not afetadas:
+            break
+        concluidas_agora += afetadas
+        ctx.progress(concluidas + concluidas_agora)
+
+    ctx.progress(
+        concluidas + concluidas_agora, mensagem="Finalizando ciclo e resultados"
+    )
+
+    with ctx.session() as db:
+        concluidas_agora += conclude_pending(db, ciclo_id)
+        finalizado = update_returning(
+            db,
+            Ciclo,
+            [Ciclo.id == ciclo_id, Ciclo.status != StatusCiclo.FINALIZADO],
+            {"status": StatusCiclo.FINALIZADO},
+        )
+        if finalizado is None:
+            # Finalizado por outra requisição (PUT) no meio do caminho; o
+            # snapshot foi gerado por ela
+            db.rollback()
+            log_info("Ciclo finalizado durante o fechamento", ciclo_id=ciclo_id)
+            return {"avaliacoes_concluidas": concluidas_agora, "colaboradores": None}
+        snapshot = build_snapshot(db, ciclo_id)
+        colaboradores = snapshot.total_colaboradores
+        invalidate_on_commit(db, "ciclos")
+        db.commit()
+
+    log_info(
+        "Ciclo fechado",
+        ciclo_id=ciclo_id,
+        avaliacoes_concluidas=concluidas_agora,
+        colaboradores=colaboradores,
+    )
+
+    return {"avaliacoes_concluidas": concluidas_agora, "colaboradores": colaboradores}
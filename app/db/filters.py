@@ -0,0 +1,123 @@
+import operator
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Query
+
+from app.models.avaliacao import AvaliacaoComportamental, Meta
+from app.models.colaborador import Colaborador
+
+# Filtros e ordenações aceitos por entidade. Só entram colunas indexadas,
+# para que nenhuma combinação pedida pelo cliente force um full scan;
+# para liberar uma coluna nova, crie o índice junto.
+# Filtro: parâmetro -> (coluna, operador)
+FILTROS_AVALIACAO = {
+    "criado_em_de": (AvaliacaoComportamental.criado_em, operator.ge),
+    "criado_em_ate": (AvaliacaoComportamental.criado_em, operator.le),
+    "media_min": (AvaliacaoComportamental.media_competencias, operator.ge),
+    "media_max": (AvaliacaoComportamental.media_competencias, operator.le),
+}
+ORDENACAO_AVALIACAO = {
+    "id": AvaliacaoComportamental.id,
+    "criado_em": AvaliacaoComportamental.criado_em,
+    "media_competencias": AvaliacaoComportamental.media_competencias,
+}
+
+FILTROS_META = {
+    "criado_em_de": (Meta.criado_em, operator.ge),
+    "criado_em_ate": (Meta.criado_em, operator.le),
+    "data_limite_de": (Meta.data_limite, operator.ge),
+    "data_limite_ate": (Meta.data_limite, operator.le),
+    "resultado_min": (Meta.resultado_alcancado, operator.ge),
+    "resultado_max": (Meta.resultado_alcancado, operator.le),
+}
+ORDENACAO_META = {
+    "id": Meta.id,
+    "criado_em": Meta.criado_em,
+    "data_limite": Meta.data_limite,
+    "resultado_alcancado": Meta.resultado_alcancado,
+}
+
+FILTROS_COLABORADOR = {
+    "criado_em_de": (Colaborador.criado_em, operator.ge),
+    "criado_em_ate": (Colaborador.criado_em, operator.le),
+}
+ORDENACAO_COLABORADOR = {
+    "id": Colaborador.id,
+    "matricula": Colaborador.matricula,
+    "nome": Colaborador.nome,
+    "criado_em": Colaborador.criado_em,
+}
+
+
+def apply_filters(
+    query: Query, filtros: Dict[str, Tuple[Any, Callable]], **valores
+) -> Query:
+    """
+    Aplica os filtros informados (valores None são ignorados)
+
+    Args:
+        query: Consulta a filtrar
+        filtros: Filtros permitidos da entidade (parâmetro -> coluna, operador)
+        valores: Valores recebidos, pelo nome do parâmetro
+
+    Raises:
+        HTTPException 400: intervalo com início depois do fim
+    """
+    limites: Dict[str, Dict[Callable, Tuple[str, Any]]] = {}
+
+    for parametro, valor in valores.items():
+        if valor is None:
+            continue
+        coluna, operador = filtros[parametro]
+        limites.setdefault(coluna.key, {})[operador] = (parametro, valor)
+        query = query.filter(operador(coluna, valor))
+
+    for limite in limites.values():
+        if operator.ge in limite and operator.le in limite:
+            (inicio, de), (fim, ate) = limite[operator.ge], limite[operator.le]
+            if de > ate:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Intervalo inválido: {inicio} maior que {fim}",
+                )
+
+    return query
+
+
+def parse_sort(ordenar: Optional[str], permitidas: Dict[str, Any]) -> List[Any]:
+    """
+    Converte o parâmetro ordenar ("-criado_em,id") em cláusulas ORDER BY
+
+    O prefixo "-" inverte a ordem. O id entra sempre como desempate, para
+    que a paginação com skip/limit seja estável.
+
+    Raises:
+        HTTPException 400: chave fora da lista da entidade
+    """
+    chaves = [c.strip() for c in (ordenar or "").split(",") if c.strip()]
+    invalidas = [c for c in chaves if c.lstrip("-") not in permitidas]
+
+    if invalidas:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"Ordenação inválida: {', '.join(invalidas)} "
+                f"(permitidas: {', '.join(permitidas)})"
+            ),
+        )
+
+    clausulas = []
+    usadas = set()
+    for chave in chaves:
+        nome = chave.lstrip("-")
+        if nome in usadas:
+            continue
+        usadas.add(nome)
+        coluna = permitidas[nome]
+        clausulas.append(coluna.desc() if chave.startswith("-") else coluna.asc())
+
+    if "id" not in usadas:
+        clausulas.append(permitidas["id"].asc())
+
+    return clausulas
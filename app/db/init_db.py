@@ -3,6 +3,10 @@ from sqlalchemy import text
 from app.db.database import engine, Base, SessionLocal
 from app.models.colaborador import Colaborador
 from app.models.avaliacao import Ciclo, AvaliacaoComportamental, Meta
+from app.models.idempotencia import ChaveIdempotencia
+from app.models.job import Job
+from app.models.snapshot import CicloSnapshot, ResultadoCiclo
+from app.db import search  # noqa: F401 - cria o índice de busca com a tabela
 from app.core.security import get_password_hash
 from datetime import date
 
@@ -0,0 +1,137 @@
+import argparse
+import re
+from typing import Dict, Optional
+
+from sqlalchemy import DDL, Table, event, text
+
+from app.core.config import settings
+from app.core.logging import log_info
+
+# Tabelas particionadas por LIST (ciclo_id) com DB_PARTITION_BY_CICLO
+PARTITIONED_TABLES = ("avaliacoes_comportamentais", "metas")
+
+_IDENTIFICADOR = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+
+def partitioning_enabled() -> bool:
+    """Particionamento por ciclo ligado (só no PostgreSQL)"""
+    return settings.DB_PARTITION_BY_CICLO and settings.DATABASE_URL.startswith(
+        "postgresql"
+    )
+
+
+def partition_table_args() -> Dict[str, str]:
+    """
+    __table_args__ das tabelas particionadas por ciclo
+
+    A chave primária de uma tabela particionada precisa conter a chave de
+    partição: com o particionamento ligado, ciclo_id também entra na PK
+    (primary_key=partitioning_enabled() na coluna), mas o mapper continua
+    identificando as linhas só pelo id.
+    """
+    if not partitioning_enabled():
+        return {}
+    return {"postgresql_partition_by": "LIST (ciclo_id)"}
+
+
+def register_partitioned_table(table: Table):
+    """
+    Cria a partição DEFAULT junto com a tabela: recebe as linhas de ciclos
+    sem partição própria (ex.: criados antes de ligar o particionamento)
+    """
+    if not partitioning_enabled():
+        return
+    event.listen(
+        table,
+        "after_create",
+        DDL(
+            f"CREATE TABLE IF NOT EXISTS {table.name}_padrao "
+            f"PARTITION OF {table.name} DEFAULT"
+        ),
+    )
+
+
+def partition_name(tabela: str, ciclo_id: int) -> str:
+    return f"{tabela}_ciclo_{int(ciclo_id)}"
+
+
+def create_ciclo_partitions(conn, ciclo_id: int):
+    """
+    Cria as partições do ciclo (se faltarem) em avaliações e metas
+
+    Aceita Session ou Connection; no PostgreSQL o DDL entra na transação de
+    quem chamou, então a partição só existe se o ciclo for gravado.
+    """
+    for tabela in PARTITIONED_TABLES:
+        conn.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {partition_name(tabela, ciclo_id)} "
+                f"PARTITION OF {tabela} FOR VALUES IN ({int(ciclo_id)})"
+            )
+        )
+    log_info("Partições do ciclo criadas", ciclo_id=ciclo_id)
+
+
+def archive_ciclo_partitions(conn, ciclo_id: int, tablespace: str):
+    """
+    Move as partições do ciclo para outro tablespace (ex.: disco mais
+    barato); continuam anexadas e consultáveis pela API
+    """
+    _validar_identificador(tablespace)
+    for tabela in PARTITIONED_TABLES:
+        conn.execute(
+            text(
+                f"ALTER TABLE {partition_name(tabela, ciclo_id)} "
+                f"SET TABLESPACE {tablespace}"
+            )
+        )
+    log_info("Partições do ciclo arquivadas", ciclo_id=ciclo_id, tablespace=tablespace)
+
+
+def detach_ciclo_partitions(conn, ciclo_id: int, tablespace: Optional[str] = None):
+    """
+    Desanexa as partições do ciclo: os dados saem das tabelas da API (para
+    exportar ou remover) e, com `tablespace`, vão para outro armazenamento
+    """
+    if tablespace is not None:
+        _validar_identificador(tablespace)
+    for tabela in PARTITIONED_TABLES:
+        particao = partition_name(tabela, ciclo_id)
+        conn.execute(text(f"ALTER TABLE {tabela} DETACH PARTITION {particao}"))
+        if tablespace is not None:
+            conn.execute(text(f"ALTER TABLE {particao} SET TABLESPACE {tablespace}"))
+    log_info("Partições do ciclo desanexadas", ciclo_id=ciclo_id)
+
+
+def _validar_identificador(nome: str):
+    if not _IDENTIFICADOR.match(nome):
+        raise ValueError(f"Nome inválido: {nome}")
+
+
+def main():
+    from app.db.database import engine
+
+    parser = argparse.ArgumentParser(
+        description="Partições de avaliações e metas por ciclo (PostgreSQL)"
+    )
+    parser.add_argument("acao", choices=["criar", "arquivar", "desanexar"])
+    parser.add_argument("--ciclo", type=int, required=True)
+    parser.add_argument("--tablespace", help="Obrigatório para arquivar")
+    args = parser.parse_args()
+
+    if not partitioning_enabled():
+        raise SystemExit("Ligue DB_PARTITION_BY_CICLO (PostgreSQL) antes")
+
+    with engine.begin() as conn:
+        if args.acao == "criar":
+            create_ciclo_partitions(conn, args.ciclo)
+        elif args.acao == "arquivar":
+            if not args.tablespace:
+                raise SystemExit("Informe --tablespace")
+            archive_ciclo_partitions(conn, args.ciclo, args.tablespace)
+        else:
+            detach_ciclo_partitions(conn, args.ciclo, args.tablespace)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+import re
+import unicodedata
+from typing import List
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import (
+    and_,
+    bindparam,
+    column,
+    event,
+    func,
+    literal_column,
+    or_,
+    select,
+    table,
+    text,
+)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging import log_info, log_warning
+from app.models.colaborador import Colaborador
+
+CAMPOS_BUSCA = ("nome", "email", "cargo", "departamento")
+MAX_TERMOS = 5
+
+# SQLite: índice FTS5 externo (content=colaboradores) mantido por triggers;
+# remove_diacritics ignora acentos e prefix acelera as buscas por prefixo
+FTS_TABLE = "colaboradores_busca"
+SQLITE_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "nome, email, cargo, departamento, content='colaboradores', "
+    "content_rowid='id', tokenize='unicode61 remove_diacritics 2', "
+    "prefix='2 3')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON colaboradores "
+    f"BEGIN INSERT INTO {FTS_TABLE}(rowid, nome, email, cargo, departamento) "
+    "VALUES (new.id, new.nome, new.email, new.cargo, new.departamento); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON colaboradores "
+    f"BEGIN INSERT INTO {FTS_TABLE}"
+    f"({FTS_TABLE}, rowid, nome, email, cargo, departamento) "
+    "VALUES ('delete', old.id, old.nome, old.email, old.cargo, old.departamento); "
+    "END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au "
+    "AFTER UPDATE OF nome, email, cargo, departamento ON colaboradores "
+    f"BEGIN INSERT INTO {FTS_TABLE}"
+    f"({FTS_TABLE}, rowid, nome, email, cargo, departamento) "
+    "VALUES ('delete', old.id, old.nome, old.email, old.cargo, old.departamento); "
+    f"INSERT INTO {FTS_TABLE}(rowid, nome, email, cargo, departamento) "
+    "VALUES (new.id, new.nome, new.email, new.cargo, new.departamento); END",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+)
+
+# PostgreSQL: índices de expressão (tsvector para prefixo, trigramas para
+# erros de digitação). unaccent não é IMMUTABLE, daí a função auxiliar.
+PG_DOCUMENTO = (
+    "to_tsvector('simple', f_unaccent(coalesce(nome, '') || ' ' || "
+    "coalesce(email, '') || ' ' || coalesce(cargo, '') || ' ' || "
+    "coalesce(departamento, '')))"
+)
+PG_NOME = "lower(f_unaccent(nome))"
+POSTGRES_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    "CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text AS "
+    "$$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$ "
+    "LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT",
+    "CREATE INDEX IF NOT EXISTS ix_colaboradores_busca_tsv "
+    f"ON colaboradores USING gin ({PG_DOCUMENTO})",
+    "CREATE INDEX IF NOT EXISTS ix_colaboradores_busca_trgm "
+    f"ON colaboradores USING gin ({PG_NOME} gin_trgm_ops)",
+)
+
+_fts = table(FTS_TABLE, column("rowid"), column("rank"))
+_disponivel: "WeakKeyDictionary[Engine, bool]" = WeakKeyDictionary()
+
+
+def normalize_terms(texto: str) -> List[str]:
+    """Termos da busca em minúsculas, sem acentos nem pontuação"""
+    decomposto = unicodedata.normalize("NFKD", texto)
+    sem_acentos = "".join(c for c in decomposto if not unicodedata.combining(c))
+    return re.findall(r"[^\W_]+", sem_acentos.lower())[:MAX_TERMOS]
+
+
+def create_search_index(conn: Connection):
+    """
+    Cria (se faltar) a estrutura de busca de colaboradores do banco
+
+    Sem FTS5 (SQLite) ou sem permissão para as extensões (PostgreSQL) a
+    busca continua funcionando com LIKE, sem índice nem ranking.
+    """
+    if conn.dialect.name == "sqlite":
+        comandos = SQLITE_DDL
+    elif conn.dialect.name == "postgresql":
+        comandos = POSTGRES_DDL
+    else:
+        return
+
+    try:
+        with conn.begin_nested():
+            for comando in comandos:
+                conn.exec_driver_sql(comando)
+    except Exception as e:
+        log_warning("Índice de busca de colaboradores não criado", erro=str(e))
+    else:
+        log_info("Índice de busca de colaboradores criado", banco=conn.dialect.name)
+
+
+@event.listens_for(Colaborador.__table__, "after_create")
+def _criar_indice_busca(target, connection, **kw):
+    create_search_index(connection)
+
+
+@event.listens_for(Colaborador.__table__, "before_drop")
+def _remover_indice_busca(target, connection, **kw):
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def _indice_disponivel(db: Session) -> bool:
+    engine = db.get_bind()
+    if engine not in _disponivel:
+        if engine.dialect.name == "sqlite":
+            consulta = text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :nome"
+            ).bindparams(nome=FTS_TABLE)
+        elif engine.dialect.name == "postgresql":
+            consulta = text(
+                "SELECT 1 FROM pg_indexes WHERE indexname = :nome"
+            ).bindparams(nome="ix_colaboradores_busca_trgm")
+        else:
+            _disponivel[engine] = False
+            return False
+        _disponivel[engine] = db.execute(consulta).first() is not None
+    return _disponivel[engine]
+
+
+def search_colaboradores(
+    db: Session,
+    termo: str,
+    skip: int = 0,
+    limit: int = 20,
+    incluir_inativos: bool = False,
+) -> List[Colaborador]:
+    """
+    Busca colaboradores por nome, email, cargo e departamento
+
+    Cada termo casa como prefixo de uma palavra, sem diferenciar acentos e
+    maiúsculas, e todos os termos precisam casar. O resultado vem ordenado
+    por relevância: bm25 no SQLite (FTS5); no PostgreSQL, ts_rank somado à
+    similaridade de trigramas do nome, que também aceita erros de digitação.
+    Com índice, só os SEARCH_MAX_CANDIDATES mais relevantes são paginados.
+    """
+    termos = normalize_terms(termo)
+    if not termos:
+        return []
+
+    dialeto = db.get_bind().dialect.name
+    indexado = _indice_disponivel(db)
+    parametros = {}
+    filtros = [] if incluir_inativos else [Colaborador.ativo == True]
+
+    # Só os candidatos mais relevantes (já sem inativos) seguem para o join
+    # e a paginação: em termos amplos (ex.: um cargo comum) a busca não
+    # materializa nem ordena todos os que casam
+    candidatos = max(settings.SEARCH_MAX_CANDIDATES, skip + limit)
+
+    if dialeto == "sqlite" and indexado:
+        encontrados = (
+            select(_fts.c.rowid, _fts.c.rank)
+            .join(Colaborador, Colaborador.id == _fts.c.rowid)
+            .where(text(f"{FTS_TABLE} MATCH :consulta"), *filtros)
+            .order_by(_fts.c.rank)
+            .limit(candidatos)
+            .subquery()
+        )
+        stmt = (
+            select(Colaborador)
+            .join(encontrados, encontrados.c.rowid == Colaborador.id)
+            .order_by(encontrados.c.rank, Colaborador.id)
+        )
+        parametros["consulta"] = " ".join(f'"{t}"*' for t in termos)
+    elif dialeto == "postgresql" and indexado:
+        relevancia = (
+            func.ts_rank(
+                literal_column(PG_DOCUMENTO),
+                func.to_tsquery("simple", bindparam("consulta")),
+            )
+            + func.similarity(literal_column(PG_NOME), bindparam("termo"))
+        ).label("relevancia")
+        encontrados = (
+            select(Colaborador.id, relevancia)
+            .where(
+                text(
+                    f"({PG_DOCUMENTO} @@ to_tsquery('simple', :consulta) "
+                    f"OR {PG_NOME} % :termo)"
+                ),
+                *filtros,
+            )
+            .order_by(relevancia.desc())
+            .limit(candidatos)
+            .subquery()
+        )
+        stmt = (
+            select(Colaborador)
+            .join(encontrados, encontrados.c.id == Colaborador.id)
+            .order_by(encontrados.c.relevancia.desc(), Colaborador.id)
+        )
+        parametros["consulta"] = " & ".join(f"{t}:*" for t in termos)
+        parametros["termo"] = " ".join(termos)
+    else:
+        stmt = select(Colaborador).where(
+            and_(
+                *(
+                    or_(
+                        *(
+                            func.lower(getattr(Colaborador, campo)).like(f"%{t}%")
+                            for campo in CAMPOS_BUSCA
+                        )
+                    )
+                    for t in termos
+                )
+            ),
+            *filtros,
+        )
+        stmt = stmt.order_by(Colaborador.nome, Colaborador.id)
+
+    stmt = stmt.offset(skip).limit(limit)
+    return list(db.scalars(stmt, parametros))
@@ -0,0 +1,530 @@
+import argparse
+import csv
+import enum
+import io
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set
+
+from faker import Faker
+from sqlalchemy import Table, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.db import search  # noqa: F401 - cria o índice de busca com a tabela
+from app.db.database import Base
+from app.db.partitioning import create_ciclo_partitions, partitioning_enabled
+from app.db.snapshots import build_snapshot
+from app.models.avaliacao import (
+    AvaliacaoComportamental,
+    Ciclo,
+    Meta,
+    StatusAvaliacao,
+    StatusCiclo,
+    TipoAvaliacao,
+)
+from app.models.colaborador import Colaborador
+
+SENHA_PADRAO = "senha123"
+PREFIXO_MATRICULA = "C"
+
+CARGOS = [
+    "Analista Jr",
+    "Analista Pl",
+    "Analista Sr",
+    "Especialista",
+    "Coordenador",
+    "Gerente",
+    "Superintendente",
+    "Diretor",
+]
+DEPARTAMENTOS = [
+    "Tecnologia",
+    "Riscos",
+    "Crédito",
+    "Investimentos",
+    "Operações",
+    "Jurídico",
+    "Marketing",
+    "Pessoas",
+    "Compliance",
+    "Atendimento",
+]
+
+
+def matricula(indice: int) -> str:
+    return f"{PREFIXO_MATRICULA}{indice:07d}"
+
+
+def calcular_ramificacao(colaboradores: int, profundidade: int) -> int:
+    """Subordinados diretos por gestor para atingir a profundidade pedida"""
+    if profundidade <= 1:
+        return max(colaboradores - 1, 1)
+    return max(2, math.ceil(colaboradores ** (1 / (profundidade - 1))))
+
+
+def indice_gestor(indice: int, ramificacao: int) -> Optional[int]:
+    """Árvore em layout de heap: o gestor de i é (i - 1) // ramificacao"""
+    if indice == 0:
+        return None
+    return (indice - 1) // ramificacao
+
+
+class GeradorOrganizacao:
+    """
+    Gera as linhas (dicts prontos para INSERT) de uma organização sintética
+
+    Colaboradores formam uma árvore de gestores de profundidade configurável;
+    cada um recebe, por ciclo, autoavaliação, avaliação do gestor, avaliações
+    de pares e metas. A mesma semente produz sempre os mesmos dados.
+    """
+
+    def __init__(
+        self,
+        colaboradores: int,
+        profundidade: int = 8,
+        pares: int = 6,
+        metas: int = 5,
+        semente: int = 42,
+    ):
+        self.colaboradores = colaboradores
+        self.ramificacao = calcular_ramificacao(colaboradores, profundidade)
+        self.pares = pares
+        self.metas = metas
+        self.faker = Faker("pt_BR")
+        self.faker.seed_instance(semente)
+        self.random = random.Random(semente)
+        self.agora = datetime(2025, 1, 15, 9, 0, 0)
+        # Textos reaproveitados: tamanho realista sem chamar o faker por linha
+        self.frases = [self.faker.sentence(nb_words=12) for _ in range(500)]
+        self.titulos = [self.faker.sentence(nb_words=5)[:200] for _ in range(200)]
+
+    def profundidade_real(self) -> int:
+        """Níveis da árvore de gestores (o último colaborador é o mais fundo)"""
+        niveis, indice = 1, self.colaboradores - 1
+        while indice:
+            indice = indice_gestor(indice, self.ramificacao)
+            niveis += 1
+        return niveis
+
+    def ciclo(self, ano: int, status: StatusCiclo) -> Dict:
+        return {
+            "ano": ano,
+            "descricao": f"Ciclo de avaliação {ano}",
+            "data_inicio": date(ano, 1, 1),
+            "data_fim": date(ano, 12, 31),
+            "status": status,
+            "criado_em": self.agora,
+            "atualizado_em": self.agora,
+        }
+
+    def colaborador(self, i: int, senha_hash: str) -> Dict:
+        niveis_cargo = len(CARGOS)
+        gestor = indice_gestor(i, self.ramificacao)
+        # Cargos mais altos perto da raiz da árvore
+        nivel = min(int(math.log(i + 1, self.ramificacao + 1)), niveis_cargo - 1)
+        return {
+            "matricula": matricula(i),
+            "nome": self.faker.name(),
+            "email": f"{matricula(i).lower()}@empresa.com.br",
+            "senha_hash": senha_hash,
+            "cargo": CARGOS[niveis_cargo - 1 - nivel],
+            "departamento": DEPARTAMENTOS[i % len(DEPARTAMENTOS)],
+            "gestor_matricula": matricula(gestor) if gestor is not None else None,
+            "ativo": True,
+            "criado_em": self.agora,
+            "atualizado_em": self.agora,
+        }
+
+    def _avaliacao(self, ciclo_id, avaliado, avaliador, tipo, concluidas) -> Dict:
+        notas = [self.random.randint(1, 5) for _ in range(5)]
+        concluida = self.random.random() < concluidas
+        return {
+            "ciclo_id": ciclo_id,
+            "avaliado_matricula": avaliado,
+            "avaliador_matricula": avaliador,
+            "tipo_avaliacao": tipo,
+            "lideranca": notas[0],
+            "comunicacao": notas[1],
+            "trabalho_equipe": notas[2],
+            "resolucao_problemas": notas[3],
+            "adaptabilidade": notas[4],
+            "media_competencias": sum(notas) / 5,
+            "comentarios": self.random.choice(self.frases),
+            "status": (
+                StatusAvaliacao.CONCLUIDA if concluida else StatusAvaliacao.PENDENTE
+            ),
+            "criado_em": self.agora,
+            "atualizado_em": self.agora,
+        }
+
+    def avaliacoes_do_colaborador(
+        self, ciclo_id: int, i: int, concluidas: float = 0.4
+    ) -> List[Dict]:
+        """Avaliações recebidas pelo colaborador i no ciclo"""
+        avaliado = matricula(i)
+        linhas = [
+            self._avaliacao(
+                ciclo_id, avaliado, avaliado, TipoAvaliacao.AUTOAVALIACAO, concluidas
+            )
+        ]
+        gestor = indice_gestor(i, self.ramificacao)
+        if gestor is not None:
+            linhas.append(
+                self._avaliacao(
+                    ciclo_id,
+                    avaliado,
+                    matricula(gestor),
+                    TipoAvaliacao.AVALIACAO_GESTOR,
+                    concluidas,
+                )
+            )
+        for _ in range(self.pares):
+            par = self.random.randrange(self.colaboradores)
+            if par != i:
+                linhas.append(
+                    self._avaliacao(
+                        ciclo_id,
+                        avaliado,
+                        matricula(par),
+                        TipoAvaliacao.AVALIACAO_PAR,
+                        concluidas,
+                    )
+                )
+        return linhas
+
+    def metas_do_colaborador(self, ciclo_id: int, i: int, ano: int) -> List[Dict]:
+        """Metas do colaborador i no ciclo"""
+        linhas = []
+        for _ in range(self.metas):
+            alcancado = self.random.random() < 0.5
+            linhas.append(
+                {
+                    "ciclo_id": ciclo_id,
+                    "colaborador_matricula": matricula(i),
+                    "titulo": self.random.choice(self.titulos),
+                    "descricao": self.random.choice(self.frases),
+                    "peso": self.random.choice([10, 15, 20, 25, 30]),
+                    "data_limite": date(ano, 6, 30)
+                    + timedelta(days=self.random.randrange(180)),
+                    "resultado_alcancado": (
+                        self.random.randint(0, 100) if alcancado else None
+                    ),
+                    "comentarios_gestor": None,
+                    "criado_em": self.agora,
+                    "atualizado_em": self.agora,
+                }
+            )
+        return linhas
+
+
+def _hash_distinto(_indice: int) -> str:
+    return get_password_hash(SENHA_PADRAO)
+
+
+def gerar_hashes(quantidade: int, processos: int) -> List[str]:
+    """
+    Gera um hash bcrypt (com salt próprio) por colaborador, em paralelo
+    """
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        return list(
+            executor.map(
+                _hash_distinto,
+                range(quantidade),
+                chunksize=max(1, quantidade // (processos * 8)),
+            )
+        )
+
+
+class BulkWriter:
+    """
+    Grava lotes de linhas com o método mais rápido do banco
+
+    No PostgreSQL usa COPY (para tabelas com conflito possível, COPY para uma
+    tabela temporária seguido de INSERT ... ON CONFLICT DO NOTHING); nos
+    demais, INSERT em lote com ON CONFLICT DO NOTHING quando suportado.
+    """
+
+    def __init__(self, engine: Engine, usar_copy: bool = True):
+        self.engine = engine
+        self.dialeto = engine.dialect.name
+        self.usar_copy = usar_copy and self.dialeto == "postgresql"
+
+    def _upsert(self, tabela: Table):
+        if self.dialeto == "postgresql":
+            return postgresql.insert(tabela).on_conflict_do_nothing()
+        if self.dialeto == "sqlite":
+            return sqlite.insert(tabela).on_conflict_do_nothing()
+        return insert(tabela)
+
+    def gravar(self, tabela: Table, linhas: List[Dict], ignorar_conflitos: bool):
+        if not linhas:
+            return
+        with self.engine.begin() as conn:
+            if self.usar_copy:
+                self._copy(conn, tabela, linhas, ignorar_conflitos)
+            elif ignorar_conflitos:
+                conn.execute(self._upsert(tabela), linhas)
+            else:
+                conn.execute(insert(tabela), linhas)
+
+    @staticmethod
+    def _valor_copy(valor):
+        if isinstance(valor, enum.Enum):
+            # SQLEnum grava o nome do membro
+            return valor.name
+        return valor
+
+    def _copy(self, conn, tabela: Table, linhas: List[Dict], ignorar_conflitos: bool):
+        colunas = list(linhas[0])
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for linha in linhas:
+            writer.writerow([self._valor_copy(linha[coluna]) for coluna in colunas])
+        buffer.seek(0)
+
+        lista_colunas = ", ".join(colunas)
+        destino = tabela.name
+        cursor = conn.connection.driver_connection.cursor()
+        if ignorar_conflitos:
+            destino = f"tmp_seed_{tabela.name}"
+            cursor.execute(
+                f"CREATE TEMP TABLE {destino} "
+                f"(LIKE {tabela.name} INCLUDING DEFAULTS) ON COMMIT DROP"
+            )
+        cursor.copy_expert(
+            f"COPY {destino} ({lista_colunas}) FROM STDIN WITH (FORMAT csv)", buffer
+        )
+        if ignorar_conflitos:
+            cursor.execute(
+                f"INSERT INTO {tabela.name} ({lista_colunas}) "
+                f"SELECT {lista_colunas} FROM {destino} ON CONFLICT DO NOTHING"
+            )
+
+
+def _existentes(engine: Engine, coluna, ciclo_coluna, ciclo_id: int) -> Set[str]:
+    with engine.connect() as conn:
+        return set(
+            conn.execute(
+                select(coluna).where(ciclo_coluna == ciclo_id).distinct()
+            ).scalars()
+        )
+
+
+def _gravar_por_colaborador(
+    writer: BulkWriter,
+    tabela: Table,
+    linhas_por_colaborador: Iterable[List[Dict]],
+    lote: int,
+) -> int:
+    """
+    Grava as linhas agrupando colaboradores inteiros em cada transação, para
+    que uma execução interrompida nunca deixe um colaborador pela metade
+    """
+    total = 0
+    buffer: List[Dict] = []
+    for linhas in linhas_por_colaborador:
+        buffer.extend(linhas)
+        if len(buffer) >= lote:
+            writer.gravar(tabela, buffer, ignorar_conflitos=False)
+            total += len(buffer)
+            buffer = []
+    writer.gravar(tabela, buffer, ignorar_conflitos=False)
+    return total + len(buffer)
+
+
+def seed(
+    engine: Engine,
+    gerador: GeradorOrganizacao,
+    ciclos: int = 1,
+    ano_atual: int = 2025,
+    lote: int = 5000,
+    usar_copy: bool = True,
+    processos_hash: int = 0,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Popula o banco com a organização gerada, sem apagar nada
+
+    Idempotente: colaboradores e ciclos entram com ON CONFLICT DO NOTHING
+    (matrícula/e-mail e ano) e avaliações/metas só são geradas para os
+    colaboradores que ainda não as têm no ciclo, então rodar de novo (ou
+    retomar uma execução interrompida) não duplica linhas.
+
+    Com processos_hash=0 todos usam o mesmo hash bcrypt, calculado uma vez;
+    com processos_hash > 0 cada colaborador recebe um hash próprio, gerado
+    em paralelo.
+
+    Returns:
+        Por tabela, linhas gravadas, segundos e linhas por segundo
+    """
+    Base.metadata.create_all(bind=engine)
+    writer = BulkWriter(engine, usar_copy)
+    relatorio: Dict[str, Dict[str, float]] = {}
+
+    def registrar(nome: str, linhas: int, inicio: float):
+        segundos = time.perf_counter() - inicio
+        anterior = relatorio.get(nome, {"linhas": 0, "segundos": 0.0})
+        linhas += anterior["linhas"]
+        segundos += anterior["segundos"]
+        relatorio[nome] = {
+            "linhas": linhas,
+            "segundos": round(segundos, 3),
+            "linhas_por_segundo": round(linhas / segundos) if segundos else 0,
+        }
+
+    # Ciclos: o mais recente em andamento, os anteriores finalizados
+    inicio = time.perf_counter()
+    anos = [ano_atual - k for k in range(ciclos)]
+    linhas_ciclos = [
+        gerador.ciclo(
+            ano,
+            StatusCiclo.EM_ANDAMENTO if ano == ano_atual else StatusCiclo.FINALIZADO,
+        )
+        for ano in anos
+    ]
+    writer.gravar(Ciclo.__table__, linhas_ciclos, ignorar_conflitos=True)
+    with engine.connect() as conn:
+        ciclo_ids = dict(
+            conn.execute(select(Ciclo.ano, Ciclo.id).where(Ciclo.ano.in_(anos))).all()
+        )
+    if partitioning_enabled():
+        with engine.begin() as conn:
+            for ciclo_id in ciclo_ids.values():
+                create_ciclo_partitions(conn, ciclo_id)
+    registrar("ciclos", len(linhas_ciclos), inicio)
+
+    # Colaboradores
+    inicio = time.perf_counter()
+    if processos_hash > 0:
+        hashes = gerar_hashes(gerador.colaboradores, processos_hash)
+    else:
+        hashes = [get_password_hash(SENHA_PADRAO)] * gerador.colaboradores
+    total = 0
+    for inicio_lote in range(0, gerador.colaboradores, lote):
+        indices = range(inicio_lote, min(inicio_lote + lote, gerador.colaboradores))
+        linhas = [gerador.colaborador(i, hashes[i]) for i in indices]
+        writer.gravar(Colaborador.__table__, linhas, ignorar_conflitos=True)
+        total += len(linhas)
+    registrar("colaboradores", total, inicio)
+
+    # Avaliações e metas, ciclo a ciclo (do mais antigo ao atual)
+    for ano in sorted(anos):
+        ciclo_id = ciclo_ids[ano]
+        concluidas = 0.4 if ano == ano_atual else 1.0
+
+        tabela = AvaliacaoComportamental.__table__
+        existentes = _existentes(
+            engine, tabela.c.avaliado_matricula, tabela.c.ciclo_id, ciclo_id
+        )
+        inicio = time.perf_counter()
+        gravadas = _gravar_por_colaborador(
+            writer,
+            tabela,
+            (
+                linhas
+                for i in range(gerador.colaboradores)
+                for linhas in [
+                    gerador.avaliacoes_do_colaborador(ciclo_id, i, concluidas)
+                ]
+                if matricula(i) not in existentes
+            ),
+            lote,
+        )
+        registrar("avaliacoes", gravadas, inicio)
+
+        tabela = Meta.__table__
+        existentes = _existentes(
+            engine, tabela.c.colaborador_matricula, tabela.c.ciclo_id, ciclo_id
+        )
+        inicio = time.perf_counter()
+        gravadas = _gravar_por_colaborador(
+            writer,
+            tabela,
+            (
+                linhas
+                for i in range(gerador.colaboradores)
+                for linhas in [gerador.metas_do_colaborador(ciclo_id, i, ano)]
+                if matricula(i) not in existentes
+            ),
+            lote,
+        )
+        registrar("metas", gravadas, inicio)
+
+    # Ciclos anteriores: resultados congelados, como no fechamento pela API
+    inicio = time.perf_counter()
+    finalizados = [ciclo_ids[ano] for ano in anos if ano != ano_atual]
+    with Session(engine) as db:
+        for ciclo_id in finalizados:
+            build_snapshot(db, ciclo_id)
+        db.commit()
+    registrar("snapshots", len(finalizados), inicio)
+
+    return relatorio
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Popula o banco com uma organização sintética (sem DROP)"
+    )
+    parser.add_argument("--database-url", help="Padrão: DATABASE_URL das configurações")
+    parser.add_argument("--colaboradores", type=int, default=10000)
+    parser.add_argument("--ciclos", type=int, default=1)
+    parser.add_argument("--profundidade", type=int, default=8)
+    parser.add_argument("--pares", type=int, default=6)
+    parser.add_argument("--metas", type=int, default=5)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--lote", type=int, default=5000)
+    parser.add_argument(
+        "--processos-hash",
+        type=int,
+        default=0,
+        help="Hash bcrypt próprio por colaborador, com N processos (0 = hash único)",
+    )
+    parser.add_argument(
+        "--sem-copy", action="store_true", help="Usa INSERT mesmo no PostgreSQL"
+    )
+    args = parser.parse_args()
+
+    if args.database_url:
+        from sqlalchemy import create_engine
+
+        engine = create_engine(args.database_url)
+    else:
+        from app.db.database import engine
+
+    gerador = GeradorOrganizacao(
+        args.colaboradores,
+        profundidade=args.profundidade,
+        pares=args.pares,
+        metas=args.metas,
+        semente=args.semente,
+    )
+    print(
+        f"{args.colaboradores} colaboradores, {gerador.ramificacao} subordinados "
+        f"por gestor, {gerador.profundidade_real()} níveis, {args.ciclos} ciclo(s)"
+    )
+
+    relatorio = seed(
+        engine,
+        gerador,
+        ciclos=args.ciclos,
+        lote=args.lote,
+        usar_copy=not args.sem_copy,
+        processos_hash=args.processos_hash,
+    )
+
+    print(f"{'tabela':<15}{'linhas':>12}{'segundos':>10}{'linhas/s':>12}")
+    for nome, dados in relatorio.items():
+        print(
+            f"{nome:<15}{dados['linhas']:>12}{dados['segundos']:>10.1f}"
+            f"{dados['linhas_por_segundo']:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
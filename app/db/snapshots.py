@@ -0,0 +1,291 @@
+import argparse
+import json
+from typing import Any, Dict, FrozenSet
+
+from fastapi import HTTPException, status
+from sqlalchemy import (
+    Float,
+    Select,
+    case,
+    cast,
+    delete,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+)
+from sqlalchemy.orm import Session
+
+from app.core.cache_bus import register_cache
+from app.core.config import settings
+from app.core.logging import log_info, log_warning
+from app.models.avaliacao import (
+    AvaliacaoComportamental,
+    Ciclo,
+    Meta,
+    StatusAvaliacao,
+    StatusCiclo,
+)
+from app.models.colaborador import Colaborador
+from app.models.snapshot import CicloSnapshot, ResultadoCiclo
+
+# Mesma mensagem para o 409 do ciclo e das suas avaliações e metas
+CICLO_FINALIZADO_DETAIL = (
+    "Ciclo finalizado: o ciclo, suas avaliações e metas não podem mais ser " "alterados"
+)
+
+# Snapshot só muda se for regerado (novo ETag): cache com revalidação; os
+# demais ciclos são recalculados a cada leitura
+CACHE_CONTROL_SNAPSHOT = (
+    f"private, max-age={settings.SNAPSHOT_CACHE_MAX_AGE}, must-revalidate"
+)
+CACHE_CONTROL_AO_VIVO = "private, no-cache"
+
+COLUNAS_RESULTADO = (
+    "colaborador_matricula",
+    "nome",
+    "departamento",
+    "total_avaliacoes",
+    "media_comportamental",
+    "total_metas",
+    "resultado_metas",
+)
+
+# Mesmo cache do ciclo ativo: toda escrita em ciclos já invalida "ciclos"
+ciclos_cache = register_cache("ciclos")
+
+
+def finalized_ciclos(db: Session) -> FrozenSet[int]:
+    """IDs dos ciclos finalizados (em cache; mudam poucas vezes por ano)"""
+
+    def carregar():
+        return frozenset(
+            db.scalars(select(Ciclo.id).where(Ciclo.status == StatusCiclo.FINALIZADO))
+        )
+
+    return ciclos_cache.get_or_load("finalizados", carregar)
+
+
+def finalized_error(**contexto) -> HTTPException:
+    """Erro 409 para uma escrita em dados de um ciclo finalizado"""
+    log_warning("Tentativa de alterar dados de ciclo finalizado", **contexto)
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT, detail=CICLO_FINALIZADO_DETAIL
+    )
+
+
+def reject_if_finalized(db: Session, ciclo_id: int, **contexto):
+    """
+    Recusa (409) criar avaliação ou meta em ciclo finalizado. Ciclo
+    finalizado não volta atrás, então o cache só antecipa a recusa; fora
+    dele, o status é relido na transação da escrita com lock compartilhado
+    (FOR SHARE), que segura a finalização concorrente até o commit e não
+    depende da invalidação do cache ter chegado a este worker.
+    """
+    if ciclo_id in finalized_ciclos(db):
+        raise finalized_error(ciclo_id=ciclo_id, **contexto)
+    status_atual = db.scalar(
+        select(Ciclo.status).where(Ciclo.id == ciclo_id).with_for_update(read=True)
+    )
+    if status_atual == StatusCiclo.FINALIZADO:
+        raise finalized_error(ciclo_id=ciclo_id, **contexto)
+
+
+def in_open_ciclo(coluna):
+    """
+    Condição para o WHERE de UPDATE/DELETE: a linha de um ciclo finalizado
+    não é afetada. Vai no próprio comando (sem ida extra ao banco) e o
+    motivo só é apurado no caminho de falha.
+    """
+    return coluna.notin_(select(Ciclo.id).where(Ciclo.status == StatusCiclo.FINALIZADO))
+
+
+def results_query(ciclo_id: int) -> Select:
+    """
+    Resultados por colaborador do ciclo, calculados das tabelas
+
+    - media_comportamental: média das avaliações concluídas recebidas
+    - resultado_metas: resultado das metas ponderado pelo peso (só as metas
+      com resultado lançado)
+
+    Entram os colaboradores com ao menos uma avaliação concluída ou meta.
+    """
+    avaliacoes = (
+        select(
+            AvaliacaoComportamental.avaliado_matricula.label("matricula"),
+            func.count().label("total"),
+            func.avg(AvaliacaoComportamental.media_competencias).label("media"),
+        )
+        .where(
+            AvaliacaoComportamental.ciclo_id == ciclo_id,
+            AvaliacaoComportamental.status == StatusAvaliacao.CONCLUIDA,
+        )
+        .group_by(AvaliacaoComportamental.avaliado_matricula)
+        .subquery()
+    )
+    peso_com_resultado = case(
+        (Meta.resultado_alcancado.isnot(None), Meta.peso), else_=0
+    )
+    metas = (
+        select(
+            Meta.colaborador_matricula.label("matricula"),
+            func.count().label("total"),
+            (
+                cast(func.sum(Meta.resultado_alcancado * Meta.peso), Float)
+                / func.nullif(func.sum(peso_com_resultado), 0)
+            ).label("resultado"),
+        )
+        .where(Meta.ciclo_id == ciclo_id)
+        .group_by(Meta.colaborador_matricula)
+        .subquery()
+    )
+
+    return (
+        select(
+            Colaborador.matricula.label("colaborador_matricula"),
+            Colaborador.nome,
+            Colaborador.departamento,
+            func.coalesce(avaliacoes.c.total, 0).label("total_avaliacoes"),
+            avaliacoes.c.media.label("media_comportamental"),
+            func.coalesce(metas.c.total, 0).label("total_metas"),
+            metas.c.resultado.label("resultado_metas"),
+        )
+        .select_from(Colaborador)
+        .outerjoin(avaliacoes, avaliacoes.c.matricula == Colaborador.matricula)
+        .outerjoin(metas, metas.c.matricula == Colaborador.matricula)
+        .where(or_(avaliacoes.c.matricula.isnot(None), metas.c.matricula.isnot(None)))
+    )
+
+
+def summarize(db: Session, resultados: Select) -> Dict[str, Any]:
+    """
+    Totais e médias do ciclo, geral e por departamento, a partir de um
+    SELECT de resultados por colaborador (em uma única consulta)
+    """
+    r = resultados.subquery()
+    linhas = db.execute(
+        select(
+            r.c.departamento,
+            func.count(),
+            func.sum(r.c.total_avaliacoes),
+            func.sum(r.c.total_metas),
+            func.avg(r.c.media_comportamental),
+            func.count(r.c.media_comportamental),
+            func.avg(r.c.resultado_metas),
+            func.count(r.c.resultado_metas),
+        )
+        .group_by(r.c.departamento)
+        .order_by(r.c.departamento)
+    ).all()
+
+    def media_geral(indice_media: int, indice_total: int):
+        total = sum(linha[indice_total] for linha in linhas)
+        if not total:
+            return None
+        return (
+            sum(
+                linha[indice_media] * linha[indice_total]
+                for linha in linhas
+                if linha[indice_total]
+            )
+            / total
+        )
+
+    return {
+        "total_colaboradores": sum(linha[1] for linha in linhas),
+        "total_avaliacoes": sum(linha[2] for linha in linhas),
+        "total_metas": sum(linha[3] for linha in linhas),
+        "media_comportamental": media_geral(4, 5),
+        "resultado_metas": media_geral(6, 7),
+        "por_departamento": [
+            {
+                "departamento": linha[0],
+                "total_colaboradores": linha[1],
+                "total_avaliacoes": linha[2],
+                "total_metas": linha[3],
+                "media_comportamental": linha[4],
+                "resultado_metas": linha[6],
+            }
+            for linha in linhas
+        ],
+    }
+
+
+def build_snapshot(db: Session, ciclo_id: int) -> CicloSnapshot:
+    """
+    Congela os resultados do ciclo em resultados_ciclo e ciclo_snapshots
+
+    Roda na transação de quem chamou (a que finaliza o ciclo): um INSERT ...
+    SELECT com os resultados por colaborador e o resumo calculado sobre
+    eles. Refazer o snapshot de um ciclo substitui o anterior.
+    """
+    db.execute(delete(ResultadoCiclo).where(ResultadoCiclo.ciclo_id == ciclo_id))
+    db.execute(delete(CicloSnapshot).where(CicloSnapshot.ciclo_id == ciclo_id))
+
+    resultados = results_query(ciclo_id).subquery()
+    db.execute(
+        insert(ResultadoCiclo).from_select(
+            ["ciclo_id", *COLUNAS_RESULTADO],
+            select(literal(ciclo_id), *(resultados.c[c] for c in COLUNAS_RESULTADO)),
+        )
+    )
+
+    resumo = summarize(
+        db, select(ResultadoCiclo).where(ResultadoCiclo.ciclo_id == ciclo_id)
+    )
+    snapshot = CicloSnapshot(
+        ciclo_id=ciclo_id,
+        por_departamento=json.dumps(resumo.pop("por_departamento")),
+        **resumo,
+    )
+    db.add(snapshot)
+    db.flush()
+
+    log_info(
+        "Snapshot do ciclo gerado",
+        ciclo_id=ciclo_id,
+        colaboradores=snapshot.total_colaboradores,
+    )
+
+    return snapshot
+
+
+def snapshot_summary(snapshot: CicloSnapshot) -> Dict[str, Any]:
+    """Resumo gravado no snapshot, no formato de summarize()"""
+    return {
+        "total_colaboradores": snapshot.total_colaboradores,
+        "total_avaliacoes": snapshot.total_avaliacoes,
+        "total_metas": snapshot.total_metas,
+        "media_comportamental": snapshot.media_comportamental,
+        "resultado_metas": snapshot.resultado_metas,
+        "por_departamento": json.loads(snapshot.por_departamento),
+    }
+
+
+def snapshot_etag(snapshot: CicloSnapshot) -> str:
+    return f'"ciclo-{snapshot.ciclo_id}-{snapshot.gerado_em:%Y%m%d%H%M%S%f}"'
+
+
+def main():
+    from app.db.database import SessionLocal
+
+    parser = argparse.ArgumentParser(
+        description="Gera o snapshot de resultados de um ciclo finalizado"
+    )
+    parser.add_argument("--ciclo", type=int, required=True)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        ciclo = db.get(Ciclo, args.ciclo)
+        if ciclo is None or ciclo.status != StatusCiclo.FINALIZADO:
+            raise SystemExit("Ciclo inexistente ou não finalizado")
+        build_snapshot(db, args.ciclo)
+        db.commit()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
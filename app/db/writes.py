@@ -0,0 +1,167 @@
+import re
+from typing import Any, Dict, Optional, Sequence, Set, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import delete, exists, inspect, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.core.config import settings
+from app.core.logging import log_warning
+
+# Colunas citadas nas mensagens de violação de cada banco:
+# PostgreSQL "Key (ciclo_id)=(9)", SQLite "UNIQUE constraint failed:
+# colaboradores.email", MySQL "FOREIGN KEY (`ciclo_id`)"
+_COLUNAS_VIOLADAS = (
+    re.compile(r"Key \(([^)]+)\)="),
+    re.compile(r"constraint failed: ([\w.]+(?:, [\w.]+)*)"),
+    re.compile(r"FOREIGN KEY \(`?(\w+)`?\)"),
+)
+
+
+def supports_returning(db: Session) -> bool:
+    """Indica se o banco aceita UPDATE/DELETE ... RETURNING"""
+    if not settings.DB_WRITE_RETURNING:
+        return False
+    dialect = db.get_bind().dialect
+    return dialect.update_returning and dialect.delete_returning
+
+
+def update_returning(
+    db: Session,
+    model,
+    filtros: Sequence[Any],
+    valores: Dict[str, Any],
+    versao_esperada: Optional[int] = None,
+):
+    """
+    Atualiza o registro que atende aos filtros em um único round trip
+
+    Com RETURNING, emite só "UPDATE ... SET ..., versao = versao + 1 WHERE
+    <filtros> [AND versao = <esperada>] RETURNING *", sem o SELECT antes nem
+    o refresh depois. Sem suporte, cai no SELECT + UPDATE pelo ORM
+    (version_id_col), com os mesmos filtros.
+
+    Returns:
+        Uma instância fora da sessão com os valores gravados (não expira no
+        commit, então montar a resposta não consulta o banco), ou None se
+        nenhum registro atende aos filtros (inexistente, versão diferente ou
+        outra condição); o chamador consulta o motivo só nesse caminho.
+    """
+    condicoes = list(filtros)
+    if versao_esperada is not None:
+        condicoes.append(model.versao == versao_esperada)
+
+    if not supports_returning(db):
+        obj = db.scalars(select(model).where(*condicoes)).first()
+        if obj is None:
+            return None
+        for campo, valor in valores.items():
+            setattr(obj, campo, valor)
+        try:
+            db.flush()
+        except StaleDataError:
+            db.rollback()
+            return None
+        # Valores dados por expressão SQL expiram no flush: lidos antes de
+        # a instância sair da sessão
+        expirados = inspect(obj).expired_attributes
+        if expirados:
+            db.refresh(obj, expirados)
+        db.expunge(obj)
+        return obj
+
+    stmt = (
+        update(model)
+        .where(*condicoes)
+        .values(**valores, versao=model.versao + 1)
+        .returning(*model.__table__.columns)
+        # Mantém em dia uma instância que já esteja na sessão (ex.: o
+        # usuário logado editando o próprio cadastro)
+        .execution_options(synchronize_session="fetch")
+    )
+    linha = db.execute(stmt).first()
+    if linha is None:
+        return None
+    return model(**linha._asdict())
+
+
+def delete_returning(db: Session, model, filtros: Sequence[Any], *colunas):
+    """
+    Remove o registro que atende aos filtros em um único round trip
+
+    Returns:
+        Row com as colunas pedidas do registro removido, ou None se nenhum
+        registro atende aos filtros
+    """
+    if not supports_returning(db):
+        obj = db.scalars(select(model).where(*filtros)).first()
+        if obj is None:
+            return None
+        linha = tuple(getattr(obj, coluna.key) for coluna in colunas)
+        db.delete(obj)
+        db.flush()
+        return linha
+
+    stmt = (
+        delete(model)
+        .where(*filtros)
+        .returning(*colunas)
+        .execution_options(synchronize_session="fetch")
+    )
+    return db.execute(stmt).first()
+
+
+def violated_columns(exc: IntegrityError) -> Set[str]:
+    """Colunas citadas na mensagem do banco (vazio se ele não informa)"""
+    mensagem = str(exc.orig)
+    colunas = set()
+    for padrao in _COLUNAS_VIOLADAS:
+        for grupo in padrao.findall(mensagem):
+            for nome in grupo.split(","):
+                colunas.add(nome.strip().rpartition(".")[2])
+    return colunas
+
+
+def _violada(db: Session, obj, coluna: str) -> bool:
+    """Confere no banco se o valor de `coluna` viola sua FK ou unicidade"""
+    valor = getattr(obj, coluna)
+    if valor is None:
+        return False
+    column = obj.__table__.c[coluna]
+    for fk in column.foreign_keys:
+        return not db.query(exists().where(fk.column == valor)).scalar()
+    return db.query(exists().where(column == valor)).scalar()
+
+
+def insert_checked(db: Session, obj, violacoes: Dict[str, Tuple[int, str]]):
+    """
+    Insere `obj` confiando nas FKs e nos índices únicos do banco
+
+    O caminho feliz é só o INSERT. Se o banco recusar, a transação é
+    desfeita e a violação vira o HTTPException de `violacoes` (coluna ->
+    (status_code, detail)). A coluna vem da mensagem do banco; quando ele
+    não a informa (FK no SQLite), as colunas são conferidas na ordem do
+    dicionário, só nesse caminho de falha.
+    """
+    db.add(obj)
+    try:
+        db.flush()
+    except IntegrityError as exc:
+        db.rollback()
+        colunas = violated_columns(exc) & violacoes.keys()
+        candidatas = [c for c in violacoes if c in colunas] or [
+            c for c in violacoes if _violada(db, obj, c)
+        ]
+        if not candidatas:
+            raise
+        coluna = candidatas[0]
+        status_code, detail = violacoes[coluna]
+        log_warning(
+            "Inserção recusada pelo banco",
+            tabela=obj.__tablename__,
+            coluna=coluna,
+            valor=getattr(obj, coluna),
+        )
+        raise HTTPException(status_code=status_code, detail=detail)
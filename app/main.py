@@ -1,9 +1,44 @@
-from fastapi import FastAPI
+import asyncio
+
+from fastapi import Depends, FastAPI, Response, status
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import text
+from sqlalchemy.orm import Session
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.core.cache_bus import cache_bus
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
-from app.core.logging import get_logger, log_info
-from app.routers import auth, colaboradores, ciclos, avaliacoes, metas
+from app.core.idempotency import IdempotentReplay, idempotent_replay_handler
+from app.core.jobs import job_runner
+from app.core.logging import get_logger, log_info, log_warning, start_logging
+from app.core.metrics import (
+    CONTENT_TYPE,
+    MetricsMiddleware,
+    generate_latest,
+    start_multiprocess_writer,
+)
+from app.core.profiling import ProfilingMiddleware
+from app.core.serialization import get_default_response_class
+from app.core.shutdown import (
+    DrainMiddleware,
+    drain_state,
+    graceful_shutdown,
+    install_drain_signal_handler,
+)
+from app.core.timing import ServerTimingMiddleware
+from app.core.warmup import start_warmup, warmup_state
+from app.db.database import SessionLocal, engine, get_db
+from app.routers import (
+    auth,
+    colaboradores,
+    ciclos,
+    avaliacoes,
+    jobs,
+    metas,
+    profiling,
+    resultados,
+)
 
 # Inicializar logger
 logger = get_logger(__name__)
@@ -12,6 +47,7 @@ app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     description="API para gerenciamento de avaliações de performance de colaboradores",
+    default_response_class=get_default_response_class(),
 )
 
 # Configurar CORS
@@ -23,6 +59,33 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Contar requisições em andamento e recusar novas durante o desligamento
+app.add_middleware(DrainMiddleware)
+
+# Configurar compressão (gzip/brotli) das respostas
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
+# Profiling sob demanda de requisições de administradores
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+# Métricas de requisições por rota e status
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Medir as fases das requisições (adicionado por último: middleware mais externo)
+if settings.SERVER_TIMING_ENABLED:
+    app.add_middleware(ServerTimingMiddleware)
+
+# Reenvio das respostas de POSTs repetidos com a mesma Idempotency-Key
+app.add_exception_handler(IdempotentReplay, idempotent_replay_handler)
+
 # Incluir routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Autenticação"])
 app.include_router(
@@ -31,11 +94,25 @@ app.include_router(
 app.include_router(ciclos.router, prefix="/api/ciclos", tags=["Ciclos"])
 app.include_router(avaliacoes.router, prefix="/api/avaliacoes", tags=["Avaliações"])
 app.include_router(metas.router, prefix="/api/metas", tags=["Metas"])
+app.include_router(resultados.router, prefix="/api/resultados", tags=["Resultados"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["Jobs"])
+app.include_router(profiling.router, prefix="/api/profiling", tags=["Profiling"])
 
 
 @app.on_event("startup")
 async def startup_event():
     """Evento executado ao iniciar a aplicação"""
+    start_logging()
+    drain_state.reiniciar()
+    install_drain_signal_handler(
+        asyncio.get_running_loop(), settings.SHUTDOWN_DRAIN_TIMEOUT
+    )
+    if settings.METRICS_ENABLED:
+        start_multiprocess_writer()
+    cache_bus.start(engine)
+    job_runner.start(SessionLocal)
+    if settings.WARMUP_ENABLED:
+        start_warmup(engine, SessionLocal)
     log_info(
         "Aplicação iniciada", app_name=settings.APP_NAME, version=settings.APP_VERSION
     )
@@ -44,7 +121,8 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Evento executado ao encerrar a aplicação"""
-    log_info("Aplicação encerrada")
+    log_info("Encerrando aplicação", em_andamento=drain_state.em_andamento)
+    await graceful_shutdown(engine, settings.SHUTDOWN_DRAIN_TIMEOUT)
 
 
 @app.get("/")
@@ -66,3 +144,36 @@ def health_check():
         "app": settings.APP_NAME,
         "version": settings.APP_VERSION,
     }
+
+
+@app.get("/health/ready")
+def readiness_check(response: Response, db: Session = Depends(get_db)):
+    """
+    Readiness: 200 só depois do aquecimento e de um round trip ao banco
+    """
+    aquecido = not settings.WARMUP_ENABLED or warmup_state.concluido
+
+    try:
+        db.execute(text("SELECT 1"))
+        banco = "ok"
+    except Exception as e:
+        log_warning("Readiness sem acesso ao banco", erro=str(e))
+        banco = "erro"
+
+    pronto = aquecido and banco == "ok"
+    if not pronto:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    return {
+        "status": "ready" if pronto else "not_ready",
+        "banco": banco,
+        "aquecimento": warmup_state.resumo(),
+    }
+
+
+if settings.METRICS_ENABLED:
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        """Métricas no formato de exposição do Prometheus"""
+        return PlainTextResponse(generate_latest(), media_type=CONTENT_TYPE)
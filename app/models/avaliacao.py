@@ -11,9 +11,15 @@ from sqlalchemy import (
 )
 from sqlalchemy.orm import relationship
 from datetime import datetime
+from typing import Any, Mapping, Optional
 import enum
 
 from app.db.database import Base
+from app.db.partitioning import (
+    partition_table_args,
+    partitioning_enabled,
+    register_partitioned_table,
+)
 
 
 class StatusCiclo(str, enum.Enum):
@@ -49,6 +55,8 @@ class Ciclo(Base):
     atualizado_em = Column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
+    # Controle de concorrência otimista: incluída no WHERE dos UPDATEs
+    versao = Column(Integer, nullable=False, default=1, server_default="1")
 
     # Relacionamentos
     avaliacoes_comportamentais = relationship(
@@ -56,12 +64,21 @@ class Ciclo(Base):
     )
     metas = relationship("Meta", back_populates="ciclo")
 
+    __mapper_args__ = {"version_id_col": versao}
+
 
 class AvaliacaoComportamental(Base):
     __tablename__ = "avaliacoes_comportamentais"
 
-    id = Column(Integer, primary_key=True, index=True)
-    ciclo_id = Column(Integer, ForeignKey("ciclos.id"), nullable=False, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    # Chave de partição: entra na PK com DB_PARTITION_BY_CICLO
+    ciclo_id = Column(
+        Integer,
+        ForeignKey("ciclos.id"),
+        nullable=False,
+        index=True,
+        primary_key=partitioning_enabled(),
+    )
     avaliado_matricula = Column(
         String(50), ForeignKey("colaboradores.matricula"), nullable=False, index=True
     )
@@ -78,17 +95,19 @@ class AvaliacaoComportamental(Base):
     adaptabilidade = Column(Integer, nullable=False)
 
     # Média calculada
-    media_competencias = Column(Float, nullable=True)
+    media_competencias = Column(Float, nullable=True, index=True)
 
     comentarios = Column(Text)
     status = Column(
         SQLEnum(StatusAvaliacao), default=StatusAvaliacao.PENDENTE, nullable=False
     )
 
-    criado_em = Column(DateTime, default=datetime.utcnow, nullable=False)
+    criado_em = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     atualizado_em = Column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
+    # Controle de concorrência otimista: incluída no WHERE dos UPDATEs
+    versao = Column(Integer, nullable=False, default=1, server_default="1")
 
     # Relacionamentos
     ciclo = relationship("Ciclo", back_populates="avaliacoes_comportamentais")
@@ -103,12 +122,46 @@ class AvaliacaoComportamental(Base):
         back_populates="avaliacoes_realizadas",
     )
 
+    __table_args__ = partition_table_args()
+    __mapper_args__ = {"version_id_col": versao, "primary_key": [id]}
+
+
+COMPETENCIAS = (
+    "lideranca",
+    "comunicacao",
+    "trabalho_equipe",
+    "resolucao_problemas",
+    "adaptabilidade",
+)
+
+
+def media_competencias(notas: Optional[Mapping[str, Any]] = None):
+    """
+    Média das cinco competências (valor de media_competencias)
+
+    As notas ausentes de `notas` vêm das próprias colunas: com as cinco
+    notas o resultado é um número; senão, uma expressão SQL para o SET de
+    um UPDATE.
+    """
+    notas = notas or {}
+    return (
+        sum(notas.get(c, getattr(AvaliacaoComportamental, c)) for c in COMPETENCIAS)
+        / 5.0
+    )
+
 
 class Meta(Base):
     __tablename__ = "metas"
 
-    id = Column(Integer, primary_key=True, index=True)
-    ciclo_id = Column(Integer, ForeignKey("ciclos.id"), nullable=False, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    # Chave de partição: entra na PK com DB_PARTITION_BY_CICLO
+    ciclo_id = Column(
+        Integer,
+        ForeignKey("ciclos.id"),
+        nullable=False,
+        index=True,
+        primary_key=partitioning_enabled(),
+    )
     colaborador_matricula = Column(
         String(50), ForeignKey("colaboradores.matricula"), nullable=False, index=True
     )
@@ -116,17 +169,26 @@ class Meta(Base):
     titulo = Column(String(200), nullable=False)
     descricao = Column(Text)
     peso = Column(Integer, nullable=False)  # Peso da meta (1-100)
-    data_limite = Column(Date, nullable=False)
+    data_limite = Column(Date, nullable=False, index=True)
 
     # Resultado
-    resultado_alcancado = Column(Integer)  # Percentual alcançado (0-100)
+    resultado_alcancado = Column(Integer, index=True)  # Percentual alcançado (0-100)
     comentarios_gestor = Column(Text)
 
-    criado_em = Column(DateTime, default=datetime.utcnow, nullable=False)
+    criado_em = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     atualizado_em = Column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
+    # Controle de concorrência otimista: incluída no WHERE dos UPDATEs
+    versao = Column(Integer, nullable=False, default=1, server_default="1")
 
     # Relacionamentos
     ciclo = relationship("Ciclo", back_populates="metas")
     colaborador = relationship("Colaborador", back_populates="metas")
+
+    __table_args__ = partition_table_args()
+    __mapper_args__ = {"version_id_col": versao, "primary_key": [id]}
+
+
+register_partitioned_table(AvaliacaoComportamental.__table__)
+register_partitioned_table(Meta.__table__)
@@ -19,23 +19,26 @@ class Colaborador(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     matricula = Column(String(50), unique=True, nullable=False, index=True)
-    nome = Column(String(200), nullable=False)
+    nome = Column(String(200), nullable=False, index=True)
     email = Column(String(200), unique=True, nullable=False, index=True)
     senha_hash = Column(String(255), nullable=False)
     cargo = Column(String(100), nullable=False)
     departamento = Column(String(100), nullable=False)
     gestor_matricula = Column(String(50), nullable=True)
     ativo = Column(Boolean, default=True, nullable=False)
-    criado_em = Column(DateTime, default=datetime.utcnow, nullable=False)
+    criado_em = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     atualizado_em = Column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
+    # Controle de concorrência otimista: incluída no WHERE dos UPDATEs
+    versao = Column(Integer, nullable=False, default=1, server_default="1")
 
     # Constraints
     __table_args__ = (
         UniqueConstraint("matricula", name="uq_colaborador_matricula"),
         UniqueConstraint("email", name="uq_colaborador_email"),
     )
+    __mapper_args__ = {"version_id_col": versao}
 
     # Relacionamentos
     # Relacionamento auto-referencial para gestor/subordinados
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, DateTime, Integer, String, Text
+from datetime import datetime
+
+from app.db.database import Base
+
+
+class ChaveIdempotencia(Base):
+    __tablename__ = "chaves_idempotencia"
+
+    # sha256 de (matrícula, método, rota, Idempotency-Key)
+    chave = Column(String(64), primary_key=True)
+    # HMAC do payload: a mesma chave com outro corpo é recusada
+    hash_requisicao = Column(String(64), nullable=False)
+    # Nulos enquanto a requisição original está em processamento
+    status_code = Column(Integer, nullable=True)
+    corpo = Column(Text, nullable=True)
+    criado_em = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expira_em = Column(DateTime, nullable=False, index=True)
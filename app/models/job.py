@@ -0,0 +1,81 @@
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Enum as SQLEnum,
+    Index,
+    Integer,
+    String,
+    Text,
+)
+from datetime import datetime
+import enum
+
+from app.db.database import Base
+
+
+class StatusJob(str, enum.Enum):
+    PENDENTE = "pendente"
+    EXECUTANDO = "executando"
+    CONCLUIDO = "concluido"
+    FALHOU = "falhou"
+    CANCELADO = "cancelado"
+
+
+# Status em que o job ainda vai (ou está) executando
+JOB_ATIVO = (StatusJob.PENDENTE, StatusJob.EXECUTANDO)
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    tipo = Column(String(50), nullable=False, index=True)
+    parametros = Column(Text, nullable=False, default="{}")  # JSON
+    # Alvo do job (ex.: "fechar_ciclo:3"): no máximo um job ativo por chave
+    chave = Column(String(100), nullable=True)
+    status = Column(SQLEnum(StatusJob), default=StatusJob.PENDENTE, nullable=False)
+
+    # Progresso informado pelo próprio job
+    processados = Column(Integer, nullable=False, default=0)
+    total = Column(Integer, nullable=True)
+    mensagem = Column(String(500), nullable=True)
+
+    resultado = Column(Text, nullable=True)  # JSON
+    erro = Column(Text, nullable=True)
+    tentativas = Column(Integer, nullable=False, default=0)
+    max_tentativas = Column(Integer, nullable=False)
+    # Lido pelo job a cada progresso; quem executa encerra como cancelado
+    cancelamento_solicitado = Column(Boolean, nullable=False, default=False)
+    # Token da execução que assumiu o job; progresso e resultado só gravam
+    # se ela ainda for a dona (outra pode ter assumido após a recuperação)
+    execucao = Column(String(32), nullable=True)
+
+    criado_por = Column(String(50), nullable=True, index=True)
+    criado_em = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Próxima tentativa não antes disso (espera entre falhas)
+    executar_apos = Column(DateTime, default=datetime.utcnow, nullable=False)
+    iniciado_em = Column(DateTime, nullable=True)
+    concluido_em = Column(DateTime, nullable=True)
+    # Sinal de vida: job em execução sem atualização volta para a fila
+    atualizado_em = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Busca dos próximos pendentes e dos interrompidos; unicidade da chave
+    # entre os pendentes e em execução (índice parcial)
+    __table_args__ = (
+        Index("ix_jobs_fila", "status", "executar_apos"),
+        Index(
+            "ux_jobs_chave_ativa",
+            chave,
+            unique=True,
+            sqlite_where=status.in_(JOB_ATIVO),
+            postgresql_where=status.in_(JOB_ATIVO),
+        ),
+    )
+
+    @property
+    def progresso(self):
+        """Percentual concluído, se o job informou o total"""
+        if not self.total:
+            return None
+        return round(min(self.processados, self.total) * 100 / self.total, 1)
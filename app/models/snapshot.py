@@ -0,0 +1,38 @@
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, Text
+from datetime import datetime
+
+from app.db.database import Base
+
+
+class CicloSnapshot(Base):
+    __tablename__ = "ciclo_snapshots"
+
+    # Gerado uma única vez, na transação que finaliza o ciclo
+    ciclo_id = Column(Integer, ForeignKey("ciclos.id"), primary_key=True)
+    gerado_em = Column(DateTime, default=datetime.utcnow, nullable=False)
+    total_colaboradores = Column(Integer, nullable=False)
+    total_avaliacoes = Column(Integer, nullable=False)
+    total_metas = Column(Integer, nullable=False)
+    media_comportamental = Column(Float, nullable=True)
+    resultado_metas = Column(Float, nullable=True)
+    # JSON com o resumo por departamento
+    por_departamento = Column(Text, nullable=False)
+
+
+class ResultadoCiclo(Base):
+    __tablename__ = "resultados_ciclo"
+
+    ciclo_id = Column(Integer, ForeignKey("ciclos.id"), primary_key=True)
+    colaborador_matricula = Column(
+        String(50), ForeignKey("colaboradores.matricula"), primary_key=True
+    )
+    # Cópias do cadastro na data do fechamento
+    nome = Column(String(200), nullable=False)
+    departamento = Column(String(100), nullable=False)
+
+    total_avaliacoes = Column(Integer, nullable=False)
+    # Média das avaliações concluídas recebidas no ciclo
+    media_comportamental = Column(Float, nullable=True)
+    total_metas = Column(Integer, nullable=False)
+    # Resultado das metas ponderado pelo peso (só metas com resultado)
+    resultado_metas = Column(Float, nullable=True)
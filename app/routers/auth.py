@@ -9,8 +9,10 @@ from app.schemas.auth import Token, LoginRequest, LoginResponse
 from app.core.security import verify_password, create_access_token
 from app.core.config import settings
 from app.core.logging import log_info, log_error, log_warning
+from app.core.metrics import LOGINS
+from app.core.timing import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.post("/token", response_model=Token)
@@ -29,6 +31,7 @@ def login_for_access_token(
     )
 
     if not colaborador:
+        LOGINS.labels(resultado="colaborador_nao_encontrado").inc()
         log_warning(
             "Login falhou - colaborador não encontrado", matricula=form_data.username
         )
@@ -39,6 +42,7 @@ def login_for_access_token(
         )
 
     if not verify_password(form_data.password, colaborador.senha_hash):
+        LOGINS.labels(resultado="senha_incorreta").inc()
         log_warning("Login falhou - senha incorreta", matricula=form_data.username)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -51,6 +55,7 @@ def login_for_access_token(
         data={"sub": colaborador.matricula}, expires_delta=access_token_expires
     )
 
+    LOGINS.labels(resultado="sucesso").inc()
     log_info(
         "Login bem-sucedido", matricula=colaborador.matricula, nome=colaborador.nome
     )
@@ -74,6 +79,7 @@ def login(login_data: LoginRequest, db: Session = Depends(get_db)):
     )
 
     if not colaborador:
+        LOGINS.labels(resultado="colaborador_nao_encontrado").inc()
         log_warning(
             "Login falhou - colaborador não encontrado", matricula=login_data.matricula
         )
@@ -83,6 +89,7 @@ def login(login_data: LoginRequest, db: Session = Depends(get_db)):
         )
 
     if not verify_password(login_data.senha, colaborador.senha_hash):
+        LOGINS.labels(resultado="senha_incorreta").inc()
         log_warning("Login falhou - senha incorreta", matricula=login_data.matricula)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -94,6 +101,7 @@ def login(login_data: LoginRequest, db: Session = Depends(get_db)):
         data={"sub": colaborador.matricula}, expires_delta=access_token_expires
     )
 
+    LOGINS.labels(resultado="sucesso").inc()
     log_info(
         "Login bem-sucedido", matricula=colaborador.matricula, nome=colaborador.nome
     )
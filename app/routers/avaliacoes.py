@@ -1,19 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from sqlalchemy.orm import Session
+from datetime import datetime
 from typing import List, Optional
 
 from app.db.database import get_db
+from app.db.filters import (
+    FILTROS_AVALIACAO,
+    ORDENACAO_AVALIACAO,
+    apply_filters,
+    parse_sort,
+)
+from app.db.snapshots import finalized_error, in_open_ciclo, reject_if_finalized
+from app.db.writes import delete_returning, insert_checked, update_returning
 from app.models.colaborador import Colaborador
-from app.models.avaliacao import AvaliacaoComportamental, Ciclo
+from app.models.avaliacao import (
+    COMPETENCIAS,
+    AvaliacaoComportamental,
+    StatusAvaliacao,
+    StatusCiclo,
+    media_competencias,
+)
 from app.schemas.avaliacao import (
     AvaliacaoComportamentalCreate,
     AvaliacaoComportamentalUpdate,
     AvaliacaoComportamentalResponse,
+    AvaliacaoComportamentalLoteResponse,
+)
+from app.core.batch import fetch_in_order
+from app.core.concurrency import (
+    check_version,
+    get_if_match,
+    set_etag,
+    version_conflict,
 )
 from app.core.dependencies import get_current_active_user
+from app.core.idempotency import Idempotencia, get_idempotencia
 from app.core.logging import log_info, log_error, log_warning
+from app.core.fieldsets import parse_fields, project_query
+from app.core.serialization import list_response, partial_response
+from app.core.timing import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get("/", response_model=List[AvaliacaoComportamentalResponse])
@@ -24,12 +51,32 @@ def get_avaliacoes(
     avaliado_matricula: Optional[str] = None,
     avaliador_matricula: Optional[str] = None,
     status_avaliacao: Optional[str] = None,
+    criado_em_de: Optional[datetime] = None,
+    criado_em_ate: Optional[datetime] = None,
+    media_min: Optional[float] = Query(None, ge=1, le=5),
+    media_max: Optional[float] = Query(None, ge=1, le=5),
+    ordenar: Optional[str] = Query(
+        None,
+        description="Ordenação separada por vírgula, '-' para decrescente "
+        "(ex.: -criado_em,id)",
+    ),
+    fields: Optional[str] = Query(
+        None, description="Campos a retornar, separados por vírgula (ex.: id,nome)"
+    ),
     db: Session = Depends(get_db),
     current_user: Colaborador = Depends(get_current_active_user),
 ):
     """
     Lista todas as avaliações com filtros opcionais
+
+    - **criado_em_de/criado_em_ate**, **media_min/media_max**: Intervalos
+      (inclusivos) de criação e de média das competências
+    - **ordenar**: id, criado_em ou media_competencias
+    - **fields**: Se informado, retorna (e busca no banco) apenas esses campos
     """
+    campos = parse_fields(fields, AvaliacaoComportamentalResponse)
+    ordem = parse_sort(ordenar, ORDENACAO_AVALIACAO)
+
     log_info(
         "Listando avaliações",
         usuario=current_user.matricula,
@@ -54,11 +101,27 @@ def get_avaliacoes(
     if status_avaliacao:
         query = query.filter(AvaliacaoComportamental.status == status_avaliacao)
 
-    avaliacoes = query.offset(skip).limit(limit).all()
+    query = apply_filters(
+        query,
+        FILTROS_AVALIACAO,
+        criado_em_de=criado_em_de,
+        criado_em_ate=criado_em_ate,
+        media_min=media_min,
+        media_max=media_max,
+    )
+
+    query = project_query(
+        query, AvaliacaoComportamental, AvaliacaoComportamentalResponse, campos
+    )
+
+    avaliacoes = query.order_by(*ordem).offset(skip).limit(limit).all()
 
     log_info("Avaliações listadas", total=len(avaliacoes))
 
-    return avaliacoes
+    if campos:
+        return partial_response(campos, avaliacoes)
+
+    return list_response(AvaliacaoComportamentalResponse, avaliacoes)
 
 
 @router.get("/minhas", response_model=List[AvaliacaoComportamentalResponse])
@@ -85,7 +148,7 @@ def get_minhas_avaliacoes(
 
     log_info("Minhas avaliações encontradas", total=len(avaliacoes))
 
-    return avaliacoes
+    return list_response(AvaliacaoComportamentalResponse, avaliacoes)
 
 
 @router.get("/pendentes", response_model=List[AvaliacaoComportamentalResponse])
@@ -115,12 +178,42 @@ def get_avaliacoes_pendentes(
 
     log_info("Avaliações pendentes encontradas", total=len(avaliacoes))
 
-    return avaliacoes
+    return list_response(AvaliacaoComportamentalResponse, avaliacoes)
+
+
+@router.get("/lote", response_model=AvaliacaoComportamentalLoteResponse)
+def get_avaliacoes_lote(
+    ids: List[int] = Query(..., description="IDs das avaliações"),
+    db: Session = Depends(get_db),
+    current_user: Colaborador = Depends(get_current_active_user),
+):
+    """
+    Busca várias avaliações por ID em uma única consulta
+
+    - **ids**: IDs das avaliações (ex.: ?ids=1&ids=2). A resposta mantém a
+      ordem pedida e lista em nao_encontrados os IDs inexistentes
+    """
+    log_info(
+        "Buscando avaliações em lote", usuario=current_user.matricula, total=len(ids)
+    )
+
+    itens, nao_encontrados = fetch_in_order(
+        db, AvaliacaoComportamental, AvaliacaoComportamental.id, ids
+    )
+
+    log_info(
+        "Avaliações em lote encontradas",
+        total=len(itens),
+        nao_encontrados=len(nao_encontrados),
+    )
+
+    return {"itens": itens, "nao_encontrados": nao_encontrados}
 
 
 @router.get("/{avaliacao_id}", response_model=AvaliacaoComportamentalResponse)
 def get_avaliacao(
     avaliacao_id: int,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: Colaborador = Depends(get_current_active_user),
 ):
@@ -147,6 +240,7 @@ def get_avaliacao(
 
     log_info("Avaliação encontrada", avaliacao_id=avaliacao.id)
 
+    set_etag(response, avaliacao)
     return avaliacao
 
 
@@ -159,6 +253,7 @@ def create_avaliacao(
     avaliacao: AvaliacaoComportamentalCreate,
     db: Session = Depends(get_db),
     current_user: Colaborador = Depends(get_current_active_user),
+    idempotencia: Idempotencia = Depends(get_idempotencia),
 ):
     """
     Cria uma nova avaliação comportamental
@@ -171,55 +266,34 @@ def create_avaliacao(
         criado_por=current_user.matricula,
     )
 
-    # Verificar se o ciclo existe
-    ciclo = db.query(Ciclo).filter(Ciclo.id == avaliacao.ciclo_id).first()
-    if not ciclo:
-        log_warning(
-            "Tentativa de criar avaliação com ciclo inexistente",
-            ciclo_id=avaliacao.ciclo_id,
-        )
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Ciclo não encontrado"
-        )
+    reject_if_finalized(db, avaliacao.ciclo_id)
 
-    # Verificar se o avaliado existe
-    avaliado = (
-        db.query(Colaborador)
-        .filter(Colaborador.matricula == avaliacao.avaliado_matricula)
-        .first()
+    # Ciclo e colaboradores são conferidos pelas FKs no próprio INSERT
+    dados = avaliacao.dict()
+    db_avaliacao = AvaliacaoComportamental(
+        **dados, media_competencias=media_competencias(dados)
     )
-    if not avaliado:
-        log_warning(
-            "Tentativa de criar avaliação para colaborador inexistente",
-            matricula=avaliacao.avaliado_matricula,
-        )
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Colaborador avaliado não encontrado",
-        )
-
-    # Verificar se o avaliador existe
-    avaliador = (
-        db.query(Colaborador)
-        .filter(Colaborador.matricula == avaliacao.avaliador_matricula)
-        .first()
+    insert_checked(
+        db,
+        db_avaliacao,
+        {
+            "ciclo_id": (status.HTTP_404_NOT_FOUND, "Ciclo não encontrado"),
+            "avaliado_matricula": (
+                status.HTTP_404_NOT_FOUND,
+                "Colaborador avaliado não encontrado",
+            ),
+            "avaliador_matricula": (
+                status.HTTP_404_NOT_FOUND,
+                "Colaborador avaliador não encontrado",
+            ),
+        },
     )
-    if not avaliador:
-        log_warning(
-            "Tentativa de criar avaliação com avaliador inexistente",
-            matricula=avaliacao.avaliador_matricula,
-        )
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Colaborador avaliador não encontrado",
-        )
-
-    # Criar avaliação
-    db_avaliacao = AvaliacaoComportamental(**avaliacao.dict())
-
-    db.add(db_avaliacao)
+    idempotencia.concluir(
+        status.HTTP_201_CREATED, AvaliacaoComportamentalResponse, db_avaliacao
+    )
+    # Fora da sessão o objeto não expira no commit (sem refresh)
+    db.expunge(db_avaliacao)
     db.commit()
-    db.refresh(db_avaliacao)
 
     log_info(
         "Avaliação criada com sucesso",
@@ -235,8 +309,10 @@ def create_avaliacao(
 def update_avaliacao(
     avaliacao_id: int,
     avaliacao_update: AvaliacaoComportamentalUpdate,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: Colaborador = Depends(get_current_active_user),
+    versao_esperada: Optional[int] = Depends(get_if_match),
 ):
     """
     Atualiza uma avaliação comportamental
@@ -247,31 +323,43 @@ def update_avaliacao(
         atualizado_por=current_user.matricula,
     )
 
-    avaliacao = (
-        db.query(AvaliacaoComportamental)
-        .filter(AvaliacaoComportamental.id == avaliacao_id)
-        .first()
+    # Atualizar campos (um UPDATE ... RETURNING; o SELECT só no caminho de falha)
+    update_data = avaliacao_update.dict(exclude_unset=True)
+    if update_data.keys() & set(COMPETENCIAS):
+        # Notas não enviadas entram pelas colunas, no próprio UPDATE
+        update_data["media_competencias"] = media_competencias(update_data)
+    avaliacao = update_returning(
+        db,
+        AvaliacaoComportamental,
+        [
+            AvaliacaoComportamental.id == avaliacao_id,
+            in_open_ciclo(AvaliacaoComportamental.ciclo_id),
+        ],
+        update_data,
+        versao_esperada,
     )
 
     if not avaliacao:
-        log_warning(
-            "Tentativa de atualizar avaliação inexistente", avaliacao_id=avaliacao_id
-        )
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Avaliação não encontrada"
-        )
-
-    # Atualizar campos
-    update_data = avaliacao_update.dict(exclude_unset=True)
-
-    for field, value in update_data.items():
-        setattr(avaliacao, field, value)
+        atual = db.get(AvaliacaoComportamental, avaliacao_id)
+        if not atual:
+            log_warning(
+                "Tentativa de atualizar avaliação inexistente",
+                avaliacao_id=avaliacao_id,
+            )
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Avaliação não encontrada",
+            )
+        if atual.ciclo.status == StatusCiclo.FINALIZADO:
+            raise finalized_error(ciclo_id=atual.ciclo_id, avaliacao_id=avaliacao_id)
+        check_version(atual, versao_esperada, avaliacao_id=avaliacao_id)
+        raise version_conflict(avaliacao_id=avaliacao_id)
 
     db.commit()
-    db.refresh(avaliacao)
 
     log_info("Avaliação atualizada com sucesso", avaliacao_id=avaliacao.id)
 
+    set_etag(response, avaliacao)
     return avaliacao
 
 
@@ -290,13 +378,20 @@ def delete_avaliacao(
         deletado_por=current_user.matricula,
     )
 
-    avaliacao = (
-        db.query(AvaliacaoComportamental)
-        .filter(AvaliacaoComportamental.id == avaliacao_id)
-        .first()
+    avaliacao = delete_returning(
+        db,
+        AvaliacaoComportamental,
+        [
+            AvaliacaoComportamental.id == avaliacao_id,
+            in_open_ciclo(AvaliacaoComportamental.ciclo_id),
+        ],
+        AvaliacaoComportamental.id,
     )
 
     if not avaliacao:
+        atual = db.get(AvaliacaoComportamental, avaliacao_id)
+        if atual is not None:
+            raise finalized_error(ciclo_id=atual.ciclo_id, avaliacao_id=avaliacao_id)
         log_warning(
             "Tentativa de deletar avaliação inexistente", avaliacao_id=avaliacao_id
         )
@@ -304,7 +399,6 @@ def delete_avaliacao(
             status_code=status.HTTP_404_NOT_FOUND, detail="Avaliação não encontrada"
         )
 
-    db.delete(avaliacao)
     db.commit()
 
     log_info("Avaliação deletada com sucesso", avaliacao_id=avaliacao_id)
@@ -315,8 +409,10 @@ def delete_avaliacao(
 @router.post("/{avaliacao_id}/concluir", response_model=AvaliacaoComportamentalResponse)
 def concluir_avaliacao(
     avaliacao_id: int,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: Colaborador = Depends(get_current_active_user),
+    versao_esperada: Optional[int] = Depends(get_if_match),
 ):
     """
     Marca uma avaliação como concluída
@@ -327,33 +423,49 @@ def concluir_avaliacao(
         concluido_por=current_user.matricula,
     )
 
-    avaliacao = (
-        db.query(AvaliacaoComportamental)
-        .filter(AvaliacaoComportamental.id == avaliacao_id)
-        .first()
+    avaliacao = update_returning(
+        db,
+        AvaliacaoComportamental,
+        [
+            AvaliacaoComportamental.id == avaliacao_id,
+            AvaliacaoComportamental.status != StatusAvaliacao.CONCLUIDA,
+            in_open_ciclo(AvaliacaoComportamental.ciclo_id),
+        ],
+        {
+            "status": StatusAvaliacao.CONCLUIDA,
+            "media_competencias": media_competencias(),
+        },
+        versao_esperada,
     )
 
     if not avaliacao:
-        log_warning(
-            "Tentativa de concluir avaliação inexistente", avaliacao_id=avaliacao_id
-        )
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Avaliação não encontrada"
-        )
-
-    if avaliacao.status == "concluida":
-        log_warning(
-            "Tentativa de concluir avaliação já concluída", avaliacao_id=avaliacao_id
-        )
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Avaliação já está concluída",
-        )
+        atual = db.get(AvaliacaoComportamental, avaliacao_id)
+        if not atual:
+            log_warning(
+                "Tentativa de concluir avaliação inexistente",
+                avaliacao_id=avaliacao_id,
+            )
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Avaliação não encontrada",
+            )
+        if atual.ciclo.status == StatusCiclo.FINALIZADO:
+            raise finalized_error(ciclo_id=atual.ciclo_id, avaliacao_id=avaliacao_id)
+        check_version(atual, versao_esperada, avaliacao_id=avaliacao_id)
+        if atual.status == StatusAvaliacao.CONCLUIDA:
+            log_warning(
+                "Tentativa de concluir avaliação já concluída",
+                avaliacao_id=avaliacao_id,
+            )
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Avaliação já está concluída",
+            )
+        raise version_conflict(avaliacao_id=avaliacao_id)
 
-    avaliacao.status = "concluida"
     db.commit()
-    db.refresh(avaliacao)
 
     log_info("Avaliação concluída com sucesso", avaliacao_id=avaliacao.id)
 
+    set_etag(response, avaliacao)
     return avaliacao
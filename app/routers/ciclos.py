@@ -1,15 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional
 
+from app.db.closing import JOB_FECHAR_CICLO
 from app.db.database import get_db
+from app.db.partitioning import create_ciclo_partitions, partitioning_enabled
+from app.db.snapshots import CICLO_FINALIZADO_DETAIL, build_snapshot
+from app.db.writes import delete_returning, update_returning
 from app.models.colaborador import Colaborador
-from app.models.avaliacao import Ciclo
+from app.models.avaliacao import Ciclo, StatusCiclo
+from app.models.job import JOB_ATIVO, Job
 from app.schemas.avaliacao import CicloCreate, CicloUpdate, CicloResponse
+from app.schemas.job import JobResponse
+from app.core.cache_bus import invalidate_on_commit, register_cache
+from app.core.concurrency import (
+    check_version,
+    get_if_match,
+    set_etag,
+    version_conflict,
+)
 from app.core.dependencies import get_current_active_user
+from app.core.jobs import enqueue_job, set_job_location
 from app.core.logging import log_info, log_error, log_warning
+from app.core.timing import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
+
+# Ciclo ativo: lido em quase toda tela, alterado poucas vezes por ano
+ciclos_cache = register_cache("ciclos")
+
+def _status_ciclo(valor: str) -> StatusCiclo:
+    """Aceita o status pelo valor ("finalizado") ou pelo nome ("FINALIZADO")"""
+    if valor in StatusCiclo.__members__:
+        return StatusCiclo[valor]
+    try:
+        return StatusCiclo(valor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Status inválido: {valor}",
+        )
 
 
 @router.get("/", response_model=List[CicloResponse])
@@ -41,7 +73,11 @@ def get_ciclo_ativo(
     """
     log_info("Buscando ciclo ativo", usuario=current_user.matricula)
 
-    ciclo = db.query(Ciclo).filter(Ciclo.status == "em_andamento").first()
+    def carregar():
+        ciclo = db.query(Ciclo).filter(Ciclo.status == "em_andamento").first()
+        return CicloResponse.model_validate(ciclo) if ciclo else None
+
+    ciclo = ciclos_cache.get_or_load("ativo", carregar)
 
     if not ciclo:
         log_warning("Nenhum ciclo ativo encontrado")
@@ -58,6 +94,7 @@ def get_ciclo_ativo(
 @router.get("/{ciclo_id}", response_model=CicloResponse)
 def get_ciclo(
     ciclo_id: int,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: Colaborador = Depends(get_current_active_user),
 ):
@@ -76,6 +113,7 @@ def get_ciclo(
 
     log_info("Ciclo encontrado", ciclo_id=ciclo.id, ano=ciclo.ano)
 
+    set_etag(response, ciclo)
     return ciclo
 
 
@@ -110,6 +148,11 @@ def create_ciclo(
     )
 
     db.add(db_ciclo)
+    if partitioning_enabled():
+        # Partições de avaliações e metas na mesma transação do ciclo
+        db.flush()
+        create_ciclo_partitions(db, db_ciclo.id)
+    invalidate_on_commit(db, "ciclos")
     db.commit()
     db.refresh(db_ciclo)
 
@@ -122,36 +165,126 @@ def create_ciclo(
 def update_ciclo(
     ciclo_id: int,
     ciclo_update: CicloUpdate,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: Colaborador = Depends(get_current_active_user),
+    versao_esperada: Optional[int] = Depends(get_if_match),
 ):
     """
     Atualiza um ciclo de avaliação
+
+    Ao passar para finalizado, os resultados do ciclo são congelados no
+    snapshot na mesma transação; a partir daí o ciclo não muda mais.
     """
     log_info(
         "Atualizando ciclo", ciclo_id=ciclo_id, atualizado_por=current_user.matricula
     )
 
-    ciclo = db.query(Ciclo).filter(Ciclo.id == ciclo_id).first()
+    update_data = ciclo_update.dict(exclude_unset=True)
+    if update_data.get("status") is not None:
+        update_data["status"] = _status_ciclo(update_data["status"])
+
+    # Atualizar campos (um UPDATE ... RETURNING; o SELECT só no caminho de falha)
+    ciclo = update_returning(
+        db,
+        Ciclo,
+        [Ciclo.id == ciclo_id, Ciclo.status != StatusCiclo.FINALIZADO],
+        update_data,
+        versao_esperada,
+    )
+
+    if not ciclo:
+        atual = db.get(Ciclo, ciclo_id)
+        if not atual:
+            log_warning("Tentativa de atualizar ciclo inexistente", ciclo_id=ciclo_id)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Ciclo não encontrado"
+            )
+        if atual.status == StatusCiclo.FINALIZADO:
+            log_warning("Tentativa de alterar ciclo finalizado", ciclo_id=ciclo_id)
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT, detail=CICLO_FINALIZADO_DETAIL
+            )
+        check_version(atual, versao_esperada, ciclo_id=ciclo_id)
+        raise version_conflict(ciclo_id=ciclo_id)
+
+    if ciclo.status == StatusCiclo.FINALIZADO:
+        build_snapshot(db, ciclo_id)
+
+    invalidate_on_commit(db, "ciclos")
+    db.commit()
+
+    log_info("Ciclo atualizado com sucesso", ciclo_id=ciclo.id, ano=ciclo.ano)
+
+    set_etag(response, ciclo)
+    return ciclo
+
+
+@router.post(
+    "/{ciclo_id}/fechar",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def fechar_ciclo(
+    ciclo_id: int,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: Colaborador = Depends(get_current_active_user),
+):
+    """
+    Fecha o ciclo em segundo plano: conclui as avaliações pendentes em lotes,
+    finaliza o ciclo e gera o snapshot dos resultados
+
+    Acompanhe o job pelo header Location (GET /api/jobs/{id}).
+    """
+    log_info("Fechando ciclo", ciclo_id=ciclo_id, solicitado_por=current_user.matricula)
+
+    ciclo = db.get(Ciclo, ciclo_id)
 
     if not ciclo:
-        log_warning("Tentativa de atualizar ciclo inexistente", ciclo_id=ciclo_id)
+        log_warning("Tentativa de fechar ciclo inexistente", ciclo_id=ciclo_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Ciclo não encontrado"
         )
 
-    # Atualizar campos
-    update_data = ciclo_update.dict(exclude_unset=True)
-
-    for field, value in update_data.items():
-        setattr(ciclo, field, value)
+    if ciclo.status == StatusCiclo.FINALIZADO:
+        log_warning("Tentativa de fechar ciclo finalizado", ciclo_id=ciclo_id)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail=CICLO_FINALIZADO_DETAIL
+        )
 
-    db.commit()
-    db.refresh(ciclo)
+    # Um fechamento ativo por ciclo, garantido pelo índice único parcial da
+    # chave (sem corrida entre duas requisições simultâneas)
+    chave = f"{JOB_FECHAR_CICLO}:{ciclo_id}"
+    try:
+        job = enqueue_job(
+            db,
+            JOB_FECHAR_CICLO,
+            criado_por=current_user.matricula,
+            chave=chave,
+            ciclo_id=ciclo_id,
+        )
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        em_andamento = db.scalar(
+            select(Job.id).where(Job.chave == chave, Job.status.in_(JOB_ATIVO))
+        )
+        log_warning(
+            "Fechamento de ciclo já em andamento",
+            ciclo_id=ciclo_id,
+            job_id=em_andamento,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Fechamento do ciclo já em andamento (job {em_andamento})",
+        )
+    db.refresh(job)
 
-    log_info("Ciclo atualizado com sucesso", ciclo_id=ciclo.id, ano=ciclo.ano)
+    log_info("Fechamento de ciclo enfileirado", ciclo_id=ciclo_id, job_id=job.id)
 
-    return ciclo
+    set_job_location(response, job)
+    return job
 
 
 @router.delete("/{ciclo_id}", status_code=status.HTTP_200_OK)
@@ -165,17 +298,35 @@ def delete_ciclo(
     """
     log_info("Deletando ciclo", ciclo_id=ciclo_id, deletado_por=current_user.matricula)
 
-    ciclo = db.query(Ciclo).filter(Ciclo.id == ciclo_id).first()
+    try:
+        ciclo = delete_returning(
+            db,
+            Ciclo,
+            [Ciclo.id == ciclo_id, Ciclo.status != StatusCiclo.FINALIZADO],
+            Ciclo.ano,
+        )
+    except IntegrityError:
+        db.rollback()
+        log_warning("Tentativa de deletar ciclo com vínculos", ciclo_id=ciclo_id)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Ciclo possui avaliações ou metas vinculadas",
+        )
 
     if not ciclo:
+        if db.get(Ciclo, ciclo_id) is not None:
+            log_warning("Tentativa de deletar ciclo finalizado", ciclo_id=ciclo_id)
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT, detail=CICLO_FINALIZADO_DETAIL
+            )
         log_warning("Tentativa de deletar ciclo inexistente", ciclo_id=ciclo_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Ciclo não encontrado"
         )
 
-    db.delete(ciclo)
+    invalidate_on_commit(db, "ciclos")
     db.commit()
 
-    log_info("Ciclo deletado com sucesso", ciclo_id=ciclo_id, ano=ciclo.ano)
+    log_info("Ciclo deletado com sucesso", ciclo_id=ciclo_id, ano=ciclo[0])
 
     return {"message": "Ciclo deletado com sucesso", "ciclo_id": ciclo_id}
@@ -1,19 +1,40 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from sqlalchemy.orm import Session
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
 from app.db.database import get_db
+from app.db.filters import (
+    FILTROS_COLABORADOR,
+    ORDENACAO_COLABORADOR,
+    apply_filters,
+    parse_sort,
+)
+from app.db.search import search_colaboradores
+from app.db.writes import insert_checked, update_returning
 from app.models.colaborador import Colaborador
 from app.schemas.colaborador import (
     ColaboradorCreate,
     ColaboradorUpdate,
     ColaboradorResponse,
+    ColaboradorLoteResponse,
+)
+from app.core.batch import fetch_in_order
+from app.core.concurrency import (
+    check_version,
+    get_if_match,
+    set_etag,
+    version_conflict,
 )
 from app.core.dependencies import get_current_active_user
+from app.core.idempotency import Idempotencia, get_idempotencia
 from app.core.security import get_password_hash
 from app.core.logging import log_info, log_error, log_warning
+from app.core.fieldsets import parse_fields, project_query
+from app.core.serialization import list_response, partial_response
+from app.core.timing import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get("/me", response_model=ColaboradorResponse)
@@ -30,12 +51,29 @@ def get_colaboradores(
     skip: int = 0,
     limit: int = 100,
     incluir_inativos: bool = False,
+    criado_em_de: Optional[datetime] = None,
+    criado_em_ate: Optional[datetime] = None,
+    ordenar: Optional[str] = Query(
+        None,
+        description="Ordenação separada por vírgula, '-' para decrescente "
+        "(ex.: -criado_em,id)",
+    ),
+    fields: Optional[str] = Query(
+        None, description="Campos a retornar, separados por vírgula (ex.: id,nome)"
+    ),
     db: Session = Depends(get_db),
     current_user: Colaborador = Depends(get_current_active_user),
 ):
     """
     Lista todos os colaboradores
+
+    - **criado_em_de/criado_em_ate**: Intervalo (inclusivo) de cadastro
+    - **ordenar**: id, matricula, nome ou criado_em
+    - **fields**: Se informado, retorna (e busca no banco) apenas esses campos
     """
+    campos = parse_fields(fields, ColaboradorResponse)
+    ordem = parse_sort(ordenar, ORDENACAO_COLABORADOR)
+
     log_info(
         "Listando colaboradores",
         usuario=current_user.matricula,
@@ -49,16 +87,94 @@ def get_colaboradores(
     if not incluir_inativos:
         query = query.filter(Colaborador.ativo == True)
 
-    colaboradores = query.offset(skip).limit(limit).all()
+    query = apply_filters(
+        query,
+        FILTROS_COLABORADOR,
+        criado_em_de=criado_em_de,
+        criado_em_ate=criado_em_ate,
+    )
+
+    query = project_query(query, Colaborador, ColaboradorResponse, campos)
+
+    colaboradores = query.order_by(*ordem).offset(skip).limit(limit).all()
 
     log_info("Colaboradores listados", total=len(colaboradores))
 
-    return colaboradores
+    if campos:
+        return partial_response(campos, colaboradores)
+
+    return list_response(ColaboradorResponse, colaboradores)
+
+
+@router.get("/lote", response_model=ColaboradorLoteResponse)
+def get_colaboradores_lote(
+    matriculas: List[str] = Query(..., description="Matrículas dos colaboradores"),
+    db: Session = Depends(get_db),
+    current_user: Colaborador = Depends(get_current_active_user),
+):
+    """
+    Busca vários colaboradores por matrícula em uma única consulta
+
+    - **matriculas**: Matrículas (ex.: ?matriculas=123&matriculas=456). A
+      resposta mantém a ordem pedida e lista em nao_encontrados as matrículas
+      inexistentes
+    """
+    log_info(
+        "Buscando colaboradores em lote",
+        usuario=current_user.matricula,
+        total=len(matriculas),
+    )
+
+    itens, nao_encontrados = fetch_in_order(
+        db, Colaborador, Colaborador.matricula, matriculas
+    )
+
+    log_info(
+        "Colaboradores em lote encontrados",
+        total=len(itens),
+        nao_encontrados=len(nao_encontrados),
+    )
+
+    return {"itens": itens, "nao_encontrados": nao_encontrados}
+
+
+@router.get("/busca", response_model=List[ColaboradorResponse])
+def buscar_colaboradores(
+    q: str = Query(
+        ..., min_length=1, max_length=100, description="Termos da busca (ex.: joa sil)"
+    ),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    incluir_inativos: bool = False,
+    db: Session = Depends(get_db),
+    current_user: Colaborador = Depends(get_current_active_user),
+):
+    """
+    Busca colaboradores por nome, email, cargo e departamento
+
+    - **q**: Cada termo casa com o início de uma palavra, sem diferenciar
+      acentos e maiúsculas; resultados ordenados por relevância
+    - Termos muito amplos são truncados: só os SEARCH_MAX_CANDIDATES
+      resultados mais relevantes (padrão 1000) podem ser paginados
+    """
+    log_info(
+        "Buscando colaboradores",
+        usuario=current_user.matricula,
+        skip=skip,
+        limit=limit,
+    )
+
+    colaboradores = search_colaboradores(db, q, skip, limit, incluir_inativos)
+
+    log_info("Busca de colaboradores concluída", total=len(colaboradores))
+
+    return list_response(ColaboradorResponse, colaboradores)
 
 
 @router.get("/{matricula}", response_model=ColaboradorResponse)
 def get_colaborador(
     matricula: str,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: Colaborador = Depends(get_current_active_user),
 ):
@@ -85,6 +201,7 @@ def get_colaborador(
         "Colaborador encontrado", matricula=colaborador.matricula, nome=colaborador.nome
     )
 
+    set_etag(response, colaborador)
     return colaborador
 
 
@@ -95,6 +212,7 @@ def create_colaborador(
     colaborador: ColaboradorCreate,
     db: Session = Depends(get_db),
     current_user: Colaborador = Depends(get_current_active_user),
+    idempotencia: Idempotencia = Depends(get_idempotencia),
 ):
     """
     Cria um novo colaborador
@@ -105,37 +223,7 @@ def create_colaborador(
         criado_por=current_user.matricula,
     )
 
-    # Verificar se matrícula já existe
-    existing = (
-        db.query(Colaborador)
-        .filter(Colaborador.matricula == colaborador.matricula)
-        .first()
-    )
-
-    if existing:
-        log_warning(
-            "Tentativa de criar colaborador com matrícula duplicada",
-            matricula=colaborador.matricula,
-        )
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail="Matrícula já cadastrada"
-        )
-
-    # Verificar se email já existe
-    existing_email = (
-        db.query(Colaborador).filter(Colaborador.email == colaborador.email).first()
-    )
-
-    if existing_email:
-        log_warning(
-            "Tentativa de criar colaborador com email duplicado",
-            email=colaborador.email,
-        )
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail="Email já cadastrado"
-        )
-
-    # Criar colaborador
+    # Matrícula e email duplicados são recusados pelos índices únicos
     db_colaborador = Colaborador(
         matricula=colaborador.matricula,
         nome=colaborador.nome,
@@ -147,9 +235,18 @@ def create_colaborador(
         ativo=True,
     )
 
-    db.add(db_colaborador)
+    insert_checked(
+        db,
+        db_colaborador,
+        {
+            "matricula": (status.HTTP_400_BAD_REQUEST, "Matrícula já cadastrada"),
+            "email": (status.HTTP_400_BAD_REQUEST, "Email já cadastrado"),
+        },
+    )
+    idempotencia.concluir(status.HTTP_201_CREATED, ColaboradorResponse, db_colaborador)
+    # Fora da sessão o objeto não expira no commit (sem refresh)
+    db.expunge(db_colaborador)
     db.commit()
-    db.refresh(db_colaborador)
 
     log_info(
         "Colaborador criado com sucesso",
@@ -164,8 +261,10 @@ def create_colaborador(
 def update_colaborador(
     matricula: str,
     colaborador_update: ColaboradorUpdate,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: Colaborador = Depends(get_current_active_user),
+    versao_esperada: Optional[int] = Depends(get_if_match),
 ):
     """
     Atualiza os dados de um colaborador
@@ -176,30 +275,35 @@ def update_colaborador(
         atualizado_por=current_user.matricula,
     )
 
-    colaborador = (
-        db.query(Colaborador).filter(Colaborador.matricula == matricula).first()
-    )
-
-    if not colaborador:
-        log_warning(
-            "Tentativa de atualizar colaborador inexistente", matricula=matricula
-        )
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Colaborador não encontrado"
-        )
-
-    # Atualizar campos
+    # Atualizar campos (um UPDATE ... RETURNING; o SELECT só no caminho de falha)
     update_data = colaborador_update.dict(exclude_unset=True)
 
     # Se a senha foi fornecida, fazer hash
     if "senha" in update_data and update_data["senha"]:
         update_data["senha_hash"] = get_password_hash(update_data.pop("senha"))
 
-    for field, value in update_data.items():
-        setattr(colaborador, field, value)
+    colaborador = update_returning(
+        db,
+        Colaborador,
+        [Colaborador.matricula == matricula],
+        update_data,
+        versao_esperada,
+    )
+
+    if not colaborador:
+        atual = db.query(Colaborador).filter(Colaborador.matricula == matricula).first()
+        if not atual:
+            log_warning(
+                "Tentativa de atualizar colaborador inexistente", matricula=matricula
+            )
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Colaborador não encontrado",
+            )
+        check_version(atual, versao_esperada, matricula=matricula)
+        raise version_conflict(matricula=matricula)
 
     db.commit()
-    db.refresh(colaborador)
 
     log_info(
         "Colaborador atualizado com sucesso",
@@ -207,6 +311,7 @@ def update_colaborador(
         nome=colaborador.nome,
     )
 
+    set_etag(response, colaborador)
     return colaborador
 
 
@@ -225,19 +330,28 @@ def delete_colaborador(
         desativado_por=current_user.matricula,
     )
 
-    colaborador = (
-        db.query(Colaborador).filter(Colaborador.matricula == matricula).first()
+    # Total delete
+    # db.delete(colaborador)
+    # db.commit()
+
+    # Soft delete
+    colaborador = update_returning(
+        db,
+        Colaborador,
+        [Colaborador.matricula == matricula, Colaborador.ativo == True],
+        {"ativo": False},
     )
 
     if not colaborador:
-        log_warning(
-            "Tentativa de desativar colaborador inexistente", matricula=matricula
-        )
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Colaborador não encontrado"
-        )
-
-    if not colaborador.ativo:
+        atual = db.query(Colaborador).filter(Colaborador.matricula == matricula).first()
+        if not atual:
+            log_warning(
+                "Tentativa de desativar colaborador inexistente", matricula=matricula
+            )
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Colaborador não encontrado",
+            )
         log_warning(
             "Tentativa de desativar colaborador já inativo", matricula=matricula
         )
@@ -246,14 +360,7 @@ def delete_colaborador(
             detail="Colaborador já está inativo",
         )
 
-    # Total delete
-    # db.delete(colaborador)
-    # db.commit()
-
-    # Soft delete
-    colaborador.ativo = False
     db.commit()
-    db.refresh(colaborador)
 
     log_info(
         "Colaborador desativado com sucesso",
@@ -298,7 +405,7 @@ def get_subordinados(
 
     subordinados = query.all()
 
-    return subordinados
+    return list_response(ColaboradorResponse, subordinados)
 
 
 @router.get("/{matricula}/gestor", response_model=ColaboradorResponse)
@@ -0,0 +1,143 @@
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional
+
+from app.db.database import get_db
+from app.models.colaborador import Colaborador
+from app.models.job import Job, StatusJob
+from app.schemas.job import JobResponse
+from app.core.dependencies import get_current_active_user
+from app.core.jobs import cancel_job, retry_job, set_job_location
+from app.core.logging import log_info, log_warning
+from app.core.security import is_admin
+from app.core.timing import TimedRoute
+
+router = APIRouter(route_class=TimedRoute)
+
+
+def _buscar_job(db: Session, job_id: int, usuario: Colaborador) -> Job:
+    """Job visível ao usuário (o próprio ou, para administradores, qualquer um)"""
+    job = db.get(Job, job_id)
+    if not job or (
+        job.criado_por != usuario.matricula and not is_admin(usuario.matricula)
+    ):
+        log_warning("Job não encontrado", job_id=job_id, usuario=usuario.matricula)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Job não encontrado"
+        )
+    return job
+
+
+@router.get("/", response_model=List[JobResponse])
+def get_jobs(
+    skip: int = 0,
+    limit: int = 100,
+    status_job: Optional[StatusJob] = None,
+    tipo: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: Colaborador = Depends(get_current_active_user),
+):
+    """
+    Lista os jobs do usuário logado (todos, para administradores), dos mais
+    recentes para os mais antigos
+    """
+    log_info("Listando jobs", usuario=current_user.matricula, tipo=tipo)
+
+    query = db.query(Job)
+
+    if not is_admin(current_user.matricula):
+        query = query.filter(Job.criado_por == current_user.matricula)
+    if status_job:
+        query = query.filter(Job.status == status_job)
+    if tipo:
+        query = query.filter(Job.tipo == tipo)
+
+    jobs = query.order_by(Job.id.desc()).offset(skip).limit(limit).all()
+
+    log_info("Jobs listados", total=len(jobs))
+
+    return jobs
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: Colaborador = Depends(get_current_active_user),
+):
+    """
+    Situação e progresso de um job (para acompanhamento por polling)
+    """
+    return _buscar_job(db, job_id, current_user)
+
+
+@router.post("/{job_id}/cancelar", response_model=JobResponse)
+def cancelar_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: Colaborador = Depends(get_current_active_user),
+):
+    """
+    Cancela um job pendente; em execução, o job para no próximo progresso
+    (cancelamento_solicitado) e termina como cancelado
+    """
+    log_info("Cancelando job", job_id=job_id, usuario=current_user.matricula)
+
+    job = _buscar_job(db, job_id, current_user)
+
+    if not cancel_job(db, job.id):
+        log_warning("Tentativa de cancelar job encerrado", job_id=job_id)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Job já terminou"
+        )
+
+    db.commit()
+    db.refresh(job)
+
+    log_info("Cancelamento de job registrado", job_id=job_id, status=job.status)
+
+    return job
+
+
+@router.post(
+    "/{job_id}/reexecutar",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def reexecutar_job(
+    job_id: int,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: Colaborador = Depends(get_current_active_user),
+):
+    """
+    Devolve para a fila um job que falhou ou foi cancelado; ele retoma de
+    onde parou
+    """
+    log_info("Reexecutando job", job_id=job_id, usuario=current_user.matricula)
+
+    job = _buscar_job(db, job_id, current_user)
+
+    try:
+        reenfileirado = retry_job(db, job.id)
+    except IntegrityError:
+        db.rollback()
+        log_warning("Job com a mesma chave já ativo", job_id=job_id)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Já existe um job pendente ou em execução para o mesmo alvo",
+        )
+
+    if not reenfileirado:
+        log_warning("Tentativa de reexecutar job ativo ou concluído", job_id=job_id)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Só jobs com falha ou cancelados podem ser reexecutados",
+        )
+
+    db.commit()
+    db.refresh(job)
+
+    set_job_location(response, job)
+    return job
@@ -1,15 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from sqlalchemy.orm import Session
+from datetime import date, datetime
 from typing import List, Optional
 
 from app.db.database import get_db
+from app.db.filters import FILTROS_META, ORDENACAO_META, apply_filters, parse_sort
+from app.db.snapshots import finalized_error, in_open_ciclo, reject_if_finalized
+from app.db.writes import delete_returning, insert_checked, update_returning
 from app.models.colaborador import Colaborador
-from app.models.avaliacao import Meta, Ciclo
-from app.schemas.avaliacao import MetaCreate, MetaUpdate, MetaResponse
+from app.models.avaliacao import Meta, StatusCiclo
+from app.schemas.avaliacao import MetaCreate, MetaUpdate, MetaResponse, MetaLoteResponse
+from app.core.batch import fetch_in_order
+from app.core.concurrency import (
+    check_version,
+    get_if_match,
+    set_etag,
+    version_conflict,
+)
 from app.core.dependencies import get_current_active_user
+from app.core.idempotency import Idempotencia, get_idempotencia
 from app.core.logging import log_info, log_error, log_warning
+from app.core.fieldsets import parse_fields, project_query
+from app.core.serialization import list_response, partial_response
+from app.core.timing import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get("/", response_model=List[MetaResponse])
@@ -18,12 +33,34 @@ def get_metas(
     limit: int = 100,
     ciclo_id: Optional[int] = None,
     colaborador_matricula: Optional[str] = None,
+    criado_em_de: Optional[datetime] = None,
+    criado_em_ate: Optional[datetime] = None,
+    data_limite_de: Optional[date] = None,
+    data_limite_ate: Optional[date] = None,
+    resultado_min: Optional[int] = Query(None, ge=0, le=100),
+    resultado_max: Optional[int] = Query(None, ge=0, le=100),
+    ordenar: Optional[str] = Query(
+        None,
+        description="Ordenação separada por vírgula, '-' para decrescente "
+        "(ex.: -criado_em,id)",
+    ),
+    fields: Optional[str] = Query(
+        None, description="Campos a retornar, separados por vírgula (ex.: id,nome)"
+    ),
     db: Session = Depends(get_db),
     current_user: Colaborador = Depends(get_current_active_user),
 ):
     """
     Lista todas as metas com filtros opcionais
+
+    - **criado_em_de/criado_em_ate**, **data_limite_de/data_limite_ate**,
+      **resultado_min/resultado_max**: Intervalos (inclusivos)
+    - **ordenar**: id, criado_em, data_limite ou resultado_alcancado
+    - **fields**: Se informado, retorna (e busca no banco) apenas esses campos
     """
+    campos = parse_fields(fields, MetaResponse)
+    ordem = parse_sort(ordenar, ORDENACAO_META)
+
     log_info(
         "Listando metas",
         usuario=current_user.matricula,
@@ -38,11 +75,27 @@ def get_metas(
     if colaborador_matricula:
         query = query.filter(Meta.colaborador_matricula == colaborador_matricula)
 
-    metas = query.offset(skip).limit(limit).all()
+    query = apply_filters(
+        query,
+        FILTROS_META,
+        criado_em_de=criado_em_de,
+        criado_em_ate=criado_em_ate,
+        data_limite_de=data_limite_de,
+        data_limite_ate=data_limite_ate,
+        resultado_min=resultado_min,
+        resultado_max=resultado_max,
+    )
+
+    query = project_query(query, Meta, MetaResponse, campos)
+
+    metas = query.order_by(*ordem).offset(skip).limit(limit).all()
 
     log_info("Metas listadas", total=len(metas))
 
-    return metas
+    if campos:
+        return partial_response(campos, metas)
+
+    return list_response(MetaResponse, metas)
 
 
 @router.get("/minhas", response_model=List[MetaResponse])
@@ -65,12 +118,38 @@ def get_minhas_metas(
 
     log_info("Minhas metas encontradas", total=len(metas))
 
-    return metas
+    return list_response(MetaResponse, metas)
+
+
+@router.get("/lote", response_model=MetaLoteResponse)
+def get_metas_lote(
+    ids: List[int] = Query(..., description="IDs das metas"),
+    db: Session = Depends(get_db),
+    current_user: Colaborador = Depends(get_current_active_user),
+):
+    """
+    Busca várias metas por ID em uma única consulta
+
+    - **ids**: IDs das metas (ex.: ?ids=1&ids=2). A resposta mantém a ordem
+      pedida e lista em nao_encontrados os IDs inexistentes
+    """
+    log_info("Buscando metas em lote", usuario=current_user.matricula, total=len(ids))
+
+    itens, nao_encontrados = fetch_in_order(db, Meta, Meta.id, ids)
+
+    log_info(
+        "Metas em lote encontradas",
+        total=len(itens),
+        nao_encontrados=len(nao_encontrados),
+    )
+
+    return {"itens": itens, "nao_encontrados": nao_encontrados}
 
 
 @router.get("/{meta_id}", response_model=MetaResponse)
 def get_meta(
     meta_id: int,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: Colaborador = Depends(get_current_active_user),
 ):
@@ -89,6 +168,7 @@ def get_meta(
 
     log_info("Meta encontrada", meta_id=meta.id, titulo=meta.titulo)
 
+    set_etag(response, meta)
     return meta
 
 
@@ -97,6 +177,7 @@ def create_meta(
     meta: MetaCreate,
     db: Session = Depends(get_db),
     current_user: Colaborador = Depends(get_current_active_user),
+    idempotencia: Idempotencia = Depends(get_idempotencia),
 ):
     """
     Cria uma nova meta
@@ -109,37 +190,25 @@ def create_meta(
         criado_por=current_user.matricula,
     )
 
-    # Verificar se o ciclo existe
-    ciclo = db.query(Ciclo).filter(Ciclo.id == meta.ciclo_id).first()
-    if not ciclo:
-        log_warning(
-            "Tentativa de criar meta com ciclo inexistente", ciclo_id=meta.ciclo_id
-        )
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Ciclo não encontrado"
-        )
-
-    # Verificar se o colaborador existe
-    colaborador = (
-        db.query(Colaborador)
-        .filter(Colaborador.matricula == meta.colaborador_matricula)
-        .first()
-    )
-    if not colaborador:
-        log_warning(
-            "Tentativa de criar meta para colaborador inexistente",
-            matricula=meta.colaborador_matricula,
-        )
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Colaborador não encontrado"
-        )
+    reject_if_finalized(db, meta.ciclo_id)
 
-    # Criar meta
+    # Ciclo e colaborador são conferidos pelas FKs no próprio INSERT
     db_meta = Meta(**meta.dict())
-
-    db.add(db_meta)
+    insert_checked(
+        db,
+        db_meta,
+        {
+            "ciclo_id": (status.HTTP_404_NOT_FOUND, "Ciclo não encontrado"),
+            "colaborador_matricula": (
+                status.HTTP_404_NOT_FOUND,
+                "Colaborador não encontrado",
+            ),
+        },
+    )
+    idempotencia.concluir(status.HTTP_201_CREATED, MetaResponse, db_meta)
+    # Fora da sessão o objeto não expira no commit (sem refresh)
+    db.expunge(db_meta)
     db.commit()
-    db.refresh(db_meta)
 
     log_info(
         "Meta criada com sucesso",
@@ -155,33 +224,43 @@ def create_meta(
 def update_meta(
     meta_id: int,
     meta_update: MetaUpdate,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: Colaborador = Depends(get_current_active_user),
+    versao_esperada: Optional[int] = Depends(get_if_match),
 ):
     """
     Atualiza uma meta
     """
     log_info("Atualizando meta", meta_id=meta_id, atualizado_por=current_user.matricula)
 
-    meta = db.query(Meta).filter(Meta.id == meta_id).first()
-
-    if not meta:
-        log_warning("Tentativa de atualizar meta inexistente", meta_id=meta_id)
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Meta não encontrada"
-        )
-
-    # Atualizar campos
+    # Atualizar campos (um UPDATE ... RETURNING; o SELECT só no caminho de falha)
     update_data = meta_update.dict(exclude_unset=True)
+    meta = update_returning(
+        db,
+        Meta,
+        [Meta.id == meta_id, in_open_ciclo(Meta.ciclo_id)],
+        update_data,
+        versao_esperada,
+    )
 
-    for field, value in update_data.items():
-        setattr(meta, field, value)
+    if not meta:
+        atual = db.get(Meta, meta_id)
+        if not atual:
+            log_warning("Tentativa de atualizar meta inexistente", meta_id=meta_id)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Meta não encontrada"
+            )
+        if atual.ciclo.status == StatusCiclo.FINALIZADO:
+            raise finalized_error(ciclo_id=atual.ciclo_id, meta_id=meta_id)
+        check_version(atual, versao_esperada, meta_id=meta_id)
+        raise version_conflict(meta_id=meta_id)
 
     db.commit()
-    db.refresh(meta)
 
     log_info("Meta atualizada com sucesso", meta_id=meta.id, titulo=meta.titulo)
 
+    set_etag(response, meta)
     return meta
 
 
@@ -196,17 +275,21 @@ def delete_meta(
     """
     log_info("Deletando meta", meta_id=meta_id, deletado_por=current_user.matricula)
 
-    meta = db.query(Meta).filter(Meta.id == meta_id).first()
+    meta = delete_returning(
+        db, Meta, [Meta.id == meta_id, in_open_ciclo(Meta.ciclo_id)], Meta.titulo
+    )
 
     if not meta:
+        atual = db.get(Meta, meta_id)
+        if atual is not None:
+            raise finalized_error(ciclo_id=atual.ciclo_id, meta_id=meta_id)
         log_warning("Tentativa de deletar meta inexistente", meta_id=meta_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Meta não encontrada"
         )
 
-    db.delete(meta)
     db.commit()
 
-    log_info("Meta deletada com sucesso", meta_id=meta_id, titulo=meta.titulo)
+    log_info("Meta deletada com sucesso", meta_id=meta_id, titulo=meta[0])
 
     return {"message": "Meta deletada com sucesso", "meta_id": meta_id}
@@ -0,0 +1,57 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse, PlainTextResponse
+
+from app.models.colaborador import Colaborador
+from app.core.dependencies import get_current_admin_user
+from app.core.logging import log_info, log_warning
+from app.core.profiling import format_profile, get_profile_path, list_profiles
+from app.core.timing import TimedRoute
+
+router = APIRouter(route_class=TimedRoute)
+
+
+@router.get("/")
+def get_profiles(current_user: Colaborador = Depends(get_current_admin_user)):
+    """
+    Lista os perfis de requisições armazenados (mais recentes primeiro)
+    """
+    log_info("Listando perfis", usuario=current_user.matricula)
+
+    return [
+        {
+            "id": perfil.stem,
+            "criado_em": datetime.fromtimestamp(perfil.stat().st_mtime),
+            "tamanho": perfil.stat().st_size,
+        }
+        for perfil in list_profiles()
+    ]
+
+
+@router.get("/{profile_id}")
+def download_profile(
+    profile_id: str,
+    formato: str = Query(
+        "prof", pattern="^(prof|texto)$", description="prof (pstats) ou texto"
+    ),
+    current_user: Colaborador = Depends(get_current_admin_user),
+):
+    """
+    Baixa um perfil (.prof, para pstats/snakeviz) ou seu resumo em texto
+    """
+    log_info("Baixando perfil", profile_id=profile_id, usuario=current_user.matricula)
+
+    caminho = get_profile_path(profile_id)
+    if caminho is None or not caminho.is_file():
+        log_warning("Perfil não encontrado", profile_id=profile_id)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Perfil não encontrado"
+        )
+
+    if formato == "texto":
+        return PlainTextResponse(format_profile(caminho))
+
+    return FileResponse(
+        caminho, media_type="application/octet-stream", filename=caminho.name
+    )
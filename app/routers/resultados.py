@@ -1,79 +1,152 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from backend.app.db.database import get_db
-from models.colaborador import Colaborador, TipoUsuario
-from models.avaliacao import AvaliacaoComportamental, AvaliacaoEntregas, Ciclo
-from schemas.avaliacao import ResultadoFinalResponse
-from routers.auth import get_current_user
-from utils.logger import setup_logger
 
-router = APIRouter(prefix="/api/resultados", tags=["Resultados"])
-logger = setup_logger(__name__)
+from app.db.database import get_db
+from app.db.snapshots import (
+    CACHE_CONTROL_AO_VIVO,
+    CACHE_CONTROL_SNAPSHOT,
+    results_query,
+    snapshot_etag,
+    snapshot_summary,
+    summarize,
+)
+from app.models.colaborador import Colaborador
+from app.models.avaliacao import Ciclo, StatusCiclo
+from app.models.snapshot import CicloSnapshot, ResultadoCiclo
+from app.schemas.avaliacao import ResultadoCicloResponse, ResultadoColaboradorResponse
+from app.core.concurrency import etag_matches
+from app.core.dependencies import get_current_active_user
+from app.core.logging import log_info, log_warning
+from app.core.security import is_admin
+from app.core.timing import TimedRoute
 
+router = APIRouter(route_class=TimedRoute)
 
-@router.get(
-    "/colaborador/{colaborador_id}/ciclo/{ciclo_id}",
-    response_model=ResultadoFinalResponse,
-)
-def obter_resultado_final(
-    colaborador_id: int,
-    ciclo_id: int,
-    db: Session = Depends(get_db),
-    current_user: Colaborador = Depends(get_current_user),
-):
-    if current_user.who != TipoUsuario.GESTOR and current_user.id != colaborador_id:
-        raise HTTPException(status_code=403, detail="Acesso negado")
 
-    # buscar colaborador
-    colaborador = db.query(Colaborador).filter(Colaborador.id == colaborador_id).first()
-    if not colaborador:
-        raise HTTPException(status_code=404, detail="Colaborador não encontrado")
+def _servir_snapshot(request: Request, response: Response, snapshot: CicloSnapshot):
+    """
+    Cabeçalhos de cache do snapshot; retorna 304 se o cliente já tem esta
+    versão (If-None-Match)
+    """
+    headers = {"ETag": snapshot_etag(snapshot), "Cache-Control": CACHE_CONTROL_SNAPSHOT}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
+
 
-    # buscar ciclo
-    ciclo = db.query(Ciclo).filter(Ciclo.id == ciclo_id).first()
+def _buscar_ciclo(db: Session, ciclo_id: int) -> Ciclo:
+    ciclo = db.get(Ciclo, ciclo_id)
     if not ciclo:
-        raise HTTPException(status_code=404, detail="Ciclo não encontrado")
-
-    # media comportamental
-    media_comportamental = (
-        db.query(func.avg(AvaliacaoComportamental.media_final))
-        .filter(
-            AvaliacaoComportamental.colaborador_id == colaborador_id,
-            AvaliacaoComportamental.ciclo_id == ciclo_id,
+        log_warning("Ciclo não encontrado", ciclo_id=ciclo_id)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Ciclo não encontrado"
         )
-        .scalar()
+    return ciclo
+
+
+@router.get("/ciclo/{ciclo_id}", response_model=ResultadoCicloResponse)
+def get_resultado_ciclo(
+    ciclo_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: Colaborador = Depends(get_current_active_user),
+):
+    """
+    Resumo dos resultados do ciclo, geral e por departamento
+
+    Ciclo finalizado: lido do snapshot, com cache revalidado pelo ETag.
+    Demais ciclos: calculado na hora, sem cache.
+    """
+    log_info(
+        "Buscando resultado do ciclo", ciclo_id=ciclo_id, usuario=current_user.matricula
     )
 
-    # media entregas
-    media_entregas = (
-        db.query(func.avg(AvaliacaoEntregas.media_final))
-        .filter(
-            AvaliacaoEntregas.colaborador_id == colaborador_id,
-            AvaliacaoEntregas.ciclo_id == ciclo_id,
-        )
-        .scalar()
+    snapshot = db.get(CicloSnapshot, ciclo_id)
+    if snapshot:
+        nao_modificado = _servir_snapshot(request, response, snapshot)
+        if nao_modificado:
+            return nao_modificado
+        return {
+            "ciclo_id": ciclo_id,
+            "finalizado": True,
+            "gerado_em": snapshot.gerado_em,
+            **snapshot_summary(snapshot),
+        }
+
+    ciclo = _buscar_ciclo(db, ciclo_id)
+    if ciclo.status == StatusCiclo.FINALIZADO:
+        # Finalizado antes dos snapshots: gere com python -m app.db.snapshots
+        log_warning("Ciclo finalizado sem snapshot", ciclo_id=ciclo_id)
+
+    response.headers["Cache-Control"] = CACHE_CONTROL_AO_VIVO
+    return {
+        "ciclo_id": ciclo_id,
+        "finalizado": False,
+        **summarize(db, results_query(ciclo_id)),
+    }
+
+
+@router.get(
+    "/ciclo/{ciclo_id}/colaborador/{matricula}",
+    response_model=ResultadoColaboradorResponse,
+)
+def get_resultado_colaborador(
+    ciclo_id: int,
+    matricula: str,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: Colaborador = Depends(get_current_active_user),
+):
+    """
+    Resultado de um colaborador no ciclo (o próprio ou, para administradores,
+    qualquer um); mesmas regras de cache do resumo do ciclo
+    """
+    log_info(
+        "Buscando resultado do colaborador",
+        ciclo_id=ciclo_id,
+        matricula=matricula,
+        usuario=current_user.matricula,
     )
 
-    if media_comportamental is None or media_entregas is None:
+    if matricula != current_user.matricula and not is_admin(current_user.matricula):
+        log_warning(
+            "Acesso negado ao resultado de outro colaborador",
+            matricula=matricula,
+            usuario=current_user.matricula,
+        )
         raise HTTPException(
-            status_code=404,
-            detail="Avaliações não encontradas para este colaborador e ciclo",
+            status_code=status.HTTP_403_FORBIDDEN, detail="Acesso negado"
         )
 
-    # media final
-    nota_final = (media_comportamental + media_entregas) / 2
+    snapshot = db.get(CicloSnapshot, ciclo_id)
+    if snapshot:
+        resultado = db.get(ResultadoCiclo, (ciclo_id, matricula))
+    else:
+        _buscar_ciclo(db, ciclo_id)
+        linha = db.execute(
+            results_query(ciclo_id).where(Colaborador.matricula == matricula)
+        ).first()
+        resultado = {**linha._asdict(), "ciclo_id": ciclo_id} if linha else None
 
-    logger.info(
-        f"Resultado calculado para colaborador {colaborador_id}, ciclo {ciclo_id}: {nota_final}"
-    )
+    if not resultado:
+        log_warning(
+            "Resultado do colaborador não encontrado",
+            ciclo_id=ciclo_id,
+            matricula=matricula,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resultado não encontrado",
+        )
 
-    return ResultadoFinalResponse(
-        colaborador_id=colaborador_id,
-        colaborador_nome=colaborador.nome,
-        ciclo_id=ciclo_id,
-        ciclo_nome=ciclo.nome,
-        media_comportamental=round(media_comportamental, 2),
-        media_entregas=round(media_entregas, 2),
-        nota_final=round(nota_final, 2),
-    )
+    if snapshot:
+        nao_modificado = _servir_snapshot(request, response, snapshot)
+        if nao_modificado:
+            return nao_modificado
+    else:
+        response.headers["Cache-Control"] = CACHE_CONTROL_AO_VIVO
+
+    return resultado
@@ -46,6 +46,7 @@ class CicloResponse(CicloBase):
     status: StatusCiclo
     criado_em: datetime
     atualizado_em: datetime
+    versao: int
 
     class Config:
         from_attributes = True
@@ -88,11 +89,17 @@ class AvaliacaoComportamentalResponse(AvaliacaoComportamentalBase):
     status: StatusAvaliacao
     criado_em: datetime
     atualizado_em: datetime
+    versao: int
     
     class Config:
         from_attributes = True
 
 
+class AvaliacaoComportamentalLoteResponse(BaseModel):
+    itens: List[AvaliacaoComportamentalResponse]
+    nao_encontrados: List[int]
+
+
 # Meta Schemas
 class MetaBase(BaseModel):
     ciclo_id: int
@@ -123,6 +130,49 @@ class MetaResponse(MetaBase):
     comentarios_gestor: Optional[str] = None
     criado_em: datetime
     atualizado_em: datetime
+    versao: int
+
+    class Config:
+        from_attributes = True
+
+
+class MetaLoteResponse(BaseModel):
+    itens: List[MetaResponse]
+    nao_encontrados: List[int]
+
+
+# Resultado Schemas
+class ResultadoColaboradorResponse(BaseModel):
+    ciclo_id: int
+    colaborador_matricula: str
+    nome: str
+    departamento: str
+    total_avaliacoes: int
+    media_comportamental: Optional[float] = None
+    total_metas: int
+    resultado_metas: Optional[float] = None
 
     class Config:
         from_attributes = True
+
+
+class ResumoDepartamento(BaseModel):
+    departamento: str
+    total_colaboradores: int
+    total_avaliacoes: int
+    total_metas: int
+    media_comportamental: Optional[float] = None
+    resultado_metas: Optional[float] = None
+
+
+class ResultadoCicloResponse(BaseModel):
+    ciclo_id: int
+    # Com finalizado, os números vêm do snapshot gerado no fechamento
+    finalizado: bool
+    gerado_em: Optional[datetime] = None
+    total_colaboradores: int
+    total_avaliacoes: int
+    total_metas: int
+    media_comportamental: Optional[float] = None
+    resultado_metas: Optional[float] = None
+    por_departamento: List[ResumoDepartamento]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -30,11 +30,17 @@ class ColaboradorResponse(ColaboradorBase):
     ativo: bool
     criado_em: datetime
     atualizado_em: datetime
+    versao: int
 
     class Config:
         from_attributes = True
 
 
+class ColaboradorLoteResponse(BaseModel):
+    itens: List[ColaboradorResponse]
+    nao_encontrados: List[str]
+
+
 class ColaboradorLogin(BaseModel):
     matricula: str
     senha: str
@@ -0,0 +1,44 @@
+import json
+from pydantic import BaseModel, field_validator
+from typing import Any, Dict, Optional
+from datetime import datetime
+from enum import Enum
+
+
+class StatusJob(str, Enum):
+    PENDENTE = "pendente"
+    EXECUTANDO = "executando"
+    CONCLUIDO = "concluido"
+    FALHOU = "falhou"
+    CANCELADO = "cancelado"
+
+
+class JobResponse(BaseModel):
+    id: int
+    tipo: str
+    parametros: Dict[str, Any]
+    status: StatusJob
+    processados: int
+    total: Optional[int] = None
+    progresso: Optional[float] = None
+    mensagem: Optional[str] = None
+    resultado: Optional[Dict[str, Any]] = None
+    erro: Optional[str] = None
+    tentativas: int
+    max_tentativas: int
+    cancelamento_solicitado: bool
+    criado_por: Optional[str] = None
+    criado_em: datetime
+    executar_apos: datetime
+    iniciado_em: Optional[datetime] = None
+    concluido_em: Optional[datetime] = None
+    atualizado_em: datetime
+
+    @field_validator("parametros", "resultado", mode="before")
+    @classmethod
+    def carregar_json(cls, valor):
+        # Gravados como JSON em colunas Text
+        return json.loads(valor) if isinstance(valor, str) else valor
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,88 @@
+"""
+Benchmark de compressão das listagens
+
+Mede, para o JSON das listagens de colaboradores, avaliações e metas, quanto
+cada codificação economiza de bytes e quanto custa de CPU, nos níveis que o
+CompressionMiddleware aceita (COMPRESSION_GZIP_LEVEL / COMPRESSION_BROTLI_QUALITY).
+
+Uso:
+    python -m benchmarks.bench_compression --linhas 1000
+"""
+
+import argparse
+import gzip
+import time
+
+from benchmarks.bench_serialization import (
+    gerar_avaliacoes,
+    gerar_colaboradores,
+    gerar_metas,
+)
+from app.core.serialization import serialize_list
+from app.schemas.avaliacao import AvaliacaoComportamentalResponse, MetaResponse
+from app.schemas.colaborador import ColaboradorResponse
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def codecs():
+    yield "gzip-1", lambda body: gzip.compress(body, compresslevel=1)
+    yield "gzip-6", lambda body: gzip.compress(body, compresslevel=6)
+    yield "gzip-9", lambda body: gzip.compress(body, compresslevel=9)
+    if brotli is not None:
+        yield "br-1", lambda body: brotli.compress(body, quality=1)
+        yield "br-4", lambda body: brotli.compress(body, quality=4)
+        yield "br-11", lambda body: brotli.compress(body, quality=11)
+
+
+def medir_cpu(func, body: bytes, repeticoes: int):
+    resultado = func(body)
+    inicio = time.process_time()
+    for _ in range(repeticoes):
+        func(body)
+    return resultado, (time.process_time() - inicio) / repeticoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas", type=int, default=1000)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+
+    casos = [
+        (
+            "colaboradores",
+            serialize_list(ColaboradorResponse, gerar_colaboradores(args.linhas)),
+        ),
+        (
+            "avaliacoes",
+            serialize_list(
+                AvaliacaoComportamentalResponse, gerar_avaliacoes(args.linhas)
+            ),
+        ),
+        ("metas", serialize_list(MetaResponse, gerar_metas(args.linhas))),
+    ]
+
+    if brotli is None:
+        print("brotli não instalado: medindo apenas gzip\n")
+
+    print(
+        f"{'entidade':<15}{'codec':<8}{'original':>10}{'final':>10}"
+        f"{'economia':>10}{'cpu ms':>9}{'MB/s':>8}"
+    )
+    for nome, body in casos:
+        for codec, func in codecs():
+            comprimido, segundos = medir_cpu(func, body, args.repeticoes)
+            economia = 1 - len(comprimido) / len(body)
+            vazao = len(body) / segundos / 1e6 if segundos else float("inf")
+            print(
+                f"{nome:<15}{codec:<8}{len(body):>10}{len(comprimido):>10}"
+                f"{economia:>10.1%}{segundos * 1e3:>9.2f}{vazao:>8.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
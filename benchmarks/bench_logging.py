@@ -0,0 +1,115 @@
+"""
+Benchmark de volume e CPU dos logs
+
+Simula o mix de eventos que os routers registram por requisição (listagens,
+buscas por ID e criações) e mede, para cada modo de log, bytes gravados e CPU
+total (thread da requisição + listener):
+
+- texto: formato "mensagem | chave=valor" (padrão)
+- json: LOG_JSON=True
+- json+amostragem: LOG_JSON=True com LOG_SAMPLE_RATES nos eventos de leitura
+
+Uso:
+    python -m benchmarks.bench_logging --requisicoes 20000 --taxa 0.05
+"""
+
+import argparse
+import logging
+import os
+import random
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+# Fila sem limite: o benchmark mede custo, não descarte
+os.environ.setdefault("LOG_QUEUE_SIZE", "0")
+
+from app.core import logging as app_logging  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.logging import log_info, log_queue, queue_listener  # noqa: E402
+
+EVENTOS_LEITURA = [
+    "Listando avaliações",
+    "Avaliações listadas",
+    "Buscando colaborador por matrícula",
+    "Colaborador encontrado",
+]
+
+
+def requisicao_listagem(i):
+    log_info(
+        "Listando avaliações",
+        usuario=f"M{i % 1000:06d}",
+        ciclo_id=1,
+        avaliado=None,
+        avaliador=None,
+        status=None,
+    )
+    log_info("Avaliações listadas", total=100)
+
+
+def requisicao_busca(i):
+    log_info(
+        "Buscando colaborador por matrícula",
+        matricula=f"M{i % 1000:06d}",
+        usuario="admin",
+    )
+    log_info("Colaborador encontrado", matricula=f"M{i % 1000:06d}", nome="Fulano")
+
+
+def requisicao_criacao(i):
+    log_info("Criando nova meta", colaborador=f"M{i % 1000:06d}", ciclo_id=1)
+    log_info("Meta criada com sucesso", meta_id=i, titulo="Meta")
+
+
+def executar(modo: str, requisicoes: int, destino: str):
+    handler = logging.FileHandler(destino, encoding="utf-8")
+    handler.setFormatter(app_logging.build_formatter())
+    queue_listener.handlers = (handler,)
+
+    sorteio = random.Random(42)
+    inicio_cpu = time.process_time()
+    inicio = time.perf_counter()
+    for i in range(requisicoes):
+        tipo = sorteio.random()
+        if tipo < 0.80:
+            requisicao_listagem(i)
+        elif tipo < 0.95:
+            requisicao_busca(i)
+        else:
+            requisicao_criacao(i)
+    chamada = time.perf_counter() - inicio
+    log_queue.join()
+    cpu = time.process_time() - inicio_cpu
+    handler.close()
+
+    tamanho = os.path.getsize(destino)
+    print(
+        f"{modo:<18}{tamanho / 1e6:>10.2f}{tamanho / requisicoes:>10.0f}"
+        f"{cpu / requisicoes * 1e6:>12.1f}{chamada / requisicoes * 1e6:>12.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requisicoes", type=int, default=20000)
+    parser.add_argument("--taxa", type=float, default=0.05)
+    args = parser.parse_args()
+
+    modos = [
+        ("texto", False, {}),
+        ("json", True, {}),
+        ("json+amostragem", True, {evento: args.taxa for evento in EVENTOS_LEITURA}),
+    ]
+
+    print(f"{'modo':<18}{'MB':>10}{'B/req':>10}{'cpu us/req':>12}{'req us/req':>12}")
+    with tempfile.TemporaryDirectory() as diretorio:
+        for modo, json_ativo, taxas in modos:
+            settings.LOG_JSON = json_ativo
+            settings.LOG_SAMPLE_RATES = taxas
+            executar(modo, args.requisicoes, os.path.join(diretorio, f"{modo}.log"))
+
+
+if __name__ == "__main__":
+    main()
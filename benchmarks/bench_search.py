@@ -0,0 +1,94 @@
+"""
+Benchmark da busca de colaboradores
+
+Carrega N colaboradores sintéticos (app.db.seed) em um banco novo e mede a
+latência de search_colaboradores para termos comuns, com o índice de busca
+(FTS5 no SQLite, tsvector/pg_trgm no PostgreSQL) e com o fallback em LIKE.
+
+Uso:
+    python -m benchmarks.bench_search --colaboradores 100000
+    python -m benchmarks.bench_search --database-url postgresql://...
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.db import search  # noqa: E402
+from app.db.database import Base  # noqa: E402
+from app.db.seed import BulkWriter, GeradorOrganizacao  # noqa: E402
+from app.models.colaborador import Colaborador  # noqa: E402
+from benchmarks.load import percentil  # noqa: E402
+
+TERMOS = ["ana", "silva", "joao sil", "analista", "tecnologia coord", "mar"]
+
+
+def carregar(engine, colaboradores: int, lote: int = 5000):
+    gerador = GeradorOrganizacao(colaboradores)
+    writer = BulkWriter(engine)
+    tabela = Colaborador.__table__
+    linhas = []
+    for i in range(colaboradores):
+        linhas.append(gerador.colaborador(i, "x"))
+        if len(linhas) >= lote:
+            writer.gravar(tabela, linhas, ignorar_conflitos=False)
+            linhas = []
+    writer.gravar(tabela, linhas, ignorar_conflitos=False)
+
+
+def medir(session_factory, termo: str, repeticoes: int):
+    tempos = []
+    db = session_factory()
+    try:
+        total = len(search.search_colaboradores(db, termo))
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            search.search_colaboradores(db, termo)
+            tempos.append((time.perf_counter() - inicio) * 1000)
+    finally:
+        db.close()
+    tempos.sort()
+    return total, percentil(tempos, 50), percentil(tempos, 95)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", help="Padrão: SQLite temporário")
+    parser.add_argument("--colaboradores", type=int, default=100000)
+    parser.add_argument("--repeticoes", type=int, default=50)
+    args = parser.parse_args()
+
+    diretorio = tempfile.TemporaryDirectory()
+    url = args.database_url or f"sqlite:///{diretorio.name}/busca.db"
+    engine = create_engine(url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    inicio = time.perf_counter()
+    carregar(engine, args.colaboradores)
+    print(
+        f"{args.colaboradores} colaboradores carregados em "
+        f"{time.perf_counter() - inicio:.1f}s ({engine.dialect.name})\n"
+    )
+
+    session_factory = sessionmaker(bind=engine)
+    print(f"{'modo':<10}{'termo':<20}{'total':>7}{'p50 ms':>9}{'p95 ms':>9}")
+    for modo, indexado in (("indice", True), ("like", False)):
+        search._disponivel[engine] = indexado
+        for termo in TERMOS:
+            total, p50, p95 = medir(session_factory, termo, args.repeticoes)
+            print(f"{modo:<10}{termo:<20}{total:>7}{p50:>9.2f}{p95:>9.2f}")
+
+    engine.dispose()
+    diretorio.cleanup()
+
+
+if __name__ == "__main__":
+    main()
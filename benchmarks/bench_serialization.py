@@ -0,0 +1,154 @@
+"""
+Benchmark de serialização das listagens
+
+Compara o custo por linha de três caminhos para List[...Response]:
+
+- padrao: response_model do FastAPI (validate + serialize) + JSONResponse (json stdlib)
+- orjson: response_model do FastAPI + ORJSONResponse
+- rapido: app.core.serialization.serialize_list (TypeAdapter em cache)
+
+Uso:
+    python -m benchmarks.bench_serialization --linhas 1000 --repeticoes 50
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from datetime import date, datetime
+from typing import List
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+
+from app.core.serialization import serialize_list  # noqa: E402
+from app.models.avaliacao import (  # noqa: E402
+    AvaliacaoComportamental,
+    Meta,
+    StatusAvaliacao,
+    TipoAvaliacao,
+)
+from app.models.colaborador import Colaborador  # noqa: E402
+from app.schemas.avaliacao import (
+    AvaliacaoComportamentalResponse,
+    MetaResponse,
+)  # noqa: E402
+from app.schemas.colaborador import ColaboradorResponse  # noqa: E402
+
+
+def gerar_colaboradores(n: int):
+    agora = datetime.utcnow()
+    return [
+        Colaborador(
+            id=i,
+            matricula=f"M{i:06d}",
+            nome=f"Colaborador {i}",
+            email=f"colaborador{i}@itau.com.br",
+            senha_hash="x" * 60,
+            cargo="Analista",
+            departamento="Tecnologia",
+            gestor_matricula="admin",
+            ativo=True,
+            criado_em=agora,
+            atualizado_em=agora,
+            versao=1,
+        )
+        for i in range(n)
+    ]
+
+
+def gerar_avaliacoes(n: int):
+    agora = datetime.utcnow()
+    return [
+        AvaliacaoComportamental(
+            id=i,
+            ciclo_id=1,
+            avaliado_matricula=f"M{i:06d}",
+            avaliador_matricula="admin",
+            tipo_avaliacao=TipoAvaliacao.AVALIACAO_GESTOR,
+            lideranca=4,
+            comunicacao=5,
+            trabalho_equipe=4,
+            resolucao_problemas=3,
+            adaptabilidade=4,
+            media_competencias=4.0,
+            comentarios="Bom desempenho no ciclo",
+            status=StatusAvaliacao.PENDENTE,
+            criado_em=agora,
+            atualizado_em=agora,
+            versao=1,
+        )
+        for i in range(n)
+    ]
+
+
+def gerar_metas(n: int):
+    agora = datetime.utcnow()
+    return [
+        Meta(
+            id=i,
+            ciclo_id=1,
+            colaborador_matricula=f"M{i:06d}",
+            titulo=f"Meta {i}",
+            descricao="Entregar o projeto dentro do prazo",
+            peso=30,
+            data_limite=date(2025, 6, 30),
+            resultado_alcancado=80,
+            comentarios_gestor=None,
+            criado_em=agora,
+            atualizado_em=agora,
+            versao=1,
+        )
+        for i in range(n)
+    ]
+
+
+def caminho_fastapi(field, rows, response_class):
+    content = asyncio.run(serialize_response(field=field, response_content=rows))
+    return response_class(content).body
+
+
+def medir(func, repeticoes: int) -> float:
+    func()  # aquecimento
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        func()
+    return (time.perf_counter() - inicio) / repeticoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas", type=int, default=1000)
+    parser.add_argument("--repeticoes", type=int, default=50)
+    args = parser.parse_args()
+
+    casos = [
+        ("colaboradores", ColaboradorResponse, gerar_colaboradores(args.linhas)),
+        ("avaliacoes", AvaliacaoComportamentalResponse, gerar_avaliacoes(args.linhas)),
+        ("metas", MetaResponse, gerar_metas(args.linhas)),
+    ]
+
+    print(f"{'entidade':<15}{'caminho':<10}{'us/linha':>10}{'ms/lista':>10}")
+    for nome, schema, rows in casos:
+        field = create_model_field(
+            name="Response", type_=List[schema], mode="serialization"
+        )
+        caminhos = {
+            "padrao": lambda: caminho_fastapi(field, rows, JSONResponse),
+            "orjson": lambda: caminho_fastapi(field, rows, ORJSONResponse),
+            "rapido": lambda: serialize_list(schema, rows),
+        }
+        for caminho, func in caminhos.items():
+            segundos = medir(func, args.repeticoes)
+            print(
+                f"{nome:<15}{caminho:<10}"
+                f"{segundos / args.linhas * 1e6:>10.2f}{segundos * 1e3:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Benchmark de round trips nas escritas
+
+Conta, por operação de escrita (atualizar e remover uma meta), as idas ao
+banco (statements executados + commit) e mede o tempo médio em três modos:
+
+- legado: SELECT, UPDATE/DELETE pelo ORM e refresh após o commit
+- fallback: app.db.writes com DB_WRITE_RETURNING=False (SELECT + UPDATE)
+- returning: app.db.writes com UPDATE/DELETE ... RETURNING
+
+Uso:
+    python -m benchmarks.bench_writes --repeticoes 500
+    python -m benchmarks.bench_writes --database-url postgresql://...
+"""
+
+import argparse
+import os
+import time
+from datetime import date
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.db.database import Base  # noqa: E402
+from app.db.writes import delete_returning, update_returning  # noqa: E402
+from app.models.avaliacao import Ciclo, Meta  # noqa: E402
+from app.models.colaborador import Colaborador  # noqa: E402
+
+
+class Contador:
+    """Statements e commits emitidos pelo engine"""
+
+    def __init__(self, engine):
+        self.idas = 0
+        event.listen(engine, "before_cursor_execute", self._contar)
+        event.listen(engine, "commit", self._contar)
+
+    def _contar(self, *args, **kwargs):
+        self.idas += 1
+
+
+def preparar(session_factory):
+    db = session_factory()
+    colaborador = Colaborador(
+        matricula="B000001",
+        nome="Benchmark",
+        email="benchmark@empresa.com",
+        senha_hash="x",
+        cargo="Analista",
+        departamento="TI",
+    )
+    ciclo = Ciclo(ano=2099, data_inicio=date(2099, 1, 1), data_fim=date(2099, 12, 31))
+    db.add_all([colaborador, ciclo])
+    db.commit()
+    ciclo_id = ciclo.id
+    db.close()
+    return ciclo_id
+
+
+def criar_meta(session_factory, ciclo_id: int) -> int:
+    db = session_factory()
+    meta = Meta(
+        ciclo_id=ciclo_id,
+        colaborador_matricula="B000001",
+        titulo="Meta",
+        peso=10,
+        data_limite=date(2099, 12, 31),
+    )
+    db.add(meta)
+    db.commit()
+    meta_id = meta.id
+    db.close()
+    return meta_id
+
+
+def atualizar_legado(db, meta_id: int, i: int):
+    meta = db.query(Meta).filter(Meta.id == meta_id).first()
+    meta.titulo = f"Meta {i}"
+    db.commit()
+    db.refresh(meta)
+    return meta.titulo
+
+
+def atualizar(db, meta_id: int, i: int):
+    meta = update_returning(db, Meta, [Meta.id == meta_id], {"titulo": f"Meta {i}"})
+    db.commit()
+    return meta.titulo
+
+
+def remover_legado(db, meta_id: int):
+    meta = db.query(Meta).filter(Meta.id == meta_id).first()
+    titulo = meta.titulo
+    db.delete(meta)
+    db.commit()
+    return titulo
+
+
+def remover(db, meta_id: int):
+    meta = delete_returning(db, Meta, [Meta.id == meta_id], Meta.titulo)
+    db.commit()
+    return meta[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default="sqlite:///:memory:")
+    parser.add_argument("--repeticoes", type=int, default=500)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+    contador = Contador(engine)
+    ciclo_id = preparar(session_factory)
+
+    modos = [
+        ("legado", True, atualizar_legado, remover_legado),
+        ("fallback", False, atualizar, remover),
+        ("returning", True, atualizar, remover),
+    ]
+
+    print(f"dialeto: {engine.dialect.name}\n")
+    print(f"{'modo':<12}{'operacao':<12}{'idas':>8}{'ms':>10}")
+    for modo, returning, atualizar_meta, remover_meta in modos:
+        settings.DB_WRITE_RETURNING = returning
+
+        meta_id = criar_meta(session_factory, ciclo_id)
+        contador.idas = 0
+        duracao = 0.0
+        for i in range(args.repeticoes):
+            db = session_factory()
+            inicio = time.perf_counter()
+            atualizar_meta(db, meta_id, i)
+            duracao += time.perf_counter() - inicio
+            db.close()
+        print(
+            f"{modo:<12}{'atualizar':<12}{contador.idas / args.repeticoes:>8.1f}"
+            f"{duracao / args.repeticoes * 1e3:>10.3f}"
+        )
+
+        metas = [criar_meta(session_factory, ciclo_id) for _ in range(args.repeticoes)]
+        contador.idas = 0
+        duracao = 0.0
+        for meta_id in metas:
+            db = session_factory()
+            inicio = time.perf_counter()
+            remover_meta(db, meta_id)
+            duracao += time.perf_counter() - inicio
+            db.close()
+        print(
+            f"{modo:<12}{'remover':<12}{contador.idas / args.repeticoes:>8.1f}"
+            f"{duracao / args.repeticoes * 1e3:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Compara dois resultados do benchmark de carga (benchmarks.load)
+
+Mostra, por operação, a variação de p50/p95/p99 e throughput entre o
+resultado base e o novo, e sai com código 1 se alguma operação piorou o p95
+além da tolerância, para uso em CI.
+
+Uso:
+    python -m benchmarks.compare benchmarks/results/base.json \\
+        benchmarks/results/novo.json --tolerancia 10
+"""
+
+import argparse
+import json
+import sys
+
+
+def variacao(base: float, novo: float) -> float:
+    if not base:
+        return 0.0
+    return (novo - base) / base * 100
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("base")
+    parser.add_argument("novo")
+    parser.add_argument(
+        "--tolerancia", type=float, default=10, help="Piora máxima do p95 (%%)"
+    )
+    args = parser.parse_args()
+
+    with open(args.base, encoding="utf-8") as arquivo:
+        base = json.load(arquivo)
+    with open(args.novo, encoding="utf-8") as arquivo:
+        novo = json.load(arquivo)
+
+    print(f"base: {base['commit'][:8]}  novo: {novo['commit'][:8]}\n")
+    print(f"{'operacao':<28}{'p50':>9}{'p95':>9}{'p99':>9}{'rps':>9}")
+
+    regressoes = []
+    for operacao, atual in novo["operacoes"].items():
+        anterior = base["operacoes"].get(operacao)
+        if anterior is None:
+            continue
+        deltas = [
+            variacao(anterior[chave], atual[chave])
+            for chave in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps")
+        ]
+        print(f"{operacao:<28}" + "".join(f"{delta:>+8.1f}%" for delta in deltas))
+        if deltas[1] > args.tolerancia:
+            regressoes.append(operacao)
+
+    if regressoes:
+        print(f"\np95 piorou mais de {args.tolerancia}% em: {', '.join(regressoes)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
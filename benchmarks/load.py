@@ -0,0 +1,336 @@
+"""
+Benchmark de carga com um mix de tráfego sobre a organização sintética
+
+Executa, com N usuários virtuais em paralelo, um mix ponderado de operações
+(login, listagens, /minhas, /pendentes e criação de metas) contra a aplicação
+em processo (TestClient, usando --database-url) ou contra um servidor já no
+ar (--base-url). Ao final imprime e grava em JSON, por operação, p50/p95/p99,
+média, erros e throughput, junto com o commit e a configuração usados, para
+comparar commits com benchmarks.compare.
+
+Uso (banco gerado antes com app.db.seed):
+    python -m benchmarks.load --database-url sqlite:///./benchmark.db \\
+        --usuarios 8 --duracao 30
+    python -m benchmarks.load --base-url http://localhost:8000 --duracao 60 \\
+        --mix login=1,avaliacoes_minhas=30,avaliacoes_pendentes=30,criar_meta=5
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import threading
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+MIX_PADRAO = {
+    "login": 2,
+    "avaliacoes_minhas": 25,
+    "avaliacoes_pendentes": 25,
+    "metas_minhas": 15,
+    "avaliacoes_listagem": 10,
+    "colaboradores_listagem": 5,
+    "colaboradores_subordinados": 8,
+    "criar_meta": 10,
+}
+
+
+def percentil(valores: List[float], p: float) -> float:
+    """Percentil por posição mais próxima (valores já ordenados)"""
+    if not valores:
+        return 0.0
+    posicao = max(0, min(len(valores) - 1, round(p / 100 * len(valores)) - 1))
+    return valores[posicao]
+
+
+def parse_mix(texto: str) -> Dict[str, int]:
+    mix = {}
+    for item in texto.split(","):
+        nome, _, peso = item.partition("=")
+        if nome.strip() not in MIX_PADRAO:
+            raise SystemExit(f"Operação desconhecida no mix: {nome}")
+        mix[nome.strip()] = int(peso)
+    return mix
+
+
+def git_commit() -> Dict[str, object]:
+    def git(*args):
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, check=False
+        ).stdout.strip()
+
+    return {"commit": git("rev-parse", "HEAD"), "sujo": bool(git("status", "-s"))}
+
+
+class UsuarioVirtual:
+    """Um colaborador logado executando operações do mix"""
+
+    def __init__(self, client, matricula: str, senha: str, ciclo_id: int):
+        self.client = client
+        self.matricula = matricula
+        self.senha = senha
+        self.ciclo_id = ciclo_id
+        self.headers = {}
+
+    def login(self):
+        response = self.client.post(
+            "/api/auth/login", json={"matricula": self.matricula, "senha": self.senha}
+        )
+        if response.status_code == 200:
+            self.headers = {
+                "Authorization": f"Bearer {response.json()['access_token']}"
+            }
+        return response
+
+    def avaliacoes_minhas(self):
+        return self.client.get("/api/avaliacoes/minhas", headers=self.headers)
+
+    def avaliacoes_pendentes(self):
+        return self.client.get("/api/avaliacoes/pendentes", headers=self.headers)
+
+    def metas_minhas(self):
+        return self.client.get("/api/metas/minhas", headers=self.headers)
+
+    def avaliacoes_listagem(self):
+        return self.client.get(
+            "/api/avaliacoes/",
+            params={"avaliador_matricula": self.matricula, "limit": 50},
+            headers=self.headers,
+        )
+
+    def colaboradores_listagem(self):
+        return self.client.get(
+            "/api/colaboradores/", params={"limit": 50}, headers=self.headers
+        )
+
+    def colaboradores_subordinados(self):
+        return self.client.get(
+            f"/api/colaboradores/{self.matricula}/subordinados", headers=self.headers
+        )
+
+    def criar_meta(self):
+        return self.client.post(
+            "/api/metas/",
+            json={
+                "ciclo_id": self.ciclo_id,
+                "colaborador_matricula": self.matricula,
+                "titulo": "Meta criada pelo benchmark de carga",
+                "descricao": "Reduzir o tempo médio de atendimento",
+                "peso": 20,
+                "data_limite": date(2025, 12, 31).isoformat(),
+            },
+            headers=self.headers,
+        )
+
+
+class Resultados:
+    """Latências (segundos) e erros por operação, coletados pelas threads"""
+
+    def __init__(self):
+        self.latencias: Dict[str, List[float]] = {}
+        self.erros: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, operacao: str, segundos: float, sucesso: bool):
+        with self._lock:
+            self.latencias.setdefault(operacao, []).append(segundos)
+            if not sucesso:
+                self.erros[operacao] = self.erros.get(operacao, 0) + 1
+
+    def resumo(self, duracao: float) -> Dict[str, Dict[str, float]]:
+        resumo = {}
+        todas = []
+        for operacao, latencias in sorted(self.latencias.items()):
+            todas.extend(latencias)
+            resumo[operacao] = self._estatisticas(
+                latencias, self.erros.get(operacao, 0), duracao
+            )
+        resumo["total"] = self._estatisticas(todas, sum(self.erros.values()), duracao)
+        return resumo
+
+    @staticmethod
+    def _estatisticas(latencias, erros, duracao):
+        ordenadas = sorted(latencias)
+        return {
+            "requisicoes": len(ordenadas),
+            "erros": erros,
+            "throughput_rps": round(len(ordenadas) / duracao, 2) if duracao else 0,
+            "media_ms": (
+                round(sum(ordenadas) / len(ordenadas) * 1000, 2) if ordenadas else 0
+            ),
+            "p50_ms": round(percentil(ordenadas, 50) * 1000, 2),
+            "p95_ms": round(percentil(ordenadas, 95) * 1000, 2),
+            "p99_ms": round(percentil(ordenadas, 99) * 1000, 2),
+            "max_ms": round(ordenadas[-1] * 1000, 2) if ordenadas else 0,
+        }
+
+
+def executar_usuario(
+    criar_cliente: Callable,
+    matricula: str,
+    args,
+    mix: Dict[str, int],
+    resultados: Resultados,
+    inicio_medicao: float,
+    fim: float,
+    semente: int,
+):
+    sorteio = random.Random(semente)
+    operacoes = list(mix)
+    pesos = [mix[operacao] for operacao in operacoes]
+
+    with criar_cliente() as client:
+        usuario = UsuarioVirtual(client, matricula, args.senha, args.ciclo_id)
+        if usuario.login().status_code != 200:
+            resultados.registrar("login", 0.0, False)
+            return
+
+        while time.perf_counter() < fim:
+            operacao = sorteio.choices(operacoes, pesos)[0]
+            inicio = time.perf_counter()
+            try:
+                sucesso = getattr(usuario, operacao)().status_code < 400
+            except Exception:
+                sucesso = False
+            if inicio >= inicio_medicao:
+                resultados.registrar(operacao, time.perf_counter() - inicio, sucesso)
+
+
+def escolher_matriculas(database_url: str, quantidade: int, semente: int):
+    """
+    Sorteia colaboradores com subordinados (gestores) e sem (folhas), para
+    que /pendentes e /subordinados tenham dados
+    """
+    from sqlalchemy import create_engine, text
+
+    engine = create_engine(database_url)
+    with engine.connect() as conn:
+        gestores = (
+            conn.execute(
+                text(
+                    "SELECT DISTINCT gestor_matricula FROM colaboradores "
+                    "WHERE gestor_matricula IS NOT NULL"
+                )
+            )
+            .scalars()
+            .all()
+        )
+        todos = (
+            conn.execute(text("SELECT matricula FROM colaboradores")).scalars().all()
+        )
+    engine.dispose()
+
+    sorteio = random.Random(semente)
+    metade = quantidade // 2
+    escolhidos = sorteio.sample(sorted(gestores), min(metade, len(gestores)))
+    restantes = sorted(set(todos) - set(escolhidos))
+    escolhidos += sorteio.sample(
+        restantes, min(quantidade - len(escolhidos), len(restantes))
+    )
+    return escolhidos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default="sqlite:///./benchmark.db")
+    parser.add_argument("--base-url", help="Servidor já no ar (em vez do TestClient)")
+    parser.add_argument("--usuarios", type=int, default=8)
+    parser.add_argument("--duracao", type=float, default=30)
+    parser.add_argument("--aquecimento", type=float, default=5)
+    parser.add_argument("--mix", help="Pesos: login=2,avaliacoes_minhas=25,...")
+    parser.add_argument("--senha", default="senha123")
+    parser.add_argument("--ciclo-id", type=int, default=1)
+    parser.add_argument("--matriculas", help="Matrículas separadas por vírgula")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", default="benchmarks/results")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix) if args.mix else dict(MIX_PADRAO)
+
+    if args.matriculas:
+        matriculas = args.matriculas.split(",")
+    else:
+        matriculas = escolher_matriculas(args.database_url, args.usuarios, args.semente)
+
+    if args.base_url:
+        import httpx
+
+        def criar_cliente():
+            return httpx.Client(base_url=args.base_url, timeout=60)
+
+        alvo = args.base_url
+    else:
+        os.environ["DATABASE_URL"] = args.database_url
+        os.environ.setdefault("SECRET_KEY", "benchmark")
+        from fastapi.testclient import TestClient
+
+        from app.main import app
+
+        def criar_cliente():
+            return TestClient(app)
+
+        alvo = args.database_url.split("://")[0]
+
+    resultados = Resultados()
+    agora = time.perf_counter()
+    inicio_medicao = agora + args.aquecimento
+    fim = inicio_medicao + args.duracao
+
+    threads = [
+        threading.Thread(
+            target=executar_usuario,
+            args=(
+                criar_cliente,
+                matriculas[i % len(matriculas)],
+                args,
+                mix,
+                resultados,
+                inicio_medicao,
+                fim,
+                args.semente + i,
+            ),
+        )
+        for i in range(args.usuarios)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    resumo = resultados.resumo(args.duracao)
+    relatorio = {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        **git_commit(),
+        "alvo": alvo,
+        "python": platform.python_version(),
+        "usuarios": args.usuarios,
+        "duracao_s": args.duracao,
+        "mix": mix,
+        "operacoes": resumo,
+    }
+
+    print(
+        f"{'operacao':<28}{'req':>8}{'erros':>7}{'rps':>9}"
+        f"{'p50':>9}{'p95':>9}{'p99':>9}"
+    )
+    for operacao, estatisticas in resumo.items():
+        print(
+            f"{operacao:<28}{estatisticas['requisicoes']:>8}{estatisticas['erros']:>7}"
+            f"{estatisticas['throughput_rps']:>9.1f}{estatisticas['p50_ms']:>9.1f}"
+            f"{estatisticas['p95_ms']:>9.1f}{estatisticas['p99_ms']:>9.1f}"
+        )
+
+    diretorio = Path(args.saida)
+    diretorio.mkdir(parents=True, exist_ok=True)
+    commit = (relatorio["commit"] or "sem-git")[:8]
+    destino = diretorio / f"carga_{datetime.now():%Y%m%d-%H%M%S}_{commit}.json"
+    destino.write_text(json.dumps(relatorio, indent=2, ensure_ascii=False))
+    print(f"\nResultados gravados em {destino}")
+
+
+if __name__ == "__main__":
+    main()
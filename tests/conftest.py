@@ -1,3 +1,13 @@
+import os
+import tempfile
+
+# Logs dos testes fora do diretório logs/ do repositório (antes de importar o app)
+os.environ["LOG_DIR"] = tempfile.mkdtemp(prefix="avalia-logs-")
+# O startup do app não busca jobs nem aquece usando o DATABASE_URL real: os
+# testes que precisam ligam cada um contra o banco de teste
+os.environ["JOBS_WORKERS"] = "0"
+os.environ["WARMUP_ENABLED"] = "False"
+
 import pytest
 from datetime import date
 from fastapi.testclient import TestClient
@@ -6,7 +16,10 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.main import app
-from app.db.database import Base, get_db
+from app.core.cache_bus import clear_caches
+from app.core.config import settings
+from app.core.jobs import job_runner
+from app.db.database import Base, enable_sqlite_foreign_keys, get_db
 from app.models.colaborador import Colaborador
 from app.models.avaliacao import Ciclo, AvaliacaoComportamental, Meta
 from app.core.security import get_password_hash
@@ -19,6 +32,7 @@ engine = create_engine(
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
+enable_sqlite_foreign_keys(engine)
 
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -29,6 +43,8 @@ def db_session():
     Cria uma sessão de banco de dados para cada teste
     """
     Base.metadata.create_all(bind=engine)
+    # Os caches do processo não podem guardar dados do banco do teste anterior
+    clear_caches()
     session = TestingSessionLocal()
     try:
         yield session
@@ -57,6 +73,15 @@ def client(db_session):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def jobs_inline(client, monkeypatch):
+    """Jobs executados na própria thread, no banco de teste"""
+    monkeypatch.setattr(settings, "JOBS_INLINE", True)
+    job_runner.start(TestingSessionLocal)
+    yield job_runner
+    job_runner.stop()
+
+
 @pytest.fixture(scope="function")
 def admin_user(db_session):
     """
@@ -158,3 +158,35 @@ def test_delete_avaliacao(client, admin_token, db_session, ciclo_ativo, regular_
     )
 
     assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.unit
+def test_get_avaliacoes_lote(client, admin_token, avaliacao_sample):
+    """
+    Testa busca de avaliações em lote
+    """
+    response = client.get(
+        f"/api/avaliacoes/lote?ids={avaliacao_sample.id}&ids=9999",
+        headers=get_auth_headers(admin_token),
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [item["id"] for item in data["itens"]] == [avaliacao_sample.id]
+    assert data["nao_encontrados"] == [9999]
+
+
+@pytest.mark.unit
+def test_get_avaliacoes_lote_limit(client, admin_token, monkeypatch):
+    """
+    Testa o limite de IDs por requisição em lote
+    """
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "BATCH_MAX_IDS", 2)
+
+    response = client.get(
+        "/api/avaliacoes/lote?ids=1&ids=2&ids=3", headers=get_auth_headers(admin_token)
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
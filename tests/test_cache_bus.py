@@ -0,0 +1,158 @@
+import json
+import socket
+import time
+
+import pytest
+from fastapi import status
+
+from app.core.cache_bus import (
+    TTLCache,
+    UnixSocketBackend,
+    evict,
+    invalidate_on_commit,
+    register_cache,
+)
+from app.models.avaliacao import Ciclo
+from tests.conftest import get_auth_headers
+
+
+def aguardar(condicao, timeout=2.0):
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        if condicao():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.mark.unit
+def test_ttl_cache_expires():
+    """
+    Testa que os itens expiram após o TTL
+    """
+    cache = TTLCache("teste_ttl", ttl=0.05)
+    cache.set("chave", 1)
+
+    assert cache.get("chave") == (True, 1)
+    time.sleep(0.06)
+    assert cache.get("chave") == (False, None)
+
+
+@pytest.mark.unit
+def test_value_loaded_before_invalidation_is_not_stored():
+    """
+    Testa que um valor lido antes de uma invalidação não fica em cache
+    """
+    cache = TTLCache("teste_geracao", ttl=30)
+
+    def carregar():
+        cache.invalidate("chave")
+        return "antigo"
+
+    assert cache.get_or_load("chave", carregar) == "antigo"
+    assert cache.get("chave") == (False, None)
+
+
+@pytest.mark.unit
+def test_invalidation_published_only_after_commit(db_session):
+    """
+    Testa que a invalidação só acontece no commit (e não no rollback)
+    """
+    cache = register_cache("teste_commit")
+    cache.set("chave", "valor")
+
+    invalidate_on_commit(db_session, "teste_commit:chave")
+    db_session.rollback()
+    assert cache.get("chave") == (True, "valor")
+
+    invalidate_on_commit(db_session, "teste_commit:chave")
+    assert cache.get("chave") == (True, "valor")
+    db_session.commit()
+    assert cache.get("chave") == (False, None)
+
+
+@pytest.mark.unit
+def test_ciclo_ativo_cache_invalidated_on_update(client, admin_token, ciclo_ativo):
+    """
+    Testa que o ciclo ativo em cache é atualizado após um PUT
+    """
+    headers = get_auth_headers(admin_token)
+
+    response = client.get("/api/ciclos/ativo", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+
+    response = client.put(
+        f"/api/ciclos/{ciclo_ativo.id}",
+        json={"descricao": "Descrição revisada"},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    response = client.get("/api/ciclos/ativo", headers=headers)
+    assert response.json()["descricao"] == "Descrição revisada"
+
+
+@pytest.mark.unit
+def test_ciclo_ativo_served_from_cache(client, admin_token, ciclo_ativo, db_session):
+    """
+    Testa que a segunda leitura do ciclo ativo não consulta o banco
+    """
+    headers = get_auth_headers(admin_token)
+    original = client.get("/api/ciclos/ativo", headers=headers).json()["descricao"]
+
+    # Alteração direta no banco, sem invalidação: o cache ainda responde
+    db_session.query(Ciclo).filter(Ciclo.id == ciclo_ativo.id).update(
+        {"descricao": "Alterado por fora"}
+    )
+    db_session.commit()
+
+    response = client.get("/api/ciclos/ativo", headers=headers)
+    assert response.json()["descricao"] == original
+
+    evict(["ciclos"])
+    response = client.get("/api/ciclos/ativo", headers=headers)
+    assert response.json()["descricao"] == "Alterado por fora"
+
+
+@pytest.mark.unit
+def test_unix_socket_backend_delivers_invalidation(tmp_path):
+    """
+    Testa que uma invalidação enviada por outro worker chega pelo socket Unix
+    """
+    cache = register_cache("teste_unix")
+    cache.set("chave", "valor")
+    ouvinte = UnixSocketBackend(str(tmp_path))
+    ouvinte.start()
+    try:
+        publicador = UnixSocketBackend(str(tmp_path))
+        publicador.caminho = str(tmp_path / "outro.sock")
+        publicador.publish(
+            json.dumps(
+                {
+                    "origem": "outro-host:1",
+                    "enviado_em": time.time(),
+                    "chaves": ["teste_unix:chave"],
+                }
+            )
+        )
+
+        assert aguardar(lambda: cache.get("chave") == (False, None))
+    finally:
+        ouvinte.stop()
+
+    assert not (tmp_path / ouvinte.caminho).exists()
+
+
+@pytest.mark.unit
+def test_unix_socket_backend_removes_stale_sockets(tmp_path):
+    """
+    Testa que sockets de workers encerrados são removidos ao publicar
+    """
+    abandonado = tmp_path / "999999.sock"
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    sock.bind(str(abandonado))
+    sock.close()
+
+    UnixSocketBackend(str(tmp_path)).publish("{}")
+
+    assert not abandonado.exists()
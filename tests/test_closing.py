@@ -0,0 +1,157 @@
+import pytest
+from fastapi import status
+
+from app.core.config import settings
+from app.core.jobs import job_runner
+from app.db.closing import conclude_pending
+from app.models.avaliacao import (
+    AvaliacaoComportamental,
+    Ciclo,
+    StatusAvaliacao,
+    StatusCiclo,
+)
+from app.models.job import Job, StatusJob
+from app.models.snapshot import CicloSnapshot, ResultadoCiclo
+from tests.conftest import get_auth_headers
+
+
+@pytest.fixture(autouse=True)
+def lotes_pequenos(monkeypatch):
+    """Lotes de duas avaliações: o fechamento passa por vários"""
+    monkeypatch.setattr(settings, "CICLO_CLOSE_BATCH_SIZE", 2)
+
+
+@pytest.fixture
+def avaliacoes_pendentes(db_session, ciclo_ativo, admin_user, regular_user):
+    """Uma avaliação concluída e quatro pendentes (sem média) de user001"""
+    for i, status_avaliacao in enumerate(
+        ["CONCLUIDA", "PENDENTE", "PENDENTE", "EM_ANDAMENTO", "PENDENTE"]
+    ):
+        db_session.add(
+            AvaliacaoComportamental(
+                ciclo_id=ciclo_ativo.id,
+                avaliado_matricula="user001",
+                avaliador_matricula="admin",
+                tipo_avaliacao="AVALIACAO_GESTOR",
+                lideranca=5,
+                comunicacao=4,
+                trabalho_equipe=3,
+                resolucao_problemas=2,
+                adaptabilidade=1 + i % 2,
+                media_competencias=4.0 if status_avaliacao == "CONCLUIDA" else None,
+                status=status_avaliacao,
+            )
+        )
+    db_session.commit()
+    return ciclo_ativo
+
+
+def fechar(client, token, ciclo_id):
+    return client.post(
+        f"/api/ciclos/{ciclo_id}/fechar", headers=get_auth_headers(token)
+    )
+
+
+@pytest.mark.unit
+def test_fechar_ciclo(
+    client, admin_token, db_session, avaliacoes_pendentes, jobs_inline
+):
+    """
+    Testa que o fechamento conclui as pendentes calculando a média, finaliza
+    o ciclo, gera o snapshot e registra progresso e resultado no job
+    """
+    response = fechar(client, admin_token, avaliacoes_pendentes.id)
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    job = response.json()
+    assert response.headers["Location"] == f"/api/jobs/{job['id']}"
+    assert job["status"] == "concluido"
+    assert job["processados"] == job["total"] == 5
+    assert job["resultado"] == {"avaliacoes_concluidas": 4, "colaboradores": 1}
+
+    db_session.expire_all()
+    avaliacoes = db_session.query(AvaliacaoComportamental).all()
+    assert {a.status for a in avaliacoes} == {StatusAvaliacao.CONCLUIDA}
+    assert sorted(a.media_competencias for a in avaliacoes) == [
+        pytest.approx(3.0),
+        pytest.approx(3.0),
+        pytest.approx(3.2),
+        pytest.approx(3.2),
+        pytest.approx(4.0),
+    ]
+    assert db_session.get(Ciclo, avaliacoes_pendentes.id).status == (
+        StatusCiclo.FINALIZADO
+    )
+    assert db_session.get(CicloSnapshot, avaliacoes_pendentes.id) is not None
+    resultado = db_session.get(ResultadoCiclo, (avaliacoes_pendentes.id, "user001"))
+    assert resultado.total_avaliacoes == 5
+
+
+@pytest.mark.unit
+def test_fechar_ciclo_retoma_apos_interrupcao(
+    client, admin_token, db_session, avaliacoes_pendentes, jobs_inline
+):
+    """
+    Testa que uma execução interrompida depois de alguns lotes é retomada
+    concluindo só o que faltou
+    """
+    # Primeiro lote já gravado por uma execução anterior
+    assert conclude_pending(db_session, avaliacoes_pendentes.id, 2) == 2
+    db_session.commit()
+
+    response = fechar(client, admin_token, avaliacoes_pendentes.id)
+
+    assert response.json()["status"] == "concluido"
+    assert response.json()["resultado"]["avaliacoes_concluidas"] == 2
+    db_session.expire_all()
+    assert db_session.get(Ciclo, avaliacoes_pendentes.id).status == (
+        StatusCiclo.FINALIZADO
+    )
+
+
+@pytest.mark.unit
+def test_fechar_ciclo_ja_finalizado(
+    client, admin_token, db_session, avaliacoes_pendentes, jobs_inline
+):
+    """
+    Testa o 409 para ciclo finalizado e que o job repetido não refaz nada
+    """
+    fechar(client, admin_token, avaliacoes_pendentes.id)
+
+    response = fechar(client, admin_token, avaliacoes_pendentes.id)
+
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert db_session.query(Job).count() == 1
+
+
+@pytest.mark.unit
+def test_fechar_ciclo_com_job_em_andamento(
+    client, admin_token, db_session, avaliacoes_pendentes
+):
+    """
+    Testa que não se enfileira um segundo fechamento do mesmo ciclo
+    """
+    # Sem threads nem modo inline: o primeiro job fica pendente
+    job_runner.stop()
+    primeiro = fechar(client, admin_token, avaliacoes_pendentes.id)
+
+    segundo = fechar(client, admin_token, avaliacoes_pendentes.id)
+
+    assert primeiro.status_code == status.HTTP_202_ACCEPTED
+    assert primeiro.json()["status"] == "pendente"
+    assert segundo.status_code == status.HTTP_409_CONFLICT
+    assert f"job {primeiro.json()['id']}" in segundo.json()["detail"]
+    assert db_session.query(Job).filter_by(status=StatusJob.PENDENTE).count() == 1
+    assert db_session.query(Job.chave).scalar() == (
+        f"fechar_ciclo:{avaliacoes_pendentes.id}"
+    )
+
+
+@pytest.mark.unit
+def test_fechar_ciclo_inexistente(client, admin_token):
+    """
+    Testa o 404 ao fechar ciclo que não existe
+    """
+    response = fechar(client, admin_token, 9999)
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -213,3 +213,20 @@ def test_get_gestor(client, user_token, regular_user, admin_user):
     assert response.status_code == status.HTTP_200_OK
     data = response.json()
     assert data["matricula"] == admin_user.matricula
+
+
+@pytest.mark.unit
+def test_get_colaboradores_lote(client, admin_token, regular_user, another_user):
+    """
+    Testa busca de colaboradores em lote, na ordem das matrículas pedidas
+    """
+    response = client.get(
+        "/api/colaboradores/lote?matriculas=user002&matriculas=nao_existe"
+        "&matriculas=user001",
+        headers=get_auth_headers(admin_token),
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [item["matricula"] for item in data["itens"]] == ["user002", "user001"]
+    assert data["nao_encontrados"] == ["nao_existe"]
@@ -0,0 +1,142 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI, status
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, parse_accept_encoding
+
+PAYLOAD = "avaliacao;" * 500
+
+
+def build_app(minimum_size=1024):
+    """
+    Cria uma aplicação mínima com o middleware de compressão
+    """
+    test_app = FastAPI()
+    test_app.add_middleware(CompressionMiddleware, minimum_size=minimum_size)
+
+    @test_app.get("/grande")
+    def grande():
+        return PlainTextResponse(PAYLOAD)
+
+    @test_app.get("/pequeno")
+    def pequeno():
+        return PlainTextResponse("ok")
+
+    @test_app.get("/stream")
+    def stream():
+        def gerar():
+            for _ in range(10):
+                yield PAYLOAD
+
+        return StreamingResponse(gerar(), media_type="text/plain")
+
+    return test_app
+
+
+@pytest.mark.unit
+def test_parse_accept_encoding():
+    """
+    Testa a leitura do Accept-Encoding com pesos q
+    """
+    assert parse_accept_encoding("gzip;q=0.8, br, identity;q=0") == {
+        "gzip": 0.8,
+        "br": 1.0,
+        "identity": 0.0,
+    }
+    assert parse_accept_encoding("") == {}
+
+
+@pytest.mark.unit
+def test_gzip_large_response():
+    """
+    Testa compressão gzip de respostas acima do tamanho mínimo
+    """
+    client = TestClient(build_app())
+    response = client.get("/grande", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) < len(PAYLOAD)
+    assert response.text == PAYLOAD
+
+
+@pytest.mark.unit
+def test_small_response_not_compressed():
+    """
+    Testa que respostas pequenas saem sem compressão
+    """
+    client = TestClient(build_app())
+    response = client.get("/pequeno", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert response.text == "ok"
+
+
+@pytest.mark.unit
+def test_streaming_response_compressed():
+    """
+    Testa compressão de respostas em streaming
+    """
+    client = TestClient(build_app())
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.text == PAYLOAD * 10
+
+
+@pytest.mark.unit
+def test_identity_when_not_accepted():
+    """
+    Testa que nada é comprimido sem Accept-Encoding compatível
+    """
+    client = TestClient(build_app())
+    response = client.get("/grande", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in response.headers
+    assert response.text == PAYLOAD
+
+
+@pytest.mark.unit
+def test_brotli_preferred_when_available():
+    """
+    Testa negociação de brotli quando o pacote está instalado
+    """
+    brotli = pytest.importorskip("brotli")
+    client = TestClient(build_app())
+
+    with client.stream(
+        "GET", "/stream", headers={"Accept-Encoding": "gzip, br"}
+    ) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert response.headers["content-encoding"] == "br"
+    assert brotli.decompress(raw).decode() == PAYLOAD * 10
+
+
+@pytest.mark.unit
+def test_health_not_compressed(client):
+    """
+    Testa que o /health da aplicação não é comprimido
+    """
+    response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "content-encoding" not in response.headers
+
+
+@pytest.mark.unit
+def test_app_compresses_large_payload(client):
+    """
+    Testa que a aplicação comprime respostas grandes
+    """
+    with client.stream(
+        "GET", "/openapi.json", headers={"Accept-Encoding": "gzip"}
+    ) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(raw).startswith(b"{")
@@ -0,0 +1,149 @@
+import pytest
+from fastapi import status
+
+from app.core.concurrency import etag_matches, parse_etag
+from app.core.config import settings
+from app.db.writes import update_returning
+from app.models.avaliacao import Meta
+from tests.conftest import TestingSessionLocal, get_auth_headers
+
+
+@pytest.mark.unit
+def test_get_returns_etag(client, admin_token, meta_sample):
+    """
+    Testa que a busca por ID retorna a versão no ETag e no corpo
+    """
+    response = client.get(
+        f"/api/metas/{meta_sample.id}", headers=get_auth_headers(admin_token)
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["etag"] == '"1"'
+    assert response.json()["versao"] == 1
+
+
+@pytest.mark.unit
+def test_update_with_stale_if_match_conflicts(client, admin_token, regular_user):
+    """
+    Testa que a segunda edição feita sobre a mesma versão recebe 409
+    """
+    headers = get_auth_headers(admin_token)
+    url = f"/api/colaboradores/{regular_user.matricula}"
+    etag = client.get(url, headers=headers).headers["etag"]
+
+    primeira = client.put(
+        url, json={"cargo": "Coordenador"}, headers={**headers, "If-Match": etag}
+    )
+    segunda = client.put(
+        url, json={"cargo": "Gerente"}, headers={**headers, "If-Match": etag}
+    )
+
+    assert primeira.status_code == status.HTTP_200_OK
+    assert primeira.headers["etag"] == '"2"'
+    assert segunda.status_code == status.HTTP_409_CONFLICT
+    assert client.get(url, headers=headers).json()["cargo"] == "Coordenador"
+
+
+@pytest.mark.unit
+def test_update_without_if_match_still_works(client, admin_token, ciclo_ativo):
+    """
+    Testa que o If-Match é opcional e que a versão é incrementada
+    """
+    response = client.put(
+        f"/api/ciclos/{ciclo_ativo.id}",
+        json={"descricao": "Sem If-Match"},
+        headers=get_auth_headers(admin_token),
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["versao"] == 2
+
+
+@pytest.mark.unit
+def test_invalid_if_match_is_rejected(client, admin_token, avaliacao_sample):
+    """
+    Testa que um If-Match que não é um ETag da API retorna 400
+    """
+    response = client.put(
+        f"/api/avaliacoes/{avaliacao_sample.id}",
+        json={"comentarios": "Teste"},
+        headers={**get_auth_headers(admin_token), "If-Match": '"abc"'},
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.unit
+def test_parse_etag():
+    """
+    Testa a leitura de ETags fortes, fracos e do curinga
+    """
+    assert parse_etag('"3"') == 3
+    assert parse_etag('W/"7"') == 7
+    assert parse_etag("*") is None
+
+
+@pytest.mark.unit
+def test_etag_matches_if_none_match():
+    """
+    Testa o If-None-Match com lista de tags, tags fracas e curinga
+    """
+    etag = '"ciclo-1-20240101"'
+
+    assert etag_matches(etag, etag)
+    assert etag_matches('"velho", W/"ciclo-1-20240101"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"velho", "ciclo-1"', etag)
+    assert not etag_matches(None, etag)
+
+
+@pytest.mark.unit
+def test_update_on_stale_version_changes_nothing(db_session, meta_sample):
+    """
+    Testa que o UPDATE com a versão já alterada por outra sessão não grava
+    """
+    outra_sessao = TestingSessionLocal()
+    try:
+        primeira = update_returning(
+            db_session, Meta, [Meta.id == meta_sample.id], {"titulo": "Primeira"}, 1
+        )
+        db_session.commit()
+
+        segunda = update_returning(
+            outra_sessao, Meta, [Meta.id == meta_sample.id], {"titulo": "Segunda"}, 1
+        )
+    finally:
+        outra_sessao.close()
+
+    assert primeira.versao == 2
+    assert segunda is None
+    db_session.refresh(meta_sample)
+    assert meta_sample.titulo == "Primeira"
+
+
+@pytest.mark.unit
+def test_fallback_without_returning_detects_concurrent_write(
+    db_session, meta_sample, monkeypatch
+):
+    """
+    Testa que sem RETURNING o caminho SELECT + UPDATE também detecta a
+    gravação concorrente pela versão
+    """
+    monkeypatch.setattr(settings, "DB_WRITE_RETURNING", False)
+    outra_sessao = TestingSessionLocal()
+    try:
+        # Cópia carregada antes da gravação concorrente (versão 1)
+        carregada = outra_sessao.get(Meta, meta_sample.id)
+        meta_sample.titulo = "Primeira"
+        db_session.commit()
+
+        resultado = update_returning(
+            outra_sessao, Meta, [Meta.id == meta_sample.id], {"titulo": "Segunda"}
+        )
+    finally:
+        outra_sessao.close()
+
+    assert resultado is None
+    db_session.refresh(meta_sample)
+    assert meta_sample.titulo == "Primeira"
+    assert meta_sample.versao == 2
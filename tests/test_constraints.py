@@ -0,0 +1,124 @@
+import pytest
+from fastapi import status
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+
+from app.db.snapshots import finalized_ciclos
+from app.db.writes import violated_columns
+from tests.conftest import engine, get_auth_headers
+
+
+def nova_meta(ciclo_id, matricula):
+    return {
+        "ciclo_id": ciclo_id,
+        "colaborador_matricula": matricula,
+        "titulo": "Nova Meta",
+        "peso": 40,
+        "data_limite": "2025-06-30",
+    }
+
+
+@pytest.mark.unit
+def test_create_meta_issues_only_the_insert(
+    client, admin_token, db_session, ciclo_ativo, regular_user
+):
+    """
+    Testa que a criação só relê o status do ciclo, sem recarregar a meta
+    """
+    headers = get_auth_headers(admin_token)
+    payload = nova_meta(ciclo_ativo.id, regular_user.matricula)
+    # Ciclos finalizados em cache, como após o aquecimento
+    finalized_ciclos(db_session)
+    statements = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", registrar)
+    try:
+        response = client.post("/api/metas/", json=payload, headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", registrar)
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json()["versao"] == 1
+    assert len([s for s in statements if "FROM ciclos" in s]) == 1
+    assert not [s for s in statements if "FROM metas" in s]
+    assert len([s for s in statements if s.startswith("INSERT INTO metas")]) == 1
+
+
+@pytest.mark.unit
+def test_create_meta_with_missing_ciclo_returns_404(client, admin_token, regular_user):
+    """
+    Testa que a FK recusada pelo banco vira 404 do ciclo
+    """
+    response = client.post(
+        "/api/metas/",
+        json=nova_meta(9999, regular_user.matricula),
+        headers=get_auth_headers(admin_token),
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json()["detail"] == "Ciclo não encontrado"
+
+
+@pytest.mark.unit
+def test_create_avaliacao_reports_the_missing_colaborador(
+    client, admin_token, ciclo_ativo, regular_user
+):
+    """
+    Testa que, entre duas FKs para colaboradores, a resposta indica a violada
+    """
+    response = client.post(
+        "/api/avaliacoes/",
+        json={
+            "ciclo_id": ciclo_ativo.id,
+            "avaliado_matricula": regular_user.matricula,
+            "avaliador_matricula": "nao_existe",
+            "tipo_avaliacao": "avaliacao_gestor",
+            "lideranca": 5,
+            "comunicacao": 4,
+            "trabalho_equipe": 5,
+            "resolucao_problemas": 4,
+            "adaptabilidade": 5,
+        },
+        headers=get_auth_headers(admin_token),
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json()["detail"] == "Colaborador avaliador não encontrado"
+
+
+@pytest.mark.unit
+def test_delete_ciclo_with_metas_returns_400(client, admin_token, meta_sample):
+    """
+    Testa que a FK impede remover um ciclo com metas vinculadas
+    """
+    response = client.delete(
+        f"/api/ciclos/{meta_sample.ciclo_id}", headers=get_auth_headers(admin_token)
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "mensagem, esperado",
+    [
+        (
+            'insert or update on table "metas" violates foreign key constraint '
+            '"metas_ciclo_id_fkey"\nDETAIL:  Key (ciclo_id)=(9) is not present '
+            'in table "ciclos".',
+            {"ciclo_id"},
+        ),
+        ("UNIQUE constraint failed: colaboradores.email", {"email"}),
+        ("FOREIGN KEY constraint failed", set()),
+    ],
+)
+def test_violated_columns(mensagem, esperado):
+    """
+    Testa a extração da coluna violada das mensagens do PostgreSQL e do SQLite
+    """
+    erro = IntegrityError("INSERT ...", {}, Exception(mensagem))
+
+    assert violated_columns(erro) == esperado
@@ -0,0 +1,112 @@
+import pytest
+from fastapi import status
+from sqlalchemy import event
+from tests.conftest import engine, get_auth_headers
+
+
+@pytest.fixture
+def captured_sql():
+    """
+    Captura os SELECTs executados no banco de testes
+    """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.mark.unit
+def test_list_avaliacoes_with_fields(
+    client, admin_token, avaliacao_sample, captured_sql
+):
+    """
+    Testa que fields= projeta apenas as colunas pedidas no SELECT e na resposta
+    """
+    response = client.get(
+        "/api/avaliacoes/?fields=id,media_competencias",
+        headers=get_auth_headers(admin_token),
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [{"id": avaliacao_sample.id, "media_competencias": 4.4}]
+
+    list_sql = captured_sql[-1]
+    assert "avaliacoes_comportamentais" in list_sql
+    assert "comentarios" not in list_sql
+
+
+@pytest.mark.unit
+def test_list_avaliacoes_default_select(
+    client, admin_token, avaliacao_sample, captured_sql
+):
+    """
+    Testa que sem fields= a listagem lê as colunas da resposta (incluindo
+    comentarios) em um único SELECT, sem lazy load por linha
+    """
+    response = client.get("/api/avaliacoes/", headers=get_auth_headers(admin_token))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()[0]["comentarios"] == "Excelente desempenho"
+
+    selects = [sql for sql in captured_sql if "FROM avaliacoes_comportamentais" in sql]
+    assert len(selects) == 1
+    assert "avaliacoes_comportamentais.comentarios" in selects[0]
+
+
+@pytest.mark.unit
+def test_list_metas_with_fields(client, admin_token, meta_sample):
+    """
+    Testa fields= na listagem de metas
+    """
+    response = client.get(
+        "/api/metas/?fields=id,titulo,peso", headers=get_auth_headers(admin_token)
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [
+        {"id": meta_sample.id, "titulo": "Meta de Teste", "peso": 30}
+    ]
+
+
+@pytest.mark.unit
+def test_list_colaboradores_skips_senha_hash(client, admin_token, captured_sql):
+    """
+    Testa que a listagem padrão de colaboradores não lê senha_hash do banco
+    """
+    response = client.get("/api/colaboradores/", headers=get_auth_headers(admin_token))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "senha_hash" not in captured_sql[-1]
+
+
+@pytest.mark.unit
+def test_list_colaboradores_with_fields(client, admin_token):
+    """
+    Testa fields= na listagem de colaboradores
+    """
+    response = client.get(
+        "/api/colaboradores/?fields=matricula,nome",
+        headers=get_auth_headers(admin_token),
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [{"matricula": "admin", "nome": "Administrador Teste"}]
+
+
+@pytest.mark.unit
+def test_list_with_invalid_fields(client, admin_token):
+    """
+    Testa que campos fora do schema de resposta são rejeitados
+    """
+    response = client.get(
+        "/api/colaboradores/?fields=nome,senha_hash",
+        headers=get_auth_headers(admin_token),
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "senha_hash" in response.json()["detail"]
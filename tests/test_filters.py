@@ -0,0 +1,181 @@
+from datetime import date, datetime
+
+import pytest
+from fastapi import status
+
+from app.db.filters import (
+    FILTROS_AVALIACAO,
+    FILTROS_COLABORADOR,
+    FILTROS_META,
+    ORDENACAO_AVALIACAO,
+    ORDENACAO_COLABORADOR,
+    ORDENACAO_META,
+)
+from app.models.avaliacao import Meta
+from tests.conftest import get_auth_headers
+
+
+@pytest.fixture
+def metas_variadas(db_session, ciclo_ativo, regular_user):
+    dados = [
+        ("Meta A", date(2025, 3, 31), 20, datetime(2025, 1, 10)),
+        ("Meta B", date(2025, 6, 30), 80, datetime(2025, 2, 10)),
+        ("Meta C", date(2025, 12, 31), None, datetime(2025, 3, 10)),
+    ]
+    for titulo, data_limite, resultado, criado_em in dados:
+        db_session.add(
+            Meta(
+                ciclo_id=ciclo_ativo.id,
+                colaborador_matricula=regular_user.matricula,
+                titulo=titulo,
+                peso=30,
+                data_limite=data_limite,
+                resultado_alcancado=resultado,
+                criado_em=criado_em,
+            )
+        )
+    db_session.commit()
+
+
+def titulos(response):
+    return [m["titulo"] for m in response.json()]
+
+
+@pytest.mark.unit
+def test_metas_ordenadas_decrescente(client, admin_token, metas_variadas):
+    """
+    Testa a ordenação decrescente por criado_em
+    """
+    response = client.get(
+        "/api/metas/",
+        params={"ordenar": "-criado_em"},
+        headers=get_auth_headers(admin_token),
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert titulos(response) == ["Meta C", "Meta B", "Meta A"]
+
+
+@pytest.mark.unit
+def test_metas_filtradas_por_intervalos(client, admin_token, metas_variadas):
+    """
+    Testa os intervalos de data_limite e de resultado
+    """
+    headers = get_auth_headers(admin_token)
+
+    por_data = client.get(
+        "/api/metas/",
+        params={"data_limite_de": "2025-06-01", "ordenar": "data_limite"},
+        headers=headers,
+    )
+    por_resultado = client.get(
+        "/api/metas/", params={"resultado_min": 50}, headers=headers
+    )
+
+    assert titulos(por_data) == ["Meta B", "Meta C"]
+    assert titulos(por_resultado) == ["Meta B"]
+
+
+@pytest.mark.unit
+def test_ordenacao_fora_da_lista_retorna_400(client, admin_token):
+    """
+    Testa que ordenar por coluna não permitida retorna 400
+    """
+    response = client.get(
+        "/api/colaboradores/",
+        params={"ordenar": "senha_hash"},
+        headers=get_auth_headers(admin_token),
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "senha_hash" in response.json()["detail"]
+
+
+@pytest.mark.unit
+def test_intervalo_invertido_retorna_400(client, admin_token):
+    """
+    Testa que início depois do fim retorna 400
+    """
+    response = client.get(
+        "/api/avaliacoes/",
+        params={"media_min": 4, "media_max": 2},
+        headers=get_auth_headers(admin_token),
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.unit
+def test_colaboradores_por_nome(client, admin_token, regular_user, another_user):
+    """
+    Testa a ordenação de colaboradores por nome com projeção de campos
+    """
+    response = client.get(
+        "/api/colaboradores/",
+        params={"ordenar": "-nome", "fields": "nome"},
+        headers=get_auth_headers(admin_token),
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [c["nome"] for c in response.json()] == [
+        "Usuário Teste",
+        "Outro Usuário",
+        "Administrador Teste",
+    ]
+
+
+@pytest.mark.unit
+def test_filtros_e_ordenacoes_usam_colunas_indexadas():
+    """
+    Testa que toda coluna liberada para filtro ou ordenação tem índice
+    """
+    colunas = [coluna for coluna, _ in FILTROS_AVALIACAO.values()]
+    colunas += [coluna for coluna, _ in FILTROS_META.values()]
+    colunas += [coluna for coluna, _ in FILTROS_COLABORADOR.values()]
+    colunas += list(ORDENACAO_AVALIACAO.values())
+    colunas += list(ORDENACAO_META.values())
+    colunas += list(ORDENACAO_COLABORADOR.values())
+
+    for coluna in colunas:
+        column = coluna.property.columns[0]
+        assert column.primary_key or column.index or column.unique, column
+
+
+@pytest.mark.unit
+def test_avaliacoes_por_media_criadas_pela_api(
+    client, admin_token, ciclo_ativo, regular_user
+):
+    """
+    Testa o filtro e a ordenação por média em avaliações criadas e
+    alteradas só pela API
+    """
+    headers = get_auth_headers(admin_token)
+    ids = []
+    for nota in (2, 5, 4):
+        response = client.post(
+            "/api/avaliacoes/",
+            json={
+                "ciclo_id": ciclo_ativo.id,
+                "avaliado_matricula": regular_user.matricula,
+                "avaliador_matricula": "admin",
+                "tipo_avaliacao": "avaliacao_gestor",
+                "lideranca": nota,
+                "comunicacao": nota,
+                "trabalho_equipe": nota,
+                "resolucao_problemas": nota,
+                "adaptabilidade": nota,
+            },
+            headers=headers,
+        )
+        ids.append(response.json()["id"])
+    # 4.0 -> 3.4: a média acompanha a alteração de uma nota
+    client.put(f"/api/avaliacoes/{ids[2]}", json={"lideranca": 1}, headers=headers)
+
+    response = client.get(
+        "/api/avaliacoes/",
+        params={"media_min": 3.4, "ordenar": "-media_competencias"},
+        headers=headers,
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [a["id"] for a in response.json()] == [ids[1], ids[2]]
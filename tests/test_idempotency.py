@@ -0,0 +1,178 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import status
+
+from app.models.avaliacao import Meta
+from app.models.colaborador import Colaborador
+from app.models.idempotencia import ChaveIdempotencia
+from tests.conftest import get_auth_headers
+
+
+def nova_meta(ciclo_id, matricula, titulo="Meta idempotente"):
+    return {
+        "ciclo_id": ciclo_id,
+        "colaborador_matricula": matricula,
+        "titulo": titulo,
+        "descricao": "Criada com Idempotency-Key",
+        "peso": 30,
+        "data_limite": "2025-06-30",
+    }
+
+
+def headers_com_chave(token, chave="chave-123"):
+    return {**get_auth_headers(token), "Idempotency-Key": chave}
+
+
+@pytest.mark.unit
+def test_retry_replays_response(
+    client, admin_token, ciclo_ativo, regular_user, db_session
+):
+    """
+    Testa que o retry com a mesma chave devolve a resposta original sem criar
+    outra meta
+    """
+    payload = nova_meta(ciclo_ativo.id, regular_user.matricula)
+    headers = headers_com_chave(admin_token)
+
+    primeira = client.post("/api/metas/", json=payload, headers=headers)
+    retry = client.post("/api/metas/", json=payload, headers=headers)
+
+    assert primeira.status_code == status.HTTP_201_CREATED
+    assert "idempotent-replayed" not in primeira.headers
+    assert retry.status_code == status.HTTP_201_CREATED
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert retry.json() == primeira.json()
+    assert db_session.query(Meta).count() == 1
+
+
+@pytest.mark.unit
+def test_same_key_with_other_payload_is_rejected(
+    client, admin_token, ciclo_ativo, regular_user
+):
+    """
+    Testa que a mesma chave com outro payload retorna 422
+    """
+    headers = headers_com_chave(admin_token)
+    client.post(
+        "/api/metas/",
+        json=nova_meta(ciclo_ativo.id, regular_user.matricula),
+        headers=headers,
+    )
+
+    response = client.post(
+        "/api/metas/",
+        json=nova_meta(ciclo_ativo.id, regular_user.matricula, titulo="Outra"),
+        headers=headers,
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.unit
+def test_key_is_scoped_per_user(
+    client, admin_token, user_token, ciclo_ativo, regular_user, db_session
+):
+    """
+    Testa que a mesma chave de usuários diferentes não é compartilhada
+    """
+    payload = nova_meta(ciclo_ativo.id, regular_user.matricula)
+
+    client.post("/api/metas/", json=payload, headers=headers_com_chave(admin_token))
+    response = client.post(
+        "/api/metas/", json=payload, headers=headers_com_chave(user_token)
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert "idempotent-replayed" not in response.headers
+    assert db_session.query(Meta).count() == 2
+
+
+@pytest.mark.unit
+def test_failed_request_releases_key(client, admin_token, ciclo_ativo, regular_user):
+    """
+    Testa que uma requisição com erro libera a chave para um novo retry
+    """
+    headers = headers_com_chave(admin_token)
+
+    falha = client.post(
+        "/api/metas/", json=nova_meta(9999, regular_user.matricula), headers=headers
+    )
+    assert falha.status_code == status.HTTP_404_NOT_FOUND
+
+    response = client.post(
+        "/api/metas/",
+        json=nova_meta(ciclo_ativo.id, regular_user.matricula),
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+
+
+@pytest.mark.unit
+def test_key_in_progress_returns_conflict(
+    client, admin_token, ciclo_ativo, regular_user, db_session
+):
+    """
+    Testa que uma chave ainda em processamento retorna 409 e que uma reserva
+    abandonada é assumida depois do prazo
+    """
+    payload = nova_meta(ciclo_ativo.id, regular_user.matricula)
+    headers = headers_com_chave(admin_token)
+    client.post("/api/metas/", json=payload, headers=headers)
+    registro = db_session.query(ChaveIdempotencia).one()
+    registro.status_code = None
+    registro.corpo = None
+    db_session.commit()
+
+    response = client.post("/api/metas/", json=payload, headers=headers)
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    registro.criado_em = datetime.utcnow() - timedelta(hours=1)
+    db_session.commit()
+
+    response = client.post("/api/metas/", json=payload, headers=headers)
+    assert response.status_code == status.HTTP_201_CREATED
+
+
+@pytest.mark.unit
+def test_expired_key_runs_again(
+    client, admin_token, ciclo_ativo, regular_user, db_session
+):
+    """
+    Testa que uma chave expirada executa a requisição de novo
+    """
+    payload = nova_meta(ciclo_ativo.id, regular_user.matricula)
+    headers = headers_com_chave(admin_token)
+    client.post("/api/metas/", json=payload, headers=headers)
+    registro = db_session.query(ChaveIdempotencia).one()
+    registro.expira_em = datetime.utcnow() - timedelta(seconds=1)
+    db_session.commit()
+
+    response = client.post("/api/metas/", json=payload, headers=headers)
+
+    assert "idempotent-replayed" not in response.headers
+    assert db_session.query(Meta).count() == 2
+
+
+@pytest.mark.unit
+def test_colaborador_retry_does_not_duplicate(client, admin_token, db_session):
+    """
+    Testa que o retry da criação de colaborador não retorna 400 de duplicidade
+    """
+    payload = {
+        "matricula": "IDEM001",
+        "nome": "Colaborador Idempotente",
+        "email": "idem@test.com",
+        "senha": "senha123",
+        "cargo": "Analista",
+        "departamento": "TI",
+    }
+    headers = headers_com_chave(admin_token, "colaborador-1")
+
+    primeira = client.post("/api/colaboradores/", json=payload, headers=headers)
+    retry = client.post("/api/colaboradores/", json=payload, headers=headers)
+
+    assert primeira.status_code == status.HTTP_201_CREATED
+    assert retry.status_code == status.HTTP_201_CREATED
+    assert retry.json()["matricula"] == "IDEM001"
+    assert db_session.query(Colaborador).filter_by(matricula="IDEM001").count() == 1
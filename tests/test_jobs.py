@@ -0,0 +1,286 @@
+import time
+
+import pytest
+from fastapi import status
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.core.jobs import (
+    cancel_job,
+    enqueue_job,
+    job_handler,
+    job_runner,
+)
+from app.models.job import Job, StatusJob
+from tests.conftest import get_auth_headers
+
+falhas = {"restantes": 0}
+
+
+@job_handler("teste_contar")
+def contar(ctx, ate):
+    for i in range(1, ate + 1):
+        ctx.progress(i, total=ate)
+    return {"contados": ate}
+
+
+@job_handler("teste_instavel")
+def instavel(ctx):
+    if falhas["restantes"] > 0:
+        falhas["restantes"] -= 1
+        raise RuntimeError("falha temporária")
+    return {"ok": True}
+
+
+@job_handler("teste_cancelado_no_meio")
+def cancelado_no_meio(ctx):
+    ctx.progress(1, total=10)
+    with ctx.session() as db:
+        cancel_job(db, ctx.job_id)
+        db.commit()
+    ctx.progress(2)
+    return {"nao": "chega aqui"}
+
+
+def assumir_por_outra_execucao(ctx):
+    # Simula outro worker que recuperou o job e o assumiu
+    with ctx.session() as db:
+        db.execute(
+            update(Job)
+            .where(Job.id == ctx.job_id)
+            .values(execucao="outra", tentativas=Job.tentativas + 1)
+        )
+        db.commit()
+
+
+@job_handler("teste_perde_no_progresso")
+def perde_no_progresso(ctx):
+    ctx.progress(1, total=3)
+    assumir_por_outra_execucao(ctx)
+    ctx.progress(2)
+    return {"nao": "chega aqui"}
+
+
+@job_handler("teste_perde_em_silencio")
+def perde_em_silencio(ctx):
+    assumir_por_outra_execucao(ctx)
+    return {"resultado": "atrasado"}
+
+
+@job_handler("teste_etapa_longa")
+def etapa_longa(ctx):
+    time.sleep(0.5)
+    with ctx.session() as db:
+        job = db.execute(
+            select(Job.iniciado_em, Job.atualizado_em).where(Job.id == ctx.job_id)
+        ).one()
+    return {"renovado": job.atualizado_em > job.iniciado_em}
+
+
+def enfileirar(db_session, tipo, **parametros):
+    job = enqueue_job(db_session, tipo, criado_por="admin", **parametros)
+    db_session.commit()
+    return job.id
+
+
+@pytest.mark.unit
+def test_job_concluido_com_progresso(client, admin_token, db_session, jobs_inline):
+    """
+    Testa a execução após o commit e o acompanhamento pelo GET
+    """
+    job_id = enfileirar(db_session, "teste_contar", ate=4)
+
+    response = client.get(f"/api/jobs/{job_id}", headers=get_auth_headers(admin_token))
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["status"] == "concluido"
+    assert data["processados"] == 4
+    assert data["progresso"] == 100.0
+    assert data["parametros"] == {"ate": 4}
+    assert data["resultado"] == {"contados": 4}
+    assert data["tentativas"] == 1
+    assert data["concluido_em"] is not None
+
+
+@pytest.mark.unit
+def test_job_nao_executa_sem_commit(db_session, jobs_inline):
+    """
+    Testa que o job de uma transação desfeita não é executado
+    """
+    enqueue_job(db_session, "teste_contar", ate=1)
+    db_session.rollback()
+
+    assert db_session.query(Job).count() == 0
+
+
+@pytest.mark.unit
+def test_job_repete_apos_falha(db_session, jobs_inline):
+    """
+    Testa a nova tentativa após uma falha e a falha definitiva ao esgotar
+    as tentativas
+    """
+    falhas["restantes"] = 1
+    recuperado = enfileirar(db_session, "teste_instavel")
+
+    falhas["restantes"] = 10
+    esgotado = enfileirar(db_session, "teste_instavel")
+    falhas["restantes"] = 0
+
+    db_session.expire_all()
+    job = db_session.get(Job, recuperado)
+    assert job.status == StatusJob.CONCLUIDO
+    assert job.tentativas == 2
+
+    job = db_session.get(Job, esgotado)
+    assert job.status == StatusJob.FALHOU
+    assert job.tentativas == settings.JOBS_MAX_ATTEMPTS
+    assert "falha temporária" in job.erro
+
+
+@pytest.mark.unit
+def test_reexecutar_job_com_falha(client, admin_token, db_session, jobs_inline):
+    """
+    Testa que um job com falha volta para a fila e só jobs encerrados sem
+    sucesso podem ser reexecutados
+    """
+    headers = get_auth_headers(admin_token)
+    falhas["restantes"] = 10
+    job_id = enfileirar(db_session, "teste_instavel")
+    falhas["restantes"] = 0
+
+    response = client.post(f"/api/jobs/{job_id}/reexecutar", headers=headers)
+    de_novo = client.post(f"/api/jobs/{job_id}/reexecutar", headers=headers)
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert response.headers["Location"] == f"/api/jobs/{job_id}"
+    assert response.json()["status"] == "concluido"
+    assert de_novo.status_code == status.HTTP_409_CONFLICT
+
+
+@pytest.mark.unit
+def test_cancelar_job_pendente(client, admin_token, db_session):
+    """
+    Testa o cancelamento de um job que ainda não foi executado
+    """
+    # Sem threads nem modo inline: o job fica pendente
+    job_runner.stop()
+    headers = get_auth_headers(admin_token)
+    job_id = enfileirar(db_session, "teste_contar", ate=1)
+
+    response = client.post(f"/api/jobs/{job_id}/cancelar", headers=headers)
+    de_novo = client.post(f"/api/jobs/{job_id}/cancelar", headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["status"] == "cancelado"
+    assert de_novo.status_code == status.HTTP_409_CONFLICT
+
+
+@pytest.mark.unit
+def test_cancelar_job_em_execucao(db_session, jobs_inline):
+    """
+    Testa que o job em execução para no próximo progresso
+    """
+    job_id = enfileirar(db_session, "teste_cancelado_no_meio")
+
+    db_session.expire_all()
+    job = db_session.get(Job, job_id)
+    assert job.status == StatusJob.CANCELADO
+    assert job.processados == 2
+    assert job.resultado is None
+
+
+@pytest.mark.unit
+def test_poll_recupera_job_interrompido(db_session, jobs_inline, monkeypatch):
+    """
+    Testa que um job em execução sem sinal de vida volta para a fila
+    """
+    job_runner.stop()
+    monkeypatch.setattr(settings, "JOBS_INLINE", False)
+    monkeypatch.setattr(settings, "JOBS_STALE_SECONDS", -1)
+    job_id = enfileirar(db_session, "teste_contar", ate=1)
+    db_session.query(Job).filter(Job.id == job_id).update(
+        {"status": StatusJob.EXECUTANDO}
+    )
+    db_session.commit()
+
+    job_runner.poll()
+
+    db_session.expire_all()
+    assert db_session.get(Job, job_id).status == StatusJob.PENDENTE
+
+
+@pytest.mark.unit
+def test_job_de_outro_usuario_nao_aparece(client, user_token, db_session):
+    """
+    Testa que o usuário comum só vê os próprios jobs
+    """
+    job_runner.stop()
+    job_id = enfileirar(db_session, "teste_contar", ate=1)
+
+    response = client.get(f"/api/jobs/{job_id}", headers=get_auth_headers(user_token))
+    lista = client.get("/api/jobs/", headers=get_auth_headers(user_token))
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert lista.json() == []
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "tipo", ["teste_perde_no_progresso", "teste_perde_em_silencio"]
+)
+def test_job_assumido_por_outra_execucao(db_session, jobs_inline, tipo):
+    """
+    Testa que a execução que perdeu o job não grava progresso nem desfecho
+    por cima da execução que o assumiu
+    """
+    job_id = enfileirar(db_session, tipo)
+
+    db_session.expire_all()
+    job = db_session.get(Job, job_id)
+    assert job.status == StatusJob.EXECUTANDO
+    assert job.execucao == "outra"
+    assert job.tentativas == 2
+    assert job.processados <= 1
+    assert job.resultado is None
+    assert job.concluido_em is None
+
+
+@pytest.mark.unit
+def test_job_renova_sinal_de_vida_sem_progresso(db_session, jobs_inline, monkeypatch):
+    """
+    Testa que uma etapa longa sem progresso continua renovando o sinal de vida
+    """
+    monkeypatch.setattr(settings, "JOBS_STALE_SECONDS", 0.3)
+    job_id = enfileirar(db_session, "teste_etapa_longa")
+
+    db_session.expire_all()
+    job = db_session.get(Job, job_id)
+    assert job.status == StatusJob.CONCLUIDO
+    assert job.resultado == '{"renovado": true}'
+
+
+@pytest.mark.unit
+def test_chave_unica_entre_jobs_ativos(client, admin_token, db_session):
+    """
+    Testa que só um job pendente ou em execução tem cada chave, e que a
+    reexecução que criaria um segundo responde 409
+    """
+    job_runner.stop()
+    falho = enfileirar(db_session, "teste_contar", chave="alvo:1", ate=1)
+    db_session.query(Job).filter(Job.id == falho).update({"status": StatusJob.FALHOU})
+    db_session.commit()
+    ativo = enfileirar(db_session, "teste_contar", chave="alvo:1", ate=1)
+
+    with pytest.raises(IntegrityError):
+        enfileirar(db_session, "teste_contar", chave="alvo:1", ate=1)
+    db_session.rollback()
+    response = client.post(
+        f"/api/jobs/{falho}/reexecutar", headers=get_auth_headers(admin_token)
+    )
+
+    assert response.status_code == status.HTTP_409_CONFLICT
+    db_session.expire_all()
+    assert db_session.get(Job, falho).status == StatusJob.FALHOU
+    assert db_session.get(Job, ativo).status == StatusJob.PENDENTE
@@ -0,0 +1,196 @@
+import gzip
+import logging
+import os
+import time
+
+import pytest
+
+from app.core import log_rotation
+from app.core.log_rotation import (
+    SafeRotatingFileHandler,
+    SafeTimedRotatingFileHandler,
+    wait_compressions,
+)
+
+
+def make_record(message: str) -> logging.LogRecord:
+    return logging.LogRecord(
+        "itau_performance", logging.INFO, __file__, 0, message, None, None
+    )
+
+
+def rotated_files(directory):
+    return sorted(
+        nome
+        for nome in os.listdir(directory)
+        if nome.startswith("app.log.") and not nome.endswith(".lock")
+    )
+
+
+@pytest.mark.unit
+def test_size_rotation_compresses_in_background(tmp_path):
+    """
+    Testa que a rotação por tamanho gera um .gz com o conteúdo anterior
+    """
+    handler = SafeRotatingFileHandler(
+        str(tmp_path / "app.log"), max_bytes=100, backup_count=5
+    )
+    handler.emit(make_record("a" * 80))
+    handler.emit(make_record("b" * 80))
+    handler.close()
+    wait_compressions()
+
+    rotacionados = rotated_files(tmp_path)
+    assert len(rotacionados) == 1
+    assert rotacionados[0].endswith(".gz")
+    with gzip.open(tmp_path / rotacionados[0], "rt", encoding="utf-8") as arquivo:
+        assert arquivo.read() == "a" * 80 + "\n"
+    assert (tmp_path / "app.log").read_text(encoding="utf-8") == "b" * 80 + "\n"
+
+
+@pytest.mark.unit
+def test_size_rotation_without_compression(tmp_path):
+    """
+    Testa a rotação por tamanho com LOG_COMPRESS desligado
+    """
+    handler = SafeRotatingFileHandler(
+        str(tmp_path / "app.log"), max_bytes=100, backup_count=5, compress=False
+    )
+    handler.emit(make_record("a" * 80))
+    handler.emit(make_record("b" * 80))
+    handler.close()
+
+    rotacionados = rotated_files(tmp_path)
+    assert len(rotacionados) == 1
+    assert not rotacionados[0].endswith(".gz")
+
+
+@pytest.mark.unit
+def test_size_rotation_retention(tmp_path):
+    """
+    Testa que apenas backup_count arquivos rotacionados são mantidos
+    """
+    handler = SafeRotatingFileHandler(
+        str(tmp_path / "app.log"), max_bytes=50, backup_count=2, compress=False
+    )
+    for i in range(6):
+        handler.emit(make_record(f"{i}" * 40))
+    handler.close()
+
+    assert len(rotated_files(tmp_path)) == 2
+
+
+@pytest.mark.unit
+def test_reopens_file_rotated_by_another_process(tmp_path):
+    """
+    Testa que o handler reabre o arquivo quando outro worker já rotacionou
+    """
+    filename = str(tmp_path / "app.log")
+    worker_a = SafeRotatingFileHandler(filename, max_bytes=100, backup_count=5)
+    worker_b = SafeRotatingFileHandler(filename, max_bytes=100, backup_count=5)
+
+    worker_a.emit(make_record("a" * 80))
+    worker_b.emit(make_record("b" * 80))  # rotaciona o arquivo de worker_a
+    worker_a.emit(make_record("c" * 10))  # deve ir para o arquivo novo
+    worker_a.close()
+    worker_b.close()
+    wait_compressions()
+
+    assert (tmp_path / "app.log").read_text(encoding="utf-8") == (
+        "b" * 80 + "\n" + "c" * 10 + "\n"
+    )
+    assert len(rotated_files(tmp_path)) == 1
+
+
+@pytest.mark.unit
+def test_timed_rotation_skips_period_already_rotated(tmp_path):
+    """
+    Testa que a rotação diária não sobrescreve o arquivo gerado por outro worker
+    """
+    filename = str(tmp_path / "app.log")
+    handler = SafeTimedRotatingFileHandler(filename, when="midnight", backup_count=5)
+    handler.emit(make_record("primeiro"))
+
+    handler.rolloverAt = int(time.time()) - 1
+    periodo = time.localtime(handler.rolloverAt - handler.interval)
+    existente = tmp_path / f"app.log.{time.strftime(handler.suffix, periodo)}.gz"
+    existente.write_bytes(b"rotacionado por outro worker")
+
+    handler.emit(make_record("segundo"))
+    handler.close()
+    wait_compressions()
+
+    assert existente.read_bytes() == b"rotacionado por outro worker"
+    assert handler.rolloverAt > time.time()
+    assert (tmp_path / "app.log").read_text(encoding="utf-8") == "primeiro\nsegundo\n"
+
+
+@pytest.mark.unit
+def test_timed_rotation_compresses_previous_period(tmp_path):
+    """
+    Testa que a rotação diária gera o .gz do período anterior
+    """
+    handler = SafeTimedRotatingFileHandler(
+        str(tmp_path / "app.log"), when="midnight", backup_count=5
+    )
+    handler.emit(make_record("ontem"))
+    handler.rolloverAt = int(time.time()) - 1
+    handler.emit(make_record("hoje"))
+    handler.close()
+    wait_compressions()
+
+    rotacionados = rotated_files(tmp_path)
+    assert len(rotacionados) == 1
+    with gzip.open(tmp_path / rotacionados[0], "rt", encoding="utf-8") as arquivo:
+        assert arquivo.read() == "ontem\n"
+
+
+@pytest.mark.unit
+def test_retention_ignores_file_compressed_meanwhile(tmp_path, monkeypatch):
+    """
+    Testa que um pendente removido pela thread de compressão entre o glob e a
+    leitura do mtime não interrompe a rotação
+    """
+    handler = SafeRotatingFileHandler(
+        str(tmp_path / "app.log"), max_bytes=100, backup_count=1, compress=False
+    )
+    for nome in ("app.log.1", "app.log.2"):
+        (tmp_path / nome).write_text(nome)
+    glob_original = log_rotation.glob.glob
+    monkeypatch.setattr(
+        log_rotation.glob,
+        "glob",
+        lambda padrao: glob_original(padrao) + [str(tmp_path / "app.log.sumiu")],
+    )
+
+    assert handler.getFilesToDelete() == [str(tmp_path / "app.log.1")]
+    handler.close()
+
+
+@pytest.mark.unit
+def test_timed_rotation_ignores_backup_removed_meanwhile(tmp_path, monkeypatch):
+    """
+    Testa que a rotação diária não falha se outro processo já removeu um
+    backup antigo entre a listagem e a remoção
+    """
+    handler = SafeTimedRotatingFileHandler(
+        str(tmp_path / "app.log"), when="midnight", backup_count=1, compress=False
+    )
+    handler.emit(make_record("ontem"))
+    antigo = tmp_path / "app.log.2000-01-01"
+    antigo.write_text("antigo")
+    monkeypatch.setattr(
+        handler,
+        "getFilesToDelete",
+        lambda: [str(tmp_path / "app.log.sumiu"), str(antigo)],
+    )
+    handler.rolloverAt = int(time.time()) - 1
+
+    handler.doRollover()
+    handler.emit(make_record("hoje"))
+    handler.close()
+
+    assert not antigo.exists()
+    assert handler.rolloverAt > time.time()
+    assert (tmp_path / "app.log").read_text(encoding="utf-8") == "hoje\n"
+    assert len(rotated_files(tmp_path)) == 1
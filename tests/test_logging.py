@@ -0,0 +1,135 @@
+import json
+import logging
+import queue
+
+import pytest
+
+from app.core.config import settings
+from app.core.logging import (
+    BoundedQueueHandler,
+    JsonFormatter,
+    KeyValueFormatter,
+    log_info,
+    log_warning,
+    logger,
+    queue_handler,
+)
+
+
+def make_record(message="Listando metas", **extra):
+    record = logging.LogRecord(
+        "itau_performance", logging.INFO, __file__, 1, message, None, None
+    )
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+@pytest.mark.unit
+def test_formatter_appends_fields_and_error():
+    """
+    Testa a montagem "mensagem | Error: ... | chave=valor" na formatação
+    """
+    formatter = KeyValueFormatter("%(levelname)s - %(message)s")
+    record = make_record(
+        "Falha ao salvar", erro=ValueError("boom"), campos={"meta_id": 1, "total": 2}
+    )
+
+    assert formatter.format(record) == (
+        "INFO - Falha ao salvar | Error: boom | meta_id=1 | total=2"
+    )
+
+
+@pytest.mark.unit
+def test_formatter_without_fields():
+    """
+    Testa que mensagens sem campos saem inalteradas
+    """
+    formatter = KeyValueFormatter("%(message)s")
+
+    assert formatter.format(make_record(campos={})) == "Listando metas"
+
+
+@pytest.mark.unit
+def test_bounded_queue_drops_and_reports():
+    """
+    Testa que a fila cheia descarta sem bloquear e depois reporta os descartes
+    """
+    fila = queue.Queue(maxsize=2)
+    handler = BoundedQueueHandler(fila)
+
+    for message in ["primeiro", "segundo", "descartado 1", "descartado 2"]:
+        handler.handle(make_record(message))
+
+    assert handler.descartados == 2
+    assert [fila.get_nowait().msg, fila.get_nowait().msg] == ["primeiro", "segundo"]
+
+    handler.handle(make_record("terceiro"))
+
+    assert fila.get_nowait().msg == "terceiro"
+    aviso = fila.get_nowait()
+    assert aviso.levelno == logging.WARNING
+    assert aviso.campos == {"descartados": 2}
+
+
+@pytest.mark.unit
+def test_log_info_is_not_formatted_on_caller_thread(monkeypatch):
+    """
+    Testa que log_info só enfileira o registro, com os campos ainda separados
+    """
+    fila = queue.Queue()
+    monkeypatch.setattr(queue_handler, "queue", fila)
+
+    log_info("Listando metas", usuario="admin", total=3)
+
+    record = fila.get_nowait()
+    assert record.getMessage() == "Listando metas"
+    assert record.campos == {"usuario": "admin", "total": 3}
+    assert logger.isEnabledFor(logging.INFO)
+
+
+@pytest.mark.unit
+def test_json_formatter():
+    """
+    Testa a saída estruturada em JSON com os campos no primeiro nível
+    """
+    record = make_record(
+        "Falha ao salvar",
+        erro=ValueError("boom"),
+        campos={"meta_id": 1, "usuario": "admin"},
+        taxa_amostragem=0.5,
+    )
+
+    documento = json.loads(JsonFormatter().format(record))
+
+    assert documento["event"] == "Falha ao salvar"
+    assert documento["level"] == "INFO"
+    assert documento["meta_id"] == 1
+    assert documento["usuario"] == "admin"
+    assert documento["error"] == "boom"
+    assert documento["sample_rate"] == 0.5
+
+
+@pytest.mark.unit
+def test_sampled_events(monkeypatch):
+    """
+    Testa que eventos amostrados são descartados e avisos são sempre mantidos
+    """
+    fila = queue.Queue()
+    monkeypatch.setattr(queue_handler, "queue", fila)
+    monkeypatch.setattr(
+        settings,
+        "LOG_SAMPLE_RATES",
+        {"Listando metas": 0.0, "Metas listadas": 1.0, "Meta não encontrada": 0.0},
+    )
+
+    log_info("Listando metas", usuario="admin")
+    log_info("Metas listadas", total=1)
+    log_info("Criando nova meta", titulo="Meta")
+    log_warning("Meta não encontrada", meta_id=1)
+
+    mensagens = []
+    while not fila.empty():
+        mensagens.append(fila.get_nowait().getMessage())
+
+    assert mensagens == ["Metas listadas", "Criando nova meta", "Meta não encontrada"]
@@ -123,3 +123,19 @@ def test_delete_meta(client, admin_token, db_session, ciclo_ativo, regular_user)
     )
 
     assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.unit
+def test_get_metas_lote(client, admin_token, meta_sample):
+    """
+    Testa busca de metas em lote, mantendo a ordem e reportando IDs inexistentes
+    """
+    response = client.get(
+        f"/api/metas/lote?ids=9999&ids={meta_sample.id}&ids=9999",
+        headers=get_auth_headers(admin_token),
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [item["id"] for item in data["itens"]] == [meta_sample.id]
+    assert data["nao_encontrados"] == [9999]
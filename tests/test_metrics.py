@@ -0,0 +1,152 @@
+import os
+
+import pytest
+from fastapi import status
+
+from app.core.metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    Metric,
+    MetricsRegistry,
+    generate_latest,
+    merge_snapshots,
+    read_snapshots,
+    render,
+    write_snapshot,
+)
+from app.core.config import settings
+from tests.conftest import get_auth_headers
+
+
+def sample_value(text: str, prefix: str) -> float:
+    """
+    Retorna o valor da primeira linha da exposição que começa com prefix
+    """
+    for linha in text.splitlines():
+        if linha.startswith(prefix):
+            return float(linha.rsplit(" ", 1)[1])
+    raise AssertionError(f"Série não encontrada: {prefix}")
+
+
+@pytest.mark.unit
+def test_metrics_endpoint_route_template(client, admin_token, avaliacao_sample):
+    """
+    Testa que as requisições são contadas pelo template da rota, não pelo ID
+    """
+    antes = client.get("/metrics").text
+    serie = (
+        'http_requests_total{method="GET",'
+        'route="/api/avaliacoes/{avaliacao_id}",status="200"}'
+    )
+    try:
+        inicial = sample_value(antes, serie)
+    except AssertionError:
+        inicial = 0
+
+    client.get(
+        f"/api/avaliacoes/{avaliacao_sample.id}",
+        headers=get_auth_headers(admin_token),
+    )
+    response = client.get("/metrics")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert sample_value(response.text, serie) == inicial + 1
+    assert "http_request_duration_seconds_bucket{" in response.text
+    assert f"/api/avaliacoes/{avaliacao_sample.id}" not in response.text
+    assert 'route="/metrics"' not in response.text
+
+
+@pytest.mark.unit
+def test_metrics_login_and_bcrypt(client, admin_user):
+    """
+    Testa as métricas de login e do tempo de verificação bcrypt
+    """
+    client.post("/api/auth/login", json={"matricula": "admin", "senha": "errada"})
+    response = client.get("/metrics")
+
+    assert 'auth_logins_total{resultado="senha_incorreta"}' in response.text
+    assert (
+        sample_value(
+            response.text, 'password_hash_duration_seconds_count{operacao="verify"}'
+        )
+        >= 1
+    )
+
+
+@pytest.mark.unit
+def test_histogram_render():
+    """
+    Testa a exposição de um histograma com buckets acumulados
+    """
+    registry = MetricsRegistry()
+    histograma = Histogram(
+        "latencia", "Latência", ["rota"], buckets=(0.1, 1.0), registry=registry
+    )
+    histograma.labels(rota="/a").observe(0.05)
+    histograma.labels(rota="/a").observe(0.5)
+    histograma.labels(rota="/a").observe(5)
+
+    texto = render(registry.snapshot())
+
+    assert "# TYPE latencia histogram" in texto
+    assert 'latencia_bucket{rota="/a",le="0.1"} 1' in texto
+    assert 'latencia_bucket{rota="/a",le="1"} 2' in texto
+    assert 'latencia_bucket{rota="/a",le="+Inf"} 3' in texto
+    assert 'latencia_count{rota="/a"} 3' in texto
+    assert 'latencia_sum{rota="/a"} 5.55' in texto
+
+
+@pytest.mark.unit
+def test_metric_base_is_abstract():
+    """
+    Testa que só os tipos concretos (com _new_child) podem ser criados
+    """
+    with pytest.raises(TypeError):
+        Metric("sem_tipo", "Sem tipo", registry=MetricsRegistry())
+
+
+@pytest.mark.unit
+def test_merge_snapshots_across_processes():
+    """
+    Testa a soma de contadores entre processos e o label pid nos gauges
+    """
+    registry = MetricsRegistry()
+    contador = Counter("requisicoes", "Requisições", ["rota"], registry=registry)
+    gauge = Gauge("conexoes", "Conexões", registry=registry)
+
+    contador.labels(rota="/a").inc(2)
+    gauge.labels().set(3)
+    primeiro = registry.snapshot()
+    contador.labels(rota="/a").inc(5)
+    segundo = registry.snapshot()
+
+    pid_morto = 2**22 + 1
+    texto = render(merge_snapshots({os.getpid(): segundo, pid_morto: primeiro}))
+
+    assert 'requisicoes{rota="/a"} 9' in texto
+    assert f'conexoes{{pid="{os.getpid()}"}} 3' in texto
+    assert f'pid="{pid_morto}"' not in texto
+
+
+@pytest.mark.unit
+def test_multiprocess_directory(tmp_path, monkeypatch):
+    """
+    Testa a agregação pelos snapshots gravados em METRICS_MULTIPROC_DIR
+    """
+    registry = MetricsRegistry()
+    contador = Counter("jobs_total", "Jobs", registry=registry)
+    contador.labels().inc(4)
+    write_snapshot(str(tmp_path), registry)
+
+    # Snapshot de outro worker (já encerrado)
+    outro = tmp_path / "metrics_99999999.json"
+    (tmp_path / f"metrics_{os.getpid()}.json").rename(outro)
+
+    assert set(read_snapshots(str(tmp_path))) == {99999999}
+
+    contador.labels().inc(1)
+    monkeypatch.setattr(settings, "METRICS_MULTIPROC_DIR", str(tmp_path))
+
+    assert "jobs_total 9" in generate_latest(registry)
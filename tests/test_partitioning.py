@@ -0,0 +1,95 @@
+import pytest
+from fastapi import status
+
+from app.core.config import settings
+from app.db import partitioning
+from app.routers import ciclos
+from tests.conftest import get_auth_headers
+
+
+class ConexaoFalsa:
+    """Registra os comandos em vez de executá-los (os testes usam SQLite)"""
+
+    def __init__(self):
+        self.comandos = []
+
+    def execute(self, stmt):
+        self.comandos.append(str(stmt))
+
+
+@pytest.mark.unit
+def test_partition_table_args_only_on_postgres(monkeypatch):
+    """
+    Testa que o particionamento só vale com a opção ligada e PostgreSQL
+    """
+    monkeypatch.setattr(settings, "DB_PARTITION_BY_CICLO", True)
+    monkeypatch.setattr(settings, "DATABASE_URL", "sqlite:///./teste.db")
+    assert partitioning.partition_table_args() == {}
+
+    monkeypatch.setattr(settings, "DATABASE_URL", "postgresql://u:s@host/banco")
+    assert partitioning.partition_table_args() == {
+        "postgresql_partition_by": "LIST (ciclo_id)"
+    }
+
+
+@pytest.mark.unit
+def test_create_ciclo_partitions():
+    """
+    Testa o DDL das partições de avaliações e metas de um ciclo
+    """
+    conexao = ConexaoFalsa()
+
+    partitioning.create_ciclo_partitions(conexao, 7)
+
+    assert conexao.comandos == [
+        "CREATE TABLE IF NOT EXISTS avaliacoes_comportamentais_ciclo_7 "
+        "PARTITION OF avaliacoes_comportamentais FOR VALUES IN (7)",
+        "CREATE TABLE IF NOT EXISTS metas_ciclo_7 "
+        "PARTITION OF metas FOR VALUES IN (7)",
+    ]
+
+
+@pytest.mark.unit
+def test_detach_ciclo_partitions_to_tablespace():
+    """
+    Testa o DETACH seguido da troca de tablespace e a validação do nome
+    """
+    conexao = ConexaoFalsa()
+
+    partitioning.detach_ciclo_partitions(conexao, 3, "arquivo")
+
+    assert conexao.comandos[:2] == [
+        "ALTER TABLE avaliacoes_comportamentais "
+        "DETACH PARTITION avaliacoes_comportamentais_ciclo_3",
+        "ALTER TABLE avaliacoes_comportamentais_ciclo_3 SET TABLESPACE arquivo",
+    ]
+    with pytest.raises(ValueError):
+        partitioning.detach_ciclo_partitions(conexao, 3, "arquivo; DROP TABLE x")
+
+
+@pytest.mark.unit
+def test_create_ciclo_creates_partitions(client, admin_token, monkeypatch):
+    """
+    Testa que criar um ciclo cria suas partições quando o particionamento
+    está ligado
+    """
+    criadas = []
+    monkeypatch.setattr(ciclos, "partitioning_enabled", lambda: True)
+    monkeypatch.setattr(
+        ciclos, "create_ciclo_partitions", lambda db, ciclo_id: criadas.append(ciclo_id)
+    )
+
+    response = client.post(
+        "/api/ciclos/",
+        json={
+            "ano": 2030,
+            "descricao": "Ciclo 2030",
+            "data_inicio": "2030-01-01",
+            "data_fim": "2030-12-31",
+            "status": "planejamento",
+        },
+        headers=get_auth_headers(admin_token),
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert criadas == [response.json()["id"]]
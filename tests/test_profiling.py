@@ -0,0 +1,150 @@
+import pstats
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.profiling import (
+    ProfilingMiddleware,
+    RequestProfile,
+    _active_profile,
+    profile_endpoint,
+)
+from app.main import app
+from tests.conftest import get_auth_headers
+
+
+@pytest.fixture
+def profiling_settings(tmp_path, monkeypatch):
+    """
+    Configura o admin e o diretório dos perfis para o teste
+    """
+    monkeypatch.setattr(settings, "ADMIN_MATRICULAS", "admin")
+    monkeypatch.setattr(settings, "PROFILING_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "PROFILING_SAMPLE_RATE", 1.0)
+    return tmp_path
+
+
+@pytest.fixture
+def profiled_client(client, profiling_settings):
+    """
+    Cliente da aplicação envolvida pelo ProfilingMiddleware
+    """
+    with TestClient(ProfilingMiddleware(app)) as test_client:
+        yield test_client
+
+
+def profile_headers(token: str) -> dict:
+    return {**get_auth_headers(token), "X-Profile": "1"}
+
+
+@pytest.mark.unit
+def test_profile_admin_request(profiled_client, admin_token, profiling_settings):
+    """
+    Testa que a requisição de um admin com X-Profile gera um perfil baixável
+    """
+    response = profiled_client.get("/api/ciclos/", headers=profile_headers(admin_token))
+
+    assert response.status_code == status.HTTP_200_OK
+    profile_id = response.headers["x-profile-id"]
+    assert (profiling_settings / f"{profile_id}.prof").is_file()
+
+    download = profiled_client.get(
+        f"/api/profiling/{profile_id}", headers=get_auth_headers(admin_token)
+    )
+    assert download.status_code == status.HTTP_200_OK
+    assert download.headers["content-type"] == "application/octet-stream"
+
+    texto = profiled_client.get(
+        f"/api/profiling/{profile_id}?formato=texto",
+        headers=get_auth_headers(admin_token),
+    )
+    assert "cumulative" in texto.text
+
+    listagem = profiled_client.get(
+        "/api/profiling/", headers=get_auth_headers(admin_token)
+    )
+    assert [perfil["id"] for perfil in listagem.json()] == [profile_id]
+
+
+@pytest.mark.unit
+def test_profile_query_flag(profiled_client, admin_token):
+    """
+    Testa o pedido de perfil via ?profile=1
+    """
+    response = profiled_client.get(
+        "/api/ciclos/?profile=1", headers=get_auth_headers(admin_token)
+    )
+
+    assert "x-profile-id" in response.headers
+
+
+@pytest.mark.unit
+def test_profile_ignored_for_non_admin(profiled_client, user_token):
+    """
+    Testa que pedidos de perfil de não administradores são ignorados
+    """
+    response = profiled_client.get("/api/ciclos/", headers=profile_headers(user_token))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "x-profile-id" not in response.headers
+
+
+@pytest.mark.unit
+def test_profile_sample_rate(profiled_client, admin_token, monkeypatch):
+    """
+    Testa que a taxa de amostragem zero desliga o profiling
+    """
+    monkeypatch.setattr(settings, "PROFILING_SAMPLE_RATE", 0.0)
+
+    response = profiled_client.get("/api/ciclos/", headers=profile_headers(admin_token))
+
+    assert "x-profile-id" not in response.headers
+
+
+@pytest.mark.unit
+def test_profiling_endpoints_require_admin(client, user_token, profiling_settings):
+    """
+    Testa que apenas administradores acessam os perfis
+    """
+    response = client.get("/api/profiling/", headers=get_auth_headers(user_token))
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.unit
+def test_download_invalid_profile_id(client, admin_token, profiling_settings):
+    """
+    Testa que IDs malformados ou inexistentes retornam 404
+    """
+    for profile_id in ["..%2F..%2Fetc", "0" * 32]:
+        response = client.get(
+            f"/api/profiling/{profile_id}", headers=get_auth_headers(admin_token)
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.unit
+def test_profile_endpoint_wrapper(tmp_path):
+    """
+    Testa que o endpoint síncrono só é perfilado dentro de uma requisição
+    perfilada
+    """
+
+    def soma(n):
+        return sum(range(n))
+
+    endpoint = profile_endpoint(soma)
+    assert endpoint(10) == 45
+
+    profile = RequestProfile()
+    token = _active_profile.set(profile)
+    try:
+        endpoint(1000)
+    finally:
+        _active_profile.reset(token)
+
+    profile.dump(tmp_path / "perfil.prof")
+    stats = pstats.Stats(str(tmp_path / "perfil.prof"))
+    assert any(funcao[2] == "soma" for funcao in stats.stats)
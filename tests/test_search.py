@@ -0,0 +1,171 @@
+import pytest
+from fastapi import status
+
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.db import search
+from app.db.search import normalize_terms, search_colaboradores
+from app.models.colaborador import Colaborador
+from tests.conftest import get_auth_headers
+
+
+@pytest.fixture
+def colaboradores_busca(db_session):
+    dados = [
+        ("B001", "João Silveira", "Analista", "Tecnologia", True),
+        ("B002", "Joana Souza", "Gerente", "Operações", True),
+        ("B003", "Márcia Joaquina", "Coordenadora", "Tecnologia", True),
+        ("B004", "João Antigo", "Analista", "Tecnologia", False),
+    ]
+    for matricula, nome, cargo, departamento, ativo in dados:
+        db_session.add(
+            Colaborador(
+                matricula=matricula,
+                nome=nome,
+                email=f"{matricula.lower()}@empresa.com.br",
+                senha_hash=get_password_hash("senha123"),
+                cargo=cargo,
+                departamento=departamento,
+                ativo=ativo,
+            )
+        )
+    db_session.commit()
+
+
+@pytest.mark.unit
+def test_normalize_terms():
+    """
+    Testa que os termos perdem acentos, maiúsculas e pontuação
+    """
+    assert normalize_terms("  JOÃO, Sil% ") == ["joao", "sil"]
+    assert normalize_terms("***") == []
+
+
+@pytest.mark.unit
+def test_busca_por_prefixo_sem_acento(client, admin_token, colaboradores_busca):
+    """
+    Testa que o prefixo sem acento encontra o nome acentuado
+    """
+    response = client.get(
+        "/api/colaboradores/busca",
+        params={"q": "joao sil"},
+        headers=get_auth_headers(admin_token),
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [c["matricula"] for c in response.json()] == ["B001"]
+
+
+@pytest.mark.unit
+def test_busca_em_varios_campos_e_inativos(db_session, colaboradores_busca):
+    """
+    Testa a busca por cargo/departamento, com e sem inativos
+    """
+    ativos = search_colaboradores(db_session, "analista tecno")
+    todos = search_colaboradores(db_session, "analista tecno", incluir_inativos=True)
+
+    assert [c.matricula for c in ativos] == ["B001"]
+    assert {c.matricula for c in todos} == {"B001", "B004"}
+
+
+@pytest.mark.unit
+def test_busca_paginada(db_session, colaboradores_busca):
+    """
+    Testa skip/limit sobre os resultados ordenados
+    """
+    primeira = search_colaboradores(db_session, "jo", limit=2)
+    segunda = search_colaboradores(db_session, "jo", skip=2, limit=2)
+
+    assert len(primeira) == 2
+    assert {c.matricula for c in primeira + segunda} == {"B001", "B002", "B003"}
+
+
+@pytest.mark.unit
+def test_busca_acompanha_alteracoes(client, admin_token, colaboradores_busca):
+    """
+    Testa que o índice reflete a edição do nome
+    """
+    headers = get_auth_headers(admin_token)
+    client.put(
+        "/api/colaboradores/B002", json={"nome": "Renata Souza"}, headers=headers
+    )
+
+    antigo = client.get(
+        "/api/colaboradores/busca", params={"q": "joana"}, headers=headers
+    )
+    novo = client.get(
+        "/api/colaboradores/busca", params={"q": "renat"}, headers=headers
+    )
+
+    assert antigo.json() == []
+    assert [c["matricula"] for c in novo.json()] == ["B002"]
+
+
+@pytest.mark.unit
+def test_busca_sem_termo_invalida(client, admin_token):
+    """
+    Testa que a busca sem termo retorna 422
+    """
+    response = client.get(
+        "/api/colaboradores/busca", headers=get_auth_headers(admin_token)
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.unit
+def test_busca_sem_indice_usa_like(db_session, colaboradores_busca, monkeypatch):
+    """
+    Testa o fallback com LIKE quando o banco não tem o índice de busca
+    """
+    monkeypatch.setitem(search._disponivel, db_session.get_bind(), False)
+
+    resultado = search_colaboradores(db_session, "tecnologia silv")
+
+    assert [c.matricula for c in resultado] == ["B001"]
+
+
+def _novo_colaborador(db_session, matricula, nome, cargo, departamento):
+    db_session.add(
+        Colaborador(
+            matricula=matricula,
+            nome=nome,
+            email=f"{matricula.lower()}@empresa.com.br",
+            senha_hash=get_password_hash("senha123"),
+            cargo=cargo,
+            departamento=departamento,
+        )
+    )
+    db_session.commit()
+
+
+@pytest.mark.unit
+def test_busca_inativos_nao_ocupam_candidatos(
+    db_session, colaboradores_busca, monkeypatch
+):
+    """
+    Testa que inativos não consomem o limite de candidatos do índice
+    """
+    monkeypatch.setattr(settings, "SEARCH_MAX_CANDIDATES", 1)
+    # B004 (inativo, id menor) também casa com "antigo"
+    _novo_colaborador(db_session, "B005", "Pedro Antigo", "Analista", "Vendas")
+
+    resultado = search_colaboradores(db_session, "antigo", limit=1)
+
+    assert [c.matricula for c in resultado] == ["B005"]
+
+
+@pytest.mark.unit
+def test_busca_candidatos_mais_relevantes(db_session, colaboradores_busca, monkeypatch):
+    """
+    Testa que o limite de candidatos mantém os mais relevantes, não os
+    primeiros do índice
+    """
+    monkeypatch.setattr(settings, "SEARCH_MAX_CANDIDATES", 1)
+    _novo_colaborador(
+        db_session, "B005", "Tecnologia Tecnologia", "Tecnologia", "Tecnologia"
+    )
+
+    resultado = search_colaboradores(db_session, "tecnologia", limit=1)
+
+    assert [c.matricula for c in resultado] == ["B005"]
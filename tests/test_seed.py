@@ -0,0 +1,98 @@
+import pytest
+from sqlalchemy import create_engine, func, select
+
+from app.db.seed import (
+    BulkWriter,
+    GeradorOrganizacao,
+    calcular_ramificacao,
+    indice_gestor,
+    seed,
+)
+from app.models.avaliacao import AvaliacaoComportamental, Ciclo, Meta, StatusCiclo
+from app.models.colaborador import Colaborador
+
+
+def contar(engine, modelo) -> int:
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(modelo)).scalar_one()
+
+
+@pytest.fixture
+def seed_engine(tmp_path):
+    """
+    Engine SQLite em arquivo, separada do banco dos demais testes
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'seed.db'}")
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.unit
+def test_gestor_tree_depth():
+    """
+    Testa que a árvore de gestores tem a profundidade pedida
+    """
+    gerador = GeradorOrganizacao(1000, profundidade=4, semente=1)
+
+    assert gerador.ramificacao == calcular_ramificacao(1000, 4) == 10
+    assert gerador.profundidade_real() == 4
+    assert indice_gestor(0, 10) is None
+    assert indice_gestor(10, 10) == 0
+    assert indice_gestor(11, 10) == 1
+
+
+@pytest.mark.unit
+def test_seed_is_idempotent(seed_engine):
+    """
+    Testa que rodar o seed duas vezes não duplica linhas
+    """
+    primeiro = seed(
+        seed_engine, GeradorOrganizacao(40, pares=2, metas=2), ciclos=2, lote=25
+    )
+
+    colaboradores = contar(seed_engine, Colaborador)
+    avaliacoes = contar(seed_engine, AvaliacaoComportamental)
+    metas = contar(seed_engine, Meta)
+    assert colaboradores == 40
+    assert metas == 40 * 2 * 2
+    assert avaliacoes == primeiro["avaliacoes"]["linhas"]
+    assert primeiro["colaboradores"]["linhas_por_segundo"] > 0
+
+    segundo = seed(
+        seed_engine, GeradorOrganizacao(40, pares=2, metas=2), ciclos=2, lote=25
+    )
+
+    assert contar(seed_engine, Colaborador) == colaboradores
+    assert contar(seed_engine, AvaliacaoComportamental) == avaliacoes
+    assert contar(seed_engine, Meta) == metas
+    assert segundo["avaliacoes"]["linhas"] == 0
+    assert segundo["metas"]["linhas"] == 0
+
+    with seed_engine.connect() as conn:
+        status = dict(conn.execute(select(Ciclo.ano, Ciclo.status)).all())
+    assert status == {2025: StatusCiclo.EM_ANDAMENTO, 2024: StatusCiclo.FINALIZADO}
+
+
+@pytest.mark.unit
+def test_seed_resumes_missing_colaboradores(seed_engine):
+    """
+    Testa que o seed completa avaliações/metas de quem ainda não as tem
+    """
+    seed(seed_engine, GeradorOrganizacao(20, pares=1, metas=1), lote=10)
+    with seed_engine.begin() as conn:
+        conn.execute(
+            Meta.__table__.delete().where(Meta.colaborador_matricula == "C0000005")
+        )
+
+    relatorio = seed(seed_engine, GeradorOrganizacao(20, pares=1, metas=1), lote=10)
+
+    assert relatorio["metas"]["linhas"] == 1
+    assert contar(seed_engine, Meta) == 20
+
+
+@pytest.mark.unit
+def test_bulk_writer_uses_insert_outside_postgres(seed_engine):
+    """
+    Testa que COPY só é usado no PostgreSQL
+    """
+    assert BulkWriter(seed_engine).usar_copy is False
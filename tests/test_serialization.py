@@ -0,0 +1,126 @@
+import json
+from datetime import date, datetime
+
+import pytest
+from fastapi import status
+from fastapi.responses import JSONResponse
+from tests.conftest import get_auth_headers
+
+from app.core import serialization
+from app.core.config import settings
+from app.core.serialization import get_list_adapter, serialize_list
+from app.schemas.avaliacao import MetaResponse
+
+
+@pytest.mark.unit
+def test_list_adapter_is_cached():
+    """
+    Testa que o TypeAdapter é construído uma única vez por schema
+    """
+    assert get_list_adapter(MetaResponse) is get_list_adapter(MetaResponse)
+
+
+@pytest.mark.unit
+def test_serialize_list_from_orm(meta_sample):
+    """
+    Testa serialização direta de objetos ORM para bytes JSON
+    """
+    body = serialize_list(MetaResponse, [meta_sample])
+
+    assert body.startswith(b"[{")
+    assert b'"titulo":"Meta de Teste"' in body
+
+
+@pytest.mark.unit
+def test_partial_response_without_orjson(monkeypatch):
+    """
+    Testa que a resposta de fields= cai para o JSONResponse sem o orjson,
+    com o mesmo conteúdo
+    """
+    campos = ["id", "data_limite", "criado_em"]
+    rows = [(1, date(2025, 12, 31), datetime(2025, 1, 10, 8, 30))]
+    with_orjson = serialization.partial_response(campos, rows)
+
+    monkeypatch.setattr(serialization, "orjson", None)
+    without_orjson = serialization.partial_response(campos, rows)
+
+    assert isinstance(without_orjson, JSONResponse)
+    assert json.loads(without_orjson.body) == json.loads(with_orjson.body)
+
+
+@pytest.mark.unit
+def test_fast_json_response_matches_default(
+    client, admin_token, meta_sample, monkeypatch
+):
+    """
+    Testa que o caminho rápido devolve o mesmo conteúdo do caminho padrão
+    """
+    headers = get_auth_headers(admin_token)
+    default = client.get("/api/metas/", headers=headers)
+
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSE", True)
+    fast = client.get("/api/metas/", headers=headers)
+
+    assert fast.status_code == status.HTTP_200_OK
+    assert fast.headers["content-type"] == "application/json"
+    assert fast.json() == default.json()
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/api/colaboradores/",
+        "/api/colaboradores/busca?q=teste",
+        "/api/colaboradores/admin/subordinados",
+        "/api/avaliacoes/",
+        "/api/avaliacoes/pendentes",
+        "/api/metas/",
+    ],
+)
+def test_fast_json_response_parity(
+    client,
+    admin_token,
+    regular_user,
+    avaliacao_sample,
+    meta_sample,
+    db_session,
+    monkeypatch,
+    url,
+):
+    """
+    Testa que o caminho rápido devolve exatamente os mesmos bytes do
+    response_model em cada listagem (enums, datas, floats, opcionais e o
+    email normalizado pelo EmailStr)
+    """
+    regular_user.email = "user@TEST.com"
+    meta_sample.resultado_alcancado = 80
+    db_session.commit()
+    headers = get_auth_headers(admin_token)
+    default = client.get(url, headers=headers)
+
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSE", True)
+    fast = client.get(url, headers=headers)
+
+    assert default.status_code == fast.status_code == status.HTTP_200_OK
+    assert default.json()
+    assert fast.content == default.content
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("url", ["/api/avaliacoes/minhas", "/api/metas/minhas"])
+def test_fast_json_response_parity_minhas(
+    client, user_token, avaliacao_sample, meta_sample, monkeypatch, url
+):
+    """
+    Testa a paridade dos dois caminhos nas listagens do colaborador logado
+    """
+    headers = get_auth_headers(user_token)
+    default = client.get(url, headers=headers)
+
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSE", True)
+    fast = client.get(url, headers=headers)
+
+    assert default.status_code == fast.status_code == status.HTTP_200_OK
+    assert default.json()
+    assert fast.content == default.content
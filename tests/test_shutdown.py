@@ -0,0 +1,161 @@
+import asyncio
+import signal
+
+import pytest
+from fastapi import status
+from sqlalchemy import create_engine, text
+
+from app.core import shutdown
+from app.core.metrics import SHUTDOWN_DRAIN_SECONDS
+from app.core.shutdown import (
+    DrainState,
+    drain_state,
+    graceful_shutdown,
+    install_drain_signal_handler,
+)
+
+
+@pytest.mark.unit
+def test_drain_waits_for_in_flight_requests():
+    """
+    Testa que o drain espera as requisições em andamento terminarem
+    """
+    state = DrainState()
+    state.iniciar_requisicao()
+
+    async def cenario():
+        async def terminar():
+            await asyncio.sleep(0.1)
+            state.finalizar_requisicao()
+
+        tarefa = asyncio.create_task(terminar())
+        concluido = await state.drenar(timeout=5)
+        await tarefa
+        return concluido
+
+    antes = SHUTDOWN_DRAIN_SECONDS.labels(resultado="concluido").snapshot()["counts"]
+
+    assert asyncio.run(cenario()) is True
+    assert state.drenando
+    assert state.em_andamento == 0
+    depois = SHUTDOWN_DRAIN_SECONDS.labels(resultado="concluido").snapshot()["counts"]
+    assert sum(depois) == sum(antes) + 1
+
+
+@pytest.mark.unit
+def test_drain_gives_up_after_timeout():
+    """
+    Testa que o drain desiste após o timeout se a requisição não termina
+    """
+    state = DrainState()
+    state.iniciar_requisicao()
+
+    assert asyncio.run(state.drenar(timeout=0.1)) is False
+    assert state.em_andamento == 1
+
+
+@pytest.mark.unit
+def test_requests_rejected_while_draining(client, monkeypatch):
+    """
+    Testa que novas requisições recebem 503 durante o desligamento
+    """
+    monkeypatch.setattr(drain_state, "drenando", True)
+
+    response = client.get("/health/ready")
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.headers["retry-after"] == "5"
+    assert response.headers["connection"] == "close"
+    assert "desligamento" in response.json()["detail"]
+
+
+@pytest.mark.unit
+def test_in_flight_counter_returns_to_zero(client):
+    """
+    Testa que o contador de requisições em andamento volta a zero
+    """
+    response = client.get("/health")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert drain_state.em_andamento == 0
+
+
+@pytest.mark.unit
+def test_graceful_shutdown_disposes_pool(monkeypatch):
+    """
+    Testa que o desligamento fecha as conexões do pool e esvazia os logs
+    """
+    chamadas = []
+    monkeypatch.setattr(shutdown, "stop_logging", lambda: chamadas.append("logs"))
+    monkeypatch.setattr(shutdown, "drain_state", DrainState())
+    engine = create_engine("sqlite:///:memory:")
+    with engine.connect() as conexao:
+        conexao.execute(text("SELECT 1"))
+    pool_original = engine.pool
+
+    asyncio.run(graceful_shutdown(engine, timeout=1))
+
+    assert engine.pool is not pool_original
+    assert chamadas == ["logs"]
+
+
+@pytest.fixture
+def sigterm_handler():
+    """
+    Handler de SIGTERM falso no lugar do uvicorn, com um event loop próprio
+    """
+    repassados = []
+    original = signal.signal(signal.SIGTERM, lambda sig, frame: repassados.append(sig))
+    loop = asyncio.new_event_loop()
+    yield loop, repassados
+    signal.signal(signal.SIGTERM, original)
+    drain_state.reiniciar()
+    loop.close()
+
+
+@pytest.mark.unit
+def test_sigterm_drains_before_forwarding(client, sigterm_handler):
+    """
+    Testa que o SIGTERM põe o processo em drain na hora (503 para novas
+    requisições e para /health/ready) e só repassa o sinal ao uvicorn quando
+    as requisições em andamento terminam
+    """
+    loop, repassados = sigterm_handler
+    assert install_drain_signal_handler(loop, timeout=5)
+    drain_state.iniciar_requisicao()  # requisição em andamento
+
+    signal.raise_signal(signal.SIGTERM)
+    pronto = client.get("/health/ready")
+    nova = client.get("/api/ciclos/")
+
+    assert pronto.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert pronto.headers["retry-after"] == "5"
+    assert nova.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert repassados == []
+
+    drain_state.finalizar_requisicao()
+    loop.run_until_complete(asyncio.sleep(0.2))
+
+    assert repassados == [signal.SIGTERM]
+    assert drain_state.drenado
+
+
+@pytest.mark.unit
+def test_second_sigterm_forwards_immediately(sigterm_handler):
+    """
+    Testa que um segundo SIGTERM durante o drain é repassado na hora
+    """
+    loop, repassados = sigterm_handler
+    state = DrainState()
+    install_drain_signal_handler(loop, timeout=5, state=state)
+    state.iniciar_requisicao()
+
+    signal.raise_signal(signal.SIGTERM)
+    signal.raise_signal(signal.SIGTERM)
+
+    assert state.drenando
+    assert repassados == [signal.SIGTERM]
+
+    state.finalizar_requisicao()
+    loop.run_until_complete(asyncio.sleep(0.2))
+    assert repassados == [signal.SIGTERM, signal.SIGTERM]
@@ -0,0 +1,310 @@
+from datetime import date
+
+import pytest
+from fastapi import status
+
+from app.core.config import settings
+from app.db.snapshots import (
+    CACHE_CONTROL_SNAPSHOT,
+    CICLO_FINALIZADO_DETAIL,
+    build_snapshot,
+    finalized_ciclos,
+)
+from app.models.avaliacao import AvaliacaoComportamental, Ciclo, Meta
+from app.models.snapshot import CicloSnapshot, ResultadoCiclo
+from tests.conftest import get_auth_headers
+
+
+def avaliacao(ciclo_id, avaliado, avaliador, media, status_avaliacao):
+    return AvaliacaoComportamental(
+        ciclo_id=ciclo_id,
+        avaliado_matricula=avaliado,
+        avaliador_matricula=avaliador,
+        tipo_avaliacao="AVALIACAO_GESTOR",
+        lideranca=3,
+        comunicacao=3,
+        trabalho_equipe=3,
+        resolucao_problemas=3,
+        adaptabilidade=3,
+        media_competencias=media,
+        status=status_avaliacao,
+    )
+
+
+@pytest.fixture
+def dados_ciclo(db_session, ciclo_ativo, admin_user, regular_user, another_user):
+    """
+    user001 (Tecnologia): avaliação 4.4 e metas 80% (peso 30) e 50% (peso 70)
+    user002 (Operações): avaliação 3.0 concluída e uma pendente, sem metas
+    """
+    db_session.add_all(
+        [
+            avaliacao(ciclo_ativo.id, "user001", "admin", 4.4, "CONCLUIDA"),
+            avaliacao(ciclo_ativo.id, "user002", "admin", 3.0, "CONCLUIDA"),
+            avaliacao(ciclo_ativo.id, "user002", "user001", 1.0, "PENDENTE"),
+        ]
+    )
+    for peso, resultado in ((30, 80), (70, 50)):
+        db_session.add(
+            Meta(
+                ciclo_id=ciclo_ativo.id,
+                colaborador_matricula="user001",
+                titulo=f"Meta {peso}",
+                peso=peso,
+                data_limite=date(2025, 12, 31),
+                resultado_alcancado=resultado,
+            )
+        )
+    db_session.commit()
+    return ciclo_ativo
+
+
+def finalizar(client, token, ciclo_id):
+    return client.put(
+        f"/api/ciclos/{ciclo_id}",
+        json={"status": "finalizado"},
+        headers=get_auth_headers(token),
+    )
+
+
+@pytest.mark.unit
+def test_resultado_ao_vivo_sem_cache(client, admin_token, dados_ciclo):
+    """
+    Testa o resumo calculado na hora para ciclo em andamento
+    """
+    response = client.get(
+        f"/api/resultados/ciclo/{dados_ciclo.id}",
+        headers=get_auth_headers(admin_token),
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["Cache-Control"] == "private, no-cache"
+    data = response.json()
+    assert data["finalizado"] is False
+    assert data["total_colaboradores"] == 2
+    assert data["total_avaliacoes"] == 2
+    assert data["total_metas"] == 2
+    assert data["media_comportamental"] == pytest.approx(3.7)
+    assert data["resultado_metas"] == pytest.approx(59.0)
+    assert [d["departamento"] for d in data["por_departamento"]] == [
+        "Operações",
+        "Tecnologia",
+    ]
+
+
+@pytest.mark.unit
+def test_finalizar_ciclo_gera_snapshot(client, admin_token, db_session, dados_ciclo):
+    """
+    Testa que finalizar o ciclo congela os resultados e que a leitura vem do
+    snapshot com cache longo, ETag e 304
+    """
+    headers = get_auth_headers(admin_token)
+    ao_vivo = client.get(f"/api/resultados/ciclo/{dados_ciclo.id}", headers=headers)
+
+    assert finalizar(client, admin_token, dados_ciclo.id).status_code == 200
+    assert db_session.get(CicloSnapshot, dados_ciclo.id) is not None
+    assert db_session.get(ResultadoCiclo, (dados_ciclo.id, "user001")) is not None
+
+    response = client.get(f"/api/resultados/ciclo/{dados_ciclo.id}", headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["Cache-Control"] == CACHE_CONTROL_SNAPSHOT
+    data = response.json()
+    assert data["finalizado"] is True
+    assert data["gerado_em"] is not None
+    for campo in ("total_colaboradores", "media_comportamental", "por_departamento"):
+        assert data[campo] == ao_vivo.json()[campo]
+
+    revalidacao = client.get(
+        f"/api/resultados/ciclo/{dados_ciclo.id}",
+        headers={**headers, "If-None-Match": response.headers["ETag"]},
+    )
+    assert revalidacao.status_code == status.HTTP_304_NOT_MODIFIED
+    assert "immutable" not in response.headers["Cache-Control"]
+
+
+@pytest.mark.unit
+def test_snapshot_regerado_muda_etag(client, admin_token, db_session, dados_ciclo):
+    """
+    Testa que regerar o snapshot muda o ETag, e a revalidação com o antigo
+    (mesmo numa lista de tags) devolve os dados novos
+    """
+    headers = get_auth_headers(admin_token)
+    finalizar(client, admin_token, dados_ciclo.id)
+    url = f"/api/resultados/ciclo/{dados_ciclo.id}"
+    antigo = client.get(url, headers=headers).headers["ETag"]
+
+    build_snapshot(db_session, dados_ciclo.id)
+    db_session.commit()
+    response = client.get(
+        url, headers={**headers, "If-None-Match": f'"outro", W/{antigo}'}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != antigo
+
+
+@pytest.mark.unit
+def test_resultado_do_colaborador(client, admin_token, user_token, dados_ciclo):
+    """
+    Testa o resultado individual e que só o próprio colaborador (ou um
+    administrador) o consulta
+    """
+    finalizar(client, admin_token, dados_ciclo.id)
+
+    proprio = client.get(
+        f"/api/resultados/ciclo/{dados_ciclo.id}/colaborador/user001",
+        headers=get_auth_headers(user_token),
+    )
+    de_outro = client.get(
+        f"/api/resultados/ciclo/{dados_ciclo.id}/colaborador/user002",
+        headers=get_auth_headers(user_token),
+    )
+
+    assert proprio.status_code == status.HTTP_200_OK
+    assert proprio.headers["Cache-Control"] == CACHE_CONTROL_SNAPSHOT
+    assert proprio.json()["resultado_metas"] == pytest.approx(59.0)
+    assert proprio.json()["total_avaliacoes"] == 1
+    assert de_outro.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.unit
+def test_escritas_em_ciclo_finalizado_retornam_409(
+    client, admin_token, db_session, dados_ciclo
+):
+    """
+    Testa que ciclo finalizado recusa criação, alteração e exclusão de
+    avaliações e metas, e a alteração do próprio ciclo
+    """
+    headers = get_auth_headers(admin_token)
+    meta = db_session.query(Meta).first()
+    avaliacao_pendente = (
+        db_session.query(AvaliacaoComportamental).filter_by(status="PENDENTE").one()
+    )
+    finalizar(client, admin_token, dados_ciclo.id)
+
+    respostas = [
+        client.post(
+            "/api/metas/",
+            json={
+                "ciclo_id": dados_ciclo.id,
+                "colaborador_matricula": "user001",
+                "titulo": "Nova",
+                "peso": 10,
+                "data_limite": "2025-12-31",
+            },
+            headers=headers,
+        ),
+        client.put(f"/api/metas/{meta.id}", json={"peso": 10}, headers=headers),
+        client.delete(f"/api/metas/{meta.id}", headers=headers),
+        client.post(
+            f"/api/avaliacoes/{avaliacao_pendente.id}/concluir", headers=headers
+        ),
+        client.delete(f"/api/avaliacoes/{avaliacao_pendente.id}", headers=headers),
+        client.put(
+            f"/api/ciclos/{dados_ciclo.id}",
+            json={"status": "em_andamento"},
+            headers=headers,
+        ),
+        client.delete(f"/api/ciclos/{dados_ciclo.id}", headers=headers),
+    ]
+
+    assert [r.status_code for r in respostas] == [status.HTTP_409_CONFLICT] * 7
+    assert {r.json()["detail"] for r in respostas} == {CICLO_FINALIZADO_DETAIL}
+    assert db_session.query(Meta).count() == 2
+
+
+@pytest.mark.unit
+def test_criacao_com_cache_desatualizado_retorna_409(
+    client, admin_token, db_session, dados_ciclo
+):
+    """
+    Testa que a criação relê o status no banco: o ciclo finalizado por outro
+    worker, sem a invalidação chegar a este processo, ainda recusa a escrita
+    """
+    headers = get_auth_headers(admin_token)
+    # Cache deste processo ainda com o ciclo aberto
+    assert dados_ciclo.id not in finalized_ciclos(db_session)
+    db_session.query(Ciclo).filter_by(id=dados_ciclo.id).update(
+        {"status": "finalizado"}
+    )
+    db_session.commit()
+
+    respostas = [
+        client.post(
+            "/api/metas/",
+            json={
+                "ciclo_id": dados_ciclo.id,
+                "colaborador_matricula": "user001",
+                "titulo": "Nova",
+                "peso": 10,
+                "data_limite": "2025-12-31",
+            },
+            headers=headers,
+        ),
+        client.post(
+            "/api/avaliacoes/",
+            json={
+                "ciclo_id": dados_ciclo.id,
+                "avaliado_matricula": "user001",
+                "avaliador_matricula": "user002",
+                "tipo_avaliacao": "avaliacao_par",
+                "lideranca": 3,
+                "comunicacao": 3,
+                "trabalho_equipe": 3,
+                "resolucao_problemas": 3,
+                "adaptabilidade": 3,
+            },
+            headers=headers,
+        ),
+    ]
+
+    assert [r.status_code for r in respostas] == [status.HTTP_409_CONFLICT] * 2
+    assert {r.json()["detail"] for r in respostas} == {CICLO_FINALIZADO_DETAIL}
+    assert db_session.query(Meta).count() == 2
+    assert db_session.query(AvaliacaoComportamental).count() == 3
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("returning", [True, False])
+def test_media_pelas_escritas_da_api(
+    client, admin_token, ciclo_ativo, regular_user, monkeypatch, returning
+):
+    """
+    Testa que criar, alterar e concluir pela API grava a média das
+    competências, e que o ciclo finalizado pela API congela essa média
+    """
+    monkeypatch.setattr(settings, "DB_WRITE_RETURNING", returning)
+    headers = get_auth_headers(admin_token)
+    criada = client.post(
+        "/api/avaliacoes/",
+        json={
+            "ciclo_id": ciclo_ativo.id,
+            "avaliado_matricula": regular_user.matricula,
+            "avaliador_matricula": "admin",
+            "tipo_avaliacao": "avaliacao_gestor",
+            "lideranca": 5,
+            "comunicacao": 4,
+            "trabalho_equipe": 3,
+            "resolucao_problemas": 2,
+            "adaptabilidade": 1,
+        },
+        headers=headers,
+    ).json()
+    alterada = client.put(
+        f"/api/avaliacoes/{criada['id']}",
+        json={"adaptabilidade": 5, "comentarios": "Revisada"},
+        headers=headers,
+    ).json()
+    concluida = client.post(
+        f"/api/avaliacoes/{criada['id']}/concluir", headers=headers
+    ).json()
+
+    assert finalizar(client, admin_token, ciclo_ativo.id).status_code == 200
+    resultado = client.get(f"/api/resultados/ciclo/{ciclo_ativo.id}", headers=headers)
+
+    assert criada["media_competencias"] == pytest.approx(3.0)
+    assert alterada["media_competencias"] == pytest.approx(3.8)
+    assert concluida["media_competencias"] == pytest.approx(3.8)
+    assert resultado.json()["finalizado"] is True
+    assert resultado.json()["media_comportamental"] == pytest.approx(3.8)
@@ -0,0 +1,115 @@
+import re
+
+import pytest
+from fastapi import APIRouter, FastAPI, status
+from fastapi.testclient import TestClient
+
+from app.core.timing import (
+    RequestTimings,
+    ServerTimingMiddleware,
+    TimedRoute,
+    get_current_timings,
+    timed,
+)
+from app.main import app
+from tests.conftest import get_auth_headers
+
+
+def parse_server_timing(header: str) -> dict:
+    """
+    Converte o header Server-Timing em {fase: duração em ms}
+    """
+    return {
+        nome: float(duracao)
+        for nome, duracao in re.findall(r"(\w+);dur=([\d.]+)", header)
+    }
+
+
+@pytest.fixture
+def timed_client(client):
+    """
+    Cliente da aplicação envolvida pelo ServerTimingMiddleware
+    """
+    with TestClient(ServerTimingMiddleware(app)) as test_client:
+        yield test_client
+
+
+@pytest.mark.unit
+def test_server_timing_header(timed_client, admin_token, avaliacao_sample):
+    """
+    Testa que uma listagem autenticada expõe todas as fases no Server-Timing
+    """
+    response = timed_client.get(
+        "/api/avaliacoes/", headers=get_auth_headers(admin_token)
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    fases = parse_server_timing(response.headers["server-timing"])
+    assert set(fases) == {"jwt", "auth", "db", "handler", "serialize", "total"}
+    assert fases["total"] >= fases["handler"]
+    assert 'desc="' in response.headers["server-timing"]
+
+
+@pytest.mark.unit
+def test_server_timing_on_auth_failure(timed_client):
+    """
+    Testa que requisições rejeitadas também recebem o header
+    """
+    response = timed_client.get(
+        "/api/avaliacoes/", headers=get_auth_headers("token-invalido")
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    fases = parse_server_timing(response.headers["server-timing"])
+    assert "jwt" in fases
+    assert "handler" not in fases
+
+
+@pytest.mark.unit
+def test_no_header_when_disabled(client, admin_token):
+    """
+    Testa que, sem o middleware (padrão), nada é medido nem exposto
+    """
+    response = client.get("/api/avaliacoes/", headers=get_auth_headers(admin_token))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "server-timing" not in response.headers
+    assert get_current_timings() is None
+
+
+@pytest.mark.unit
+def test_timed_route_async_endpoint():
+    """
+    Testa a separação entre handler e serialize em endpoints async
+    """
+    router = APIRouter(route_class=TimedRoute)
+
+    @router.get("/itens")
+    async def itens():
+        with timed("jwt"):
+            pass
+        return [{"id": i} for i in range(100)]
+
+    test_app = FastAPI()
+    test_app.include_router(router)
+    client = TestClient(ServerTimingMiddleware(test_app))
+
+    response = client.get("/itens")
+
+    assert len(response.json()) == 100
+    fases = parse_server_timing(response.headers["server-timing"])
+    assert {"jwt", "handler", "serialize", "total"} <= set(fases)
+
+
+@pytest.mark.unit
+def test_request_timings_log_fields():
+    """
+    Testa os campos de log gerados a partir dos tempos
+    """
+    timings = RequestTimings()
+    timings.add("db", 0.002)
+    timings.add("db", 0.001)
+    timings.queries = 2
+
+    assert timings.log_fields() == {"db_ms": 3.0, "queries": 2}
+    assert timings.header_value() == 'db;dur=3.00;desc="2 queries"'
@@ -0,0 +1,163 @@
+import threading
+
+import pytest
+from fastapi import status
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.warmup import WarmupState, run_warmup, stop_warmup, warmup_state
+from tests.conftest import TestingSessionLocal, engine
+
+
+@pytest.mark.unit
+def test_run_warmup_records_steps(db_session):
+    """
+    Testa que o aquecimento executa e registra todas as etapas
+    """
+    state = WarmupState()
+
+    run_warmup(engine, TestingSessionLocal, state)
+
+    assert state.concluido
+    assert set(state.etapas) == {"pool", "crypto", "serializacao", "queries"}
+    assert all(etapa["status"] == "ok" for etapa in state.etapas.values())
+
+
+@pytest.mark.unit
+def test_run_warmup_failures_block_readiness(monkeypatch):
+    """
+    Testa que a falha de uma etapa não interrompe as demais, é repetida até
+    o limite e deixa o aquecimento sem concluir
+    """
+    monkeypatch.setattr(settings, "WARMUP_MAX_ATTEMPTS", 2)
+    monkeypatch.setattr(settings, "WARMUP_RETRY_DELAY_SECONDS", 0)
+
+    def sessao_quebrada():
+        raise RuntimeError("banco indisponível")
+
+    state = WarmupState()
+
+    run_warmup(engine, sessao_quebrada, state)
+
+    assert not state.concluido
+    assert state.falhou
+    assert state.etapas["queries"]["status"] == "erro"
+    assert state.etapas["queries"]["tentativas"] == 2
+    assert "banco indisponível" in state.etapas["queries"]["erro"]
+    assert state.etapas["crypto"]["status"] == "ok"
+    assert state.etapas["crypto"]["tentativas"] == 1
+
+
+@pytest.mark.unit
+def test_run_warmup_retries_failed_step(db_session, monkeypatch):
+    """
+    Testa que uma etapa que falha na primeira tentativa é repetida e o
+    aquecimento é concluído
+    """
+    monkeypatch.setattr(settings, "WARMUP_RETRY_DELAY_SECONDS", 0)
+    chamadas = []
+
+    def sessao_instavel():
+        chamadas.append(1)
+        if len(chamadas) == 1:
+            raise RuntimeError("banco ainda subindo")
+        return TestingSessionLocal()
+
+    state = WarmupState()
+
+    run_warmup(engine, sessao_instavel, state)
+
+    assert state.concluido
+    assert not state.falhou
+    assert state.etapas["queries"] == {
+        "status": "ok",
+        "duracao_ms": state.etapas["queries"]["duracao_ms"],
+        "tentativas": 2,
+    }
+
+
+@pytest.mark.unit
+def test_readiness_after_failed_warmup(client, monkeypatch):
+    """
+    Testa que /health/ready segue 503 quando uma etapa do aquecimento falha
+    """
+    monkeypatch.setattr(settings, "WARMUP_ENABLED", True)
+    monkeypatch.setattr(settings, "WARMUP_MAX_ATTEMPTS", 1)
+    monkeypatch.setattr("app.core.warmup.warm_crypto", lambda: 1 / 0, raising=True)
+    falho = WarmupState()
+    monkeypatch.setattr("app.main.warmup_state", falho)
+
+    run_warmup(engine, TestingSessionLocal, falho)
+    response = client.get("/health/ready")
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    data = response.json()
+    assert data["status"] == "not_ready"
+    assert data["aquecimento"]["falhou"] is True
+    assert data["aquecimento"]["etapas"]["crypto"]["status"] == "erro"
+
+
+@pytest.mark.unit
+def test_readiness_waits_for_warmup(client, monkeypatch):
+    """
+    Testa que /health/ready fica 503 até o aquecimento terminar
+    """
+    monkeypatch.setattr(settings, "WARMUP_ENABLED", True)
+    pendente = WarmupState()
+    monkeypatch.setattr("app.main.warmup_state", pendente)
+
+    response = client.get("/health/ready")
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.json()["status"] == "not_ready"
+
+    pendente.concluir()
+
+    response = client.get("/health/ready")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["banco"] == "ok"
+
+
+@pytest.mark.unit
+def test_readiness_requires_database(client, monkeypatch):
+    """
+    Testa que /health/ready fica 503 sem acesso ao banco
+    """
+    from app.db.database import get_db
+    from app.main import app
+
+    monkeypatch.setattr(settings, "WARMUP_ENABLED", False)
+
+    def banco_indisponivel():
+        # Sessão sem engine: qualquer consulta falha
+        yield sessionmaker()()
+
+    app.dependency_overrides[get_db] = banco_indisponivel
+
+    response = client.get("/health/ready")
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.json()["banco"] == "erro"
+
+
+@pytest.mark.unit
+def test_stop_warmup_skips_pending_retries(monkeypatch):
+    """
+    Testa que o desligamento não espera as próximas rodadas de tentativas e
+    encontra a thread de aquecimento já encerrada
+    """
+    monkeypatch.setattr(settings, "WARMUP_RETRY_DELAY_SECONDS", 60)
+
+    def sessao_quebrada():
+        raise RuntimeError("banco indisponível")
+
+    state = WarmupState()
+    state.thread = threading.Thread(
+        target=run_warmup, args=(engine, sessao_quebrada, state), daemon=True
+    )
+    state.thread.start()
+
+    stop_warmup(timeout=5, state=state)
+
+    assert not state.thread.is_alive()
+    assert not state.concluido
+    assert state.etapas["queries"]["tentativas"] == 1